@@ -260,9 +260,11 @@ class App():
                         feeder_camera_view = self.camera_manager.rgb_cameras[0]
                     
                         # CameraView 안의 camera_thread에 접근
-                        if feeder_camera_view.camera_thread:
+                        feeder_thread = feeder_camera_view.camera_thread
+                        # 모델 워밍업이 끝난 뒤에만 에어나이프 동작
+                        if feeder_thread and feeder_thread.is_armed():
                             # feeder 막힘 감지
-                            if feeder_camera_view.camera_thread.block_detector.is_blocked():
+                            if feeder_thread.block_detector.is_blocked():
                                 self.airknife_on(4, self.FEEDER_AIR_DURATION * 1000)
                                 #log("💨 에어나이프 발동발동 💨")
         
@@ -740,6 +742,11 @@ class App():
         self.ethercat_manager.disconnect()
 
         self.update_timer.stop()
+
+        # 추론 서브 프로세스 모드면 프로세스 종료 + 공유 메모리 해제
+        if self.camera_manager and hasattr(self.camera_manager.ai_manager, 'shutdown'):
+            self.camera_manager.ai_manager.shutdown()
+
         if hasattr(self, 'shm_data'):
             del self.shm_data
 
@@ -1,18 +1,29 @@
 """
 AI 매니저
 """
+import os
 import queue
+import sys
 import threading
 import time
 import traceback
-from typing import Dict, List, Optional
-from dataclasses import dataclass
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+from dataclasses import dataclass, field
 
-import torch
+import cv2
 import numpy as np
+import torch
 
-from src.AI.model_load import load_yolov11
+from src.AI.crop_classifier import CropClassifier
+from src.AI.detection_batch import DetectionBatch
+from src.AI.frame_mailbox import LatestFrameMailbox
+from src.AI.inference_backend import InferenceBackend, RawDetections, create_backend
+from src.AI.tracking.tracker import BaseTracker, create_tracker
 from src.utils.logger import log
+from src.utils.config_util import (
+    CAMERA_CONFIGS, AI_BACKEND_CONFIG, AI_DETECTION_FILTER_CONFIG, AI_CLASSIFIER_CONFIG
+)
 
 
 @dataclass
@@ -26,71 +37,183 @@ class DetectedObject:
     metainfo: Optional[Dict] = None
 
 
+@dataclass
+class _FrameMeta:
+    """put_frame 으로 들어온 프레임의 부가 정보 (결과까지 함께 전달)"""
+    offset: Tuple[int, int] = (0, 0)    # 잘라낸 프레임의 원본 좌상단 (x, y)
+    t_submit: float = 0.0               # put_frame 시각 (perf_counter)
+    frame_id: int = -1                  # 카메라 프레임 번호
+    capture_time: float = 0.0           # 촬영 시각 (perf_counter 기준, 카메라 타임스탬프 환산)
+    input_scale: float = 1.0            # 원본 대비 입력 프레임 배율 (절반 해상도 디베이어면 0.5)
+
+
+@dataclass
+class _PipelineBatch:
+    """
+    파이프라인 단계 사이에서 전달되는 배치 정보
+
+    항목 하나는 카메라 프레임 전체(letterbox) 또는 프레임의 타일 하나
+    """
+    cam_ids: List[int]          # 항목별 카메라 번호 (타일 모드면 중복 가능)
+    slot: int                   # 사용 중인 입력 버퍼 번호
+    size: int                   # 모델에 넣는 배치 크기 (고정 배치 엔진이면 패딩 포함)
+    letterbox: List[Tuple[float, int, int]] = field(default_factory=list)  # (scale, pad_x, pad_y)
+    frame_shapes: List[Tuple[int, int]] = field(default_factory=list)      # 원본 (h, w)
+    num_parts: List[int] = field(default_factory=list)  # 항목이 속한 프레임의 전체 타일 수
+    metas: List[_FrameMeta] = field(default_factory=list)
+    frames: List[np.ndarray] = field(default_factory=list)  # 재질 분류용 원본 프레임 (분류기 사용 시)
+    t_collected: float = 0.0
+    results: Optional[list] = None
+
+
 class BatchAIManager:
     """
     여러 카메라의 AI 추론을 배치로 처리
     - 각 카메라에서 프레임을 받아서
     - 한 번에 묶어서 GPU 추론 (효율 극대화)
     - 결과를 각 카메라로 분배
+
+    전처리 / 추론 / 후처리는 각각 별도 스레드에서 동작하고
+    크기가 제한된 큐로 연결되어 있어서 처리량은 가장 느린 단계에 맞춰짐
     """
 
+    PAD_VALUE = 114  # ultralytics letterbox 패딩 색상
+    STATS_WINDOW = 300  # 단계별 지연시간 통계에 사용하는 최근 샘플 수
+
     def __init__(
         self,
         num_cameras: int = 2,
         confidence_threshold: float = 0.5,
         img_size: int = 640,
-        max_det: int = 50
+        max_det: int = 50,
+        batch_size: Optional[int] = None,
+        tracker_type: str = "bytetrack",
+        pipeline_depth: int = 2,
+        warmup_iterations: int = 3,
+        tile_mode: bool = False,
+        tile_overlap: int = 64,
+        tile_nms_iou: float = 0.5,
+        backend_config: Optional[Dict] = None,
+        filter_config: Optional[Dict] = None,
+        classifier_config: Optional[Dict] = None
     ):
         self.num_cameras = num_cameras
         self.confidence_threshold = confidence_threshold
         self.img_size = img_size
         self.max_det = max_det
-
-        # 카메라별 입력 큐 (프레임 저장)
-        self.input_queues = {
-            i: queue.Queue(maxsize=10) for i in range(num_cameras)
-        }
+        self.tracker_type = tracker_type
+
+        # 배치 크기 (None이면 모델에서 판별, 1이면 카메라별 순차 추론)
+        self.batch_size = batch_size
+        self.dynamic_batch = False
+        # 카메라별 트래커 (검출과 분리, 카메라마다 상태 분리)
+        self.trackers: Dict[int, BaseTracker] = {}
+
+        # 타일 모드: 세로로 긴 ROI 스트립을 letterbox로 축소하지 않고
+        # 엔진 입력 크기의 겹치는 타일로 나눠서 원본 해상도로 추론
+        self.tile_mode = tile_mode
+        self.tile_overlap = tile_overlap
+        self.tile_nms_iou = tile_nms_iou
+        self._tile_cache: Dict[Tuple[int, int], List[Tuple[int, int]]] = {}
+        # 카메라별 모으는 중인 타일 결과 (프레임 키, 타일 결과 목록) - 프레임이 바뀌면 덜 모인 묶음은 버림
+        self._pending_parts: Dict[int, Tuple[Tuple[int, float], List[DetectionBatch]]] = {}
+
+        # 카메라별 최신 프레임 우편함 (쌓지 않고 덮어씀, 새 프레임이 오면 수집 스레드를 깨움)
+        self.frame_mailbox = LatestFrameMailbox(num_cameras)
+        self.gather_window = 0.020  # 첫 프레임 도착 후 다른 카메라 프레임을 기다리는 시간 (20ms)
 
         # 카메라별 출력 큐 (결과 저장)
         self.output_queues = {
             i: queue.Queue(maxsize=10) for i in range(num_cameras)
         }
 
-        # 모델 로드
-        self.model = None
+        # 파이프라인 단계 간 전달 큐 (크기 제한으로 backpressure)
+        self.pipeline_depth = pipeline_depth
+        self._infer_queue: queue.Queue = queue.Queue(maxsize=pipeline_depth)
+        self._post_queue: queue.Queue = queue.Queue(maxsize=pipeline_depth)
+
+        # 전처리 결과를 담는 재사용 입력 버퍼 (CUDA면 pinned memory)
+        self._input_buffers: List[torch.Tensor] = []
+        self._free_slots: queue.Queue = queue.Queue()
+        self._canvas = np.full((img_size, img_size, 3), self.PAD_VALUE, dtype=np.uint8)
+
+        # 모델 로드 (추론 백엔드: ultralytics / onnxruntime / openvino)
+        self.backend_config = dict(backend_config if backend_config is not None else AI_BACKEND_CONFIG)
+        self.backend: Optional[InferenceBackend] = None
         self.device = None
+        self.model_path = None
+        self.swap_thread = None  # 모델 교체 (로드 + 워밍업) 스레드
         # self.CLASS_NAMES = ['PET', 'PS', 'PP', 'PE']
         self.CLASS_NAMES = ['Plastic']
-        
+
+        # 클래스별 / 구역별 신뢰도 기준 + 클래스별 NMS (후처리에서 배열 단위로 적용)
+        self.filter_config = dict(filter_config if filter_config is not None else AI_DETECTION_FILTER_CONFIG)
+        self.class_aware_nms = bool(self.filter_config.get('class_aware_nms', False))
+        self.nms_iou = self.filter_config.get('nms_iou', 0.5)
+        self._class_conf = self._build_class_conf()
+        self._zone_conf = {i: self._build_zone_conf(i) for i in range(num_cameras)}
+        # 모델 호출에는 가장 낮은 기준을 써서 한 번의 추론으로 모든 구역을 처리
+        self.model_confidence = float(min(
+            [self._class_conf.min()] + [zone[1].min() for zones in self._zone_conf.values() for zone in zones]
+        ))
+
+        # 검출 크롭 재질 분류기 (트래킹 후 트랙 ID별로 한 번만 분류)
+        self.classifier_config = dict(classifier_config if classifier_config is not None else AI_CLASSIFIER_CONFIG)
+        self.classifier: Optional[CropClassifier] = None
+        self.output_class_names = list(self.CLASS_NAMES)  # 결과 DetectionBatch 의 클래스 이름
+
+        # 모델 로드 + 워밍업 완료 여부 (완료 전에는 에어나이프를 동작시키지 않음)
+        self.warmup_iterations = warmup_iterations
+        self.ready_event = threading.Event()
+        self.loader_thread = None
+        self._start_requested = False
+        self._state_lock = threading.Lock()
+
         self.running = False
+        self.result_callback: Optional[Callable[[int, DetectionBatch], None]] = None  # 설정 시 결과 큐 대신 호출
         self.inference_thread = None
+        self.preprocess_thread = None
+        self.postprocess_thread = None
 
         # 통계
         self.total_inferences = 0
         self.batch_count = 0
+        self.batch_launches = 0  # 실제 모델 호출 횟수
+        self.failed_batches = 0  # 추론 오류로 버린 배치 수
+        self.dropped_tile_sets = 0  # 타일이 덜 모여 버린 프레임 수 (타일 모드)
         self.dropped_frames = {i: 0 for i in range(num_cameras)}
+        self.result_latency = {  # 카메라별 put_frame -> get_result 지연 (ms)
+            i: deque(maxlen=30) for i in range(num_cameras)
+        }
+        self.stage_latency = {
+            name: deque(maxlen=self.STATS_WINDOW)
+            for name in ('preprocess', 'inference', 'postprocess', 'total')
+        }
 
     def initialize(self, model_path: str) -> bool:
         """모델 초기화"""
         try:
             log("BatchAIManager 초기화")
-            self.model, self.device = load_yolov11(model_path)
+            self.backend = self._create_backend(model_path)
 
-            if self.model is None:
+            if not self.backend.load():
                 log("모델 로드 실패")
+                self.backend = None
                 return False
+            self.device = self.backend.device
+            self.model_path = model_path
+            log(f"추론 백엔드: {self.backend.name} ({self.device})")
+
+            self.batch_size = self._resolve_batch_size()
+            self.trackers = {
+                i: self._create_tracker(i) for i in range(self.num_cameras)
+            }
+            log(f"추론 배치 크기: {self.batch_size} "
+                f"({'동적' if self.dynamic_batch else '고정'} 배치)")
 
-            # 워밍업
-            # dummy_frames = [
-            #     np.zeros((640, 640, 3), dtype=np.uint8) for _ in range(self.num_cameras)
-            # ]
-            # for _ in range(2):
-            #     _ = self.model.track(
-            #         source=dummy_frames,
-            #         verbose=False,
-            #         device=self.device,
-            #         imgsz=self.img_size
-            #     )
+            self._warmup()
+            self._load_classifier()
+            self.ready_event.set()
 
             log("BatchAIManager 초기화 완료")
             return True
@@ -100,281 +223,730 @@ class BatchAIManager:
             traceback.print_exc()
             return False
 
-    def start(self):
-        """배치 추론 스레드 시작"""
-        if not self.model:
-            log("모델이 초기화되지 않았습니다")
+    def _load_classifier(self):
+        """재질 분류기 로드 (실패하면 검출 클래스 그대로 사용)"""
+        options = dict(self.classifier_config)
+        if not options.pop('enabled', False):
             return
 
-        log("배치 추론 스레드 시작")
-        self.running = True
-        self.inference_thread = threading.Thread(
-            target=self._batch_inference_loop,
-            daemon=True
+        model_path = options.pop('model_path')
+        if not os.path.isabs(model_path):
+            model_path = os.path.join(sys.path[0], model_path)
+        classifier = CropClassifier(
+            model_path, self.CLASS_NAMES,
+            backend_type=options.pop('type', 'ultralytics'),
+            **options
+        )
+        if not classifier.load():
+            log("재질 분류기 없이 진행")
+            return
+        self.classifier = classifier
+        self.output_class_names = classifier.output_class_names
+
+    def initialize_async(self, model_path: str,
+                         on_ready: Optional[Callable[[bool], None]] = None):
+        """
+        백그라운드에서 모델 로드 + 워밍업
+
+        UI 스레드를 막지 않도록 별도 스레드에서 initialize 를 수행하고,
+        끝나면 on_ready(성공 여부)를 호출 (호출 스레드는 로더 스레드)
+        """
+        def _load():
+            ok = self.initialize(model_path)
+
+            with self._state_lock:
+                start_pending = ok and self._start_requested
+            if start_pending:
+                self.start()
+
+            if on_ready:
+                try:
+                    on_ready(ok)
+                except Exception as e:
+                    log(f"모델 준비 콜백 오류: {e}")
+
+        self.loader_thread = threading.Thread(target=_load, daemon=True)
+        self.loader_thread.start()
+
+    @property
+    def frames_in_flight(self) -> int:
+        """
+        put_frame 으로 넘긴 프레임을 참조할 수 있는 최대 수 (복사 없이 넘기는 링 버퍼 크기 산정용)
+
+        우편함 1 + 전처리 1 + 추론 큐 + 추론 1 + 후처리 큐 + 후처리 1 (분류기가 후처리에서 원본 프레임을 읽음)
+        """
+        return 2 * self.pipeline_depth + 4
+
+    def is_ready(self) -> bool:
+        """모델 로드 + 워밍업 완료 여부"""
+        return self.ready_event.is_set()
+
+    def _create_backend(self, model_path: str) -> InferenceBackend:
+        """설정된 종류의 추론 백엔드 생성 (로드 전)"""
+        options = dict(self.backend_config)
+        return create_backend(
+            options.pop('type', 'ultralytics'), model_path,
+            confidence_threshold=self.model_confidence,
+            img_size=self.img_size,
+            max_det=self.max_det,
+            agnostic_nms=not self.class_aware_nms,
+            **options
         )
-        self.inference_thread.start()
 
-    # def _batch_inference_loop(self):
-    #     """배치 추론 메인 루프"""
-    #     log("배치 추론 루프 실행 중...")
-
-    #     while self.running:
-    #         try:
-    #             # 1. 모든 카메라에서 프레임 수집 (논블로킹)
-    #             frames = {}
-    #             deadline = time.time() + 0.020  # 20ms 데드라인
-
-    #             while time.time() < deadline and len(frames) < self.num_cameras:
-    #                 for cam_id in range(self.num_cameras):
-    #                     if cam_id in frames:
-    #                         continue
-    #                     try:
-    #                         remaining_time = deadline - time.time()
-    #                         if remaining_time <= 0:
-    #                             break
-
-    #                         frame = self.input_queues[cam_id].get(
-    #                             timeout=max(0.001, remaining_time)
-    #                         )
-    #                         frames[cam_id] = frame
-    #                     except queue.Empty:
-    #                         continue
-
-    #                 # 모든 카메라 프레임 수집 완료
-    #                 if len(frames) == self.num_cameras:
-    #                     break
-
-    #             # 프레임이 하나도 없으면 다음 루프
-    #             if not frames:
-    #                 continue
-
-    #             # 배치 구성 및 추론
-    #             cam_ids = list(frames.keys())
-    #             frame_list = [frames[cam_id] for cam_id in cam_ids]
-
-    #             t_start = time.time()
-                
-    #             results = self.model.track(
-    #                 source=frame_list,  # ← 리스트로 전달!
-    #                 conf=self.confidence_threshold,
-    #                 imgsz=self.img_size,
-    #                 verbose=False,
-    #                 max_det=self.max_det,
-    #                 persist=True,
-    #                 tracker="bytetrack.yaml",
-    #                 agnostic_nms=True,
-    #                 stream=False,  # 배치 모드
-    #             )
-
-    #             inference_time = (time.time() - t_start) * 1000
-
-    #             # 통계 업데이트
-    #             self.batch_count += 1
-    #             self.total_inferences += len(frame_list)
-
-    #             # 100번째 배치마다 통계 출력
-    #             # if self.batch_count % 100 == 0:
-    #             #     avg_batch_size = self.total_inferences / self.batch_count
-    #             #     log(f"배치 통계: {self.batch_count}번째 배치, "
-    #             #         f"평균 배치 크기: {avg_batch_size:.2f}, "
-    #             #         f"추론 시간: {inference_time:.2f}ms")
-
-    #             # 4. 결과 파싱 및 분배
-    #             for i, cam_id in enumerate(cam_ids):
-    #                 if i < len(results):
-    #                     # 결과 파싱
-    #                     detected_objects = self._parse_result(results[i])
-
-    #                     # 큐에 넣기 (큐 가득 차면 오래된 결과 버림)
-    #                     if self.output_queues[cam_id].full():
-    #                         try:
-    #                             self.output_queues[cam_id].get_nowait()
-    #                         except queue.Empty:
-    #                             pass
-
-    #                     self.output_queues[cam_id].put(detected_objects)
-
-    #         except Exception as e:
-    #             log(f"배치 추론 오류: {e}")
-    
-    def _batch_inference_loop(self):
-        """배치 추론 메인 루프 (TensorRT batch=1 엔진 대응)"""
-        log("배치 추론 루프 실행 중.")
+    def _build_class_conf(self) -> np.ndarray:
+        """클래스 인덱스 -> 최소 신뢰도 (마지막 칸은 알 수 없는 클래스용)"""
+        class_conf = self.filter_config.get('class_conf') or {}
+        unknown = [name for name in class_conf if name not in self.CLASS_NAMES]
+        if unknown:
+            log(f"class_conf 에 모델에 없는 클래스: {unknown}")
+        return np.array(
+            [class_conf.get(name, self.confidence_threshold) for name in self.CLASS_NAMES]
+            + [self.confidence_threshold],
+            dtype=np.float32
+        )
 
-        while self.running:
+    def _build_zone_conf(self, cam_id: int) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        카메라의 구역별 기준 [(x1, y1, x2, y2), 클래스별 최소 신뢰도]
+
+        박스 설정의 'min_confidence' 는 숫자(모든 클래스) 또는 {클래스: 기준}
+        """
+        zones = []
+        for box in CAMERA_CONFIGS.get(cam_id, {}).get('boxes', []):
+            min_conf = box.get('min_confidence')
+            if min_conf is None:
+                continue
+            if isinstance(min_conf, dict):
+                lut = self._class_conf.copy()
+                for name, value in min_conf.items():
+                    if name in self.CLASS_NAMES:
+                        lut[self.CLASS_NAMES.index(name)] = value
+            else:
+                lut = np.full_like(self._class_conf, min_conf)
+            rect = np.array([box['x'], box['y'], box['x'] + box['width'], box['y'] + box['height']],
+                            dtype=np.float32)
+            zones.append((rect, lut))
+        return zones
+
+    def swap_model(self, model_path: str,
+                   on_done: Optional[Callable[[bool], None]] = None) -> bool:
+        """
+        카메라/추론을 멈추지 않고 모델 교체
+
+        새 모델 로드 + 워밍업은 백그라운드에서 하고, 끝나면 다음 배치부터 새 모델을 사용.
+        트래커 상태와 입력 버퍼는 그대로 유지. 끝나면 on_done(성공 여부) 호출 (교체 스레드)
+
+        :return: 교체를 시작했으면 True (모델 미준비 / 이미 교체 중이면 False)
+        """
+        with self._state_lock:
+            if not self.is_ready():
+                log("모델이 초기화되지 않아 교체할 수 없음")
+                return False
+            if self.swap_thread and self.swap_thread.is_alive():
+                log("이미 모델 교체 중")
+                return False
+
+            self.swap_thread = threading.Thread(
+                target=self._swap_model, args=(model_path, on_done), daemon=True
+            )
+            self.swap_thread.start()
+        return True
+
+    def _swap_model(self, model_path: str, on_done: Optional[Callable[[bool], None]]):
+        """모델 교체 스레드"""
+        ok = False
+        try:
+            log(f"모델 교체 시작: {model_path}")
+            backend = self._create_backend(model_path)
+            if not backend.load():
+                raise RuntimeError("모델 로드 실패")
+
+            # 클래스 인덱스 -> 이름 / 클래스별 신뢰도 기준 / 구역 기준이 지금 클래스 목록으로 만들어져 있으므로 같아야 함
+            # (다르면 from_arrays 가 범위 밖 클래스 검출을 모두 버리거나 다른 클래스 이름이 붙음)
+            if backend.class_names is not None and list(backend.class_names) != list(self.CLASS_NAMES):
+                backend.release()
+                raise RuntimeError(f"클래스 불일치 (현재 {self.CLASS_NAMES}, 새 모델 {list(backend.class_names)})")
+
+            # 입력 버퍼 / 배치 구성은 그대로 쓰므로 지금 배치 크기를 받을 수 있어야 함
+            dynamic, fixed_batch = backend.probe_batch()
+            if not dynamic and fixed_batch != self.batch_size:
+                raise RuntimeError(f"배치 크기 불일치 (현재 {self.batch_size}, 새 모델 {fixed_batch})")
+
+            self._warmup(backend)
+
+            # 추론 루프는 배치마다 self.backend 를 한 번 읽으므로 배치 사이에서 교체됨
+            old_backend, self.backend = self.backend, backend
+            old_path, self.model_path = self.model_path, model_path
+            if old_backend is not None and os.path.abspath(old_path) != os.path.abspath(model_path):
+                old_backend.release()
+
+            log(f"모델 교체 완료: {old_path} -> {model_path}")
+            ok = True
+
+        except Exception as e:
+            log(f"모델 교체 실패 (기존 모델 유지): {e}")
+            traceback.print_exc()
+
+        if on_done:
             try:
-                # 1. 모든 카메라에서 프레임 수집 (논블로킹)
-                frames = {}
-                deadline = time.time() + 0.020  # 20ms 데드라인
+                on_done(ok)
+            except Exception as e:
+                log(f"모델 교체 콜백 오류: {e}")
 
-                while time.time() < deadline and len(frames) < self.num_cameras:
-                    for cam_id in range(self.num_cameras):
-                        if cam_id in frames:
-                            continue
-                        try:
-                            remaining_time = deadline - time.time()
-                            if remaining_time <= 0:
-                                break
-
-                            frame = self.input_queues[cam_id].get(
-                                timeout=max(0.001, remaining_time)
-                            )
-                            frames[cam_id] = frame
-                        except queue.Empty:
-                            continue
+    def _warmup(self, backend: Optional[InferenceBackend] = None):
+        """
+        설정된 모든 배치 크기 / 입력 해상도로 더미 추론
 
-                    # 모든 카메라 프레임 수집 완료
-                    if len(frames) == self.num_cameras:
-                        break
+        엔진 역직렬화 이후 첫 추론에서 발생하는 autotuning 지연을 시작 전에 소모
+        """
+        if self.warmup_iterations <= 0:
+            return
+        backend = backend or self.backend
+
+        # 고정 배치 엔진은 batch_size 하나만, 동적 배치면 실제로 나올 수 있는 모든 크기
+        batch_sizes = range(1, self.batch_size + 1) if self.dynamic_batch else [self.batch_size]
+        input_sizes = [self.img_size]
+
+        t_start = time.perf_counter()
+        for size in input_sizes:
+            for batch in batch_sizes:
+                dummy = torch.zeros((batch, 3, size, size), dtype=torch.float32)
+                for _ in range(self.warmup_iterations):
+                    backend.infer(dummy)
+        log(f"워밍업 완료: 배치 {list(batch_sizes)}, 해상도 {input_sizes}, "
+            f"{(time.perf_counter() - t_start) * 1000:.0f}ms")
+
+    def _resolve_batch_size(self) -> int:
+        """
+        모델이 지원하는 배치 크기 확인
+
+        batch=1 고정 엔진이면 1을 반환하고, 이 경우 기존처럼 카메라별로 순차 추론한다.
+        """
+        if self.batch_size is not None:
+            self.dynamic_batch = False
+            # 타일 모드면 한 주기 항목 수 = 카메라 수 x 타일 수
+            entries = self._entries_per_cycle()
+            if self.batch_size > entries:
+                log(f"배치 크기 {self.batch_size} -> {entries} (한 주기 최대 항목 수)")
+            return max(1, min(self.batch_size, entries))
+
+        try:
+            self.dynamic_batch, fixed_batch = self.backend.probe_batch()
+        except Exception as e:
+            log(f"배치 크기 확인 실패, batch=1로 동작: {e}")
+            self.dynamic_batch = False
+            return 1
+
+        entries = self._entries_per_cycle()
+        if self.dynamic_batch:
+            return entries
+        return max(1, min(fixed_batch, entries))
+
+    def _entries_per_cycle(self) -> int:
+        """한 번의 수집 주기에서 나올 수 있는 최대 추론 항목 수 (카메라 수 또는 전체 타일 수)"""
+        if not self.tile_mode:
+            return self.num_cameras
+
+        total = 0
+        for cam_id in range(self.num_cameras):
+            roi = CAMERA_CONFIGS.get(cam_id, {}).get('roi') or {}
+            shape = (roi.get('height', self.img_size), roi.get('width', self.img_size))
+            total += len(self._tile_origins(shape))
+        return total
+
+    def _tile_origins(self, frame_shape: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """프레임을 덮는 타일들의 좌상단 좌표 (x, y)"""
+        key = (int(frame_shape[0]), int(frame_shape[1]))
+        if key not in self._tile_cache:
+            def _axis(length: int) -> List[int]:
+                if length <= self.img_size:
+                    return [0]
+                step = self.img_size - self.tile_overlap
+                return list(range(0, length - self.img_size, step)) + [length - self.img_size]
+
+            h, w = key
+            self._tile_cache[key] = [(x, y) for y in _axis(h) for x in _axis(w)]
+        return self._tile_cache[key]
+
+    def _create_tracker(self, cam_id: int) -> BaseTracker:
+        """
+        카메라별 트래커 생성
+
+        CAMERA_CONFIGS 의 'tracker' 항목으로 카메라마다 종류/옵션을 따로 지정할 수 있음
+        """
+        options = dict(CAMERA_CONFIGS.get(cam_id, {}).get('tracker', {}))
+        tracker_type = options.pop('type', self.tracker_type)
+        log(f"카메라 {cam_id} 트래커: {tracker_type} {options}")
+        return create_tracker(tracker_type, **options)
+
+    def start(self):
+        """배치 추론 스레드 시작 (모델 준비 전이면 준비 완료 후 시작)"""
+        with self._state_lock:
+            if not self.is_ready():
+                if self.loader_thread and self.loader_thread.is_alive():
+                    log("모델 로딩 중 - 준비되면 추론 시작")
+                    self._start_requested = True
+                else:
+                    log("모델이 초기화되지 않았습니다")
+                return
+            self._start_requested = False
+
+            if self.running:
+                return
+
+            log("배치 추론 스레드 시작")
+            self._allocate_buffers()
+            self._pending_parts.clear()
+            self.frame_mailbox.reopen()
+            self.running = True
+
+        self.preprocess_thread = threading.Thread(target=self._preprocess_loop, daemon=True)
+        self.inference_thread = threading.Thread(target=self._inference_loop, daemon=True)
+        self.postprocess_thread = threading.Thread(target=self._postprocess_loop, daemon=True)
+
+        self.preprocess_thread.start()
+        self.inference_thread.start()
+        self.postprocess_thread.start()
+
+    def _allocate_buffers(self):
+        """
+        전처리용 입력 버퍼 할당
+
+        큐에 대기 중인 배치 + 추론 중인 배치 + 작성 중인 배치가 동시에 존재할 수 있으므로
+        pipeline_depth + 2 개를 돌려가며 사용
+        """
+        pin = torch.cuda.is_available() and self.device == 'cuda'
+        self._input_buffers = [
+            torch.empty(
+                (self.batch_size, 3, self.img_size, self.img_size),
+                dtype=torch.float32,
+                pin_memory=pin
+            )
+            for _ in range(self.pipeline_depth + 2)
+        ]
+        self._free_slots = queue.Queue()
+        for slot in range(len(self._input_buffers)):
+            self._free_slots.put(slot)
+
+        self._infer_queue = queue.Queue(maxsize=self.pipeline_depth)
+        self._post_queue = queue.Queue(maxsize=self.pipeline_depth)
+
+    def _collect_frames(self) -> Tuple[Dict[int, np.ndarray], Dict[int, _FrameMeta]]:
+        """
+        모든 카메라에서 프레임 수집
+
+        첫 프레임이 들어올 때까지 대기하고, 이후 gather_window(20ms) 안에
+        다른 카메라 프레임도 들어오면 같은 배치로 묶음
+
+        :return: (카메라별 프레임, 카메라별 프레임 정보)
+        """
+        items = self.frame_mailbox.collect(timeout=0.1, gather_window=self.gather_window)
+        frames = {cam_id: frame for cam_id, (frame, _) in items.items()}
+        metas = {cam_id: meta for cam_id, (_, meta) in items.items()}
+        return frames, metas
+
+    def _preprocess_loop(self):
+        """1단계: 프레임 수집 + letterbox/정규화"""
+        log("전처리 루프 실행 중.")
+
+        while self.running:
+            try:
+                frames, metas = self._collect_frames()
 
                 # 프레임이 하나도 없으면 다음 루프
                 if not frames:
                     continue
 
-                # 2. TensorRT batch=1 엔진 대응:
-                #    카메라별로 단일 프레임씩 순차 추론
-                for cam_id, frame in frames.items():
-                    try:
-                        results = self.model.track(
-                            source=frame,   # 리스트(frame_list) 대신 단일 frame
-                            conf=self.confidence_threshold,
-                            imgsz=self.img_size,
-                            verbose=False,
-                            max_det=self.max_det,
-                            persist=True,
-                            tracker="bytetrack.yaml",
-                            agnostic_nms=True
-                        )
+                t_collected = time.perf_counter()
 
-                        detected_objects = []
-                        if results is not None and len(results) > 0:
-                            detected_objects = self._parse_result(results[0])
+                # 동적/다중 배치 모델이면 한 번에, batch=1 엔진이면 항목별로 나눠서 전달
+                entries = self._plan_entries(frames)
+                for start in range(0, len(entries), self.batch_size):
+                    chunk = entries[start:start + self.batch_size]
+                    batch = self._preprocess(chunk, frames, t_collected)
+                    if batch is None:
+                        break
+                    batch.metas = [metas[cam_id] for cam_id in batch.cam_ids]
+                    self._apply_input_scale(batch)
+                    if self.classifier is not None:
+                        batch.frames = [frames[cam_id] for cam_id in batch.cam_ids]
+                    if not self._put_stage(self._infer_queue, batch):
+                        self._free_slots.put(batch.slot)
+                        break
+
+                self.batch_count += 1
 
-                        # 큐에 넣기 (가득 차면 오래된 결과 버림)
-                        if self.output_queues[cam_id].full():
-                            try:
-                                self.output_queues[cam_id].get_nowait()
-                            except queue.Empty:
-                                pass
+            except Exception as e:
+                log(f"전처리 오류: {e}")
+
+    @staticmethod
+    def _apply_input_scale(batch: _PipelineBatch):
+        """축소된 입력 프레임이면 결과가 원본 좌표로 복원되도록 letterbox 배율 / 프레임 크기 보정"""
+        for i, meta in enumerate(batch.metas):
+            if meta.input_scale == 1.0:
+                continue
+            scale, pad_x, pad_y = batch.letterbox[i]
+            batch.letterbox[i] = (scale * meta.input_scale, pad_x, pad_y)
+            h, w = batch.frame_shapes[i]
+            batch.frame_shapes[i] = (int(round(h / meta.input_scale)), int(round(w / meta.input_scale)))
+
+    def _plan_entries(self, frames: Dict[int, np.ndarray]) -> List[Tuple[int, int, Optional[Tuple[int, int]]]]:
+        """
+        추론 항목 목록 구성
+
+        :return: [(cam_id, 전체 타일 수, 타일 좌상단 좌표 또는 None(letterbox))]
+        """
+        entries = []
+        for cam_id, frame in frames.items():
+            if not self.tile_mode:
+                entries.append((cam_id, 1, None))
+                continue
+            origins = self._tile_origins(frame.shape[:2])
+            entries.extend((cam_id, len(origins), origin) for origin in origins)
+        return entries
+
+    def _preprocess(self, chunk: List[Tuple[int, int, Optional[Tuple[int, int]]]],
+                    frames: Dict[int, np.ndarray],
+                    t_collected: float) -> Optional[_PipelineBatch]:
+        """추론 항목들을 입력 버퍼 하나에 letterbox(또는 타일 복사) 해서 채움"""
+        slot = self._acquire_slot()
+        if slot is None:
+            return None
 
-                        self.output_queues[cam_id].put(detected_objects)
-                        self.total_inferences += 1
+        t_start = time.perf_counter()
+        buffer = self._input_buffers[slot]
+        size = len(chunk) if self.dynamic_batch else self.batch_size
+        batch = _PipelineBatch(
+            cam_ids=[cam_id for cam_id, _, _ in chunk],
+            slot=slot, size=size, t_collected=t_collected
+        )
 
-                    except Exception as cam_e:
-                        log(f"카메라 {cam_id} 추론 오류: {cam_e}")
+        for i, (cam_id, num_parts, origin) in enumerate(chunk):
+            frame = frames[cam_id]
+            if origin is None:
+                batch.letterbox.append(self._letterbox(frame))
+            else:
+                batch.letterbox.append(self._copy_tile(frame, origin))
+            batch.frame_shapes.append(frame.shape[:2])
+            batch.num_parts.append(num_parts)
+            # HWC uint8 -> CHW float 변환은 복사와 함께 처리
+            buffer[i].copy_(torch.from_numpy(self._canvas).permute(2, 0, 1))
+
+        buffer[:len(chunk)].mul_(1.0 / 255)
+
+        # 고정 배치 엔진은 입력 개수가 맞아야 하므로 마지막 프레임으로 채움
+        if size > len(chunk):
+            buffer[len(chunk):size] = buffer[len(chunk) - 1]
+
+        self._record_latency('preprocess', t_start)
+        return batch
+
+    def _letterbox(self, frame: np.ndarray) -> Tuple[float, int, int]:
+        """
+        ultralytics LetterBox 와 동일하게 정사각형 캔버스 가운데에 리사이즈
+
+        :return: (scale, pad_x, pad_y) - 결과 좌표 복원용
+        """
+        h, w = frame.shape[:2]
+        scale = min(self.img_size / h, self.img_size / w)
+        new_w, new_h = int(round(w * scale)), int(round(h * scale))
+        pad_x = int(round((self.img_size - new_w) / 2 - 0.1))
+        pad_y = int(round((self.img_size - new_h) / 2 - 0.1))
+
+        if (new_w, new_h) != (w, h):
+            frame = cv2.resize(frame, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+
+        self._canvas[:] = self.PAD_VALUE
+        # ultralytics numpy 입력과 동일하게 채널 순서 반전 (BGR -> RGB 처리와 동일)
+        self._canvas[pad_y:pad_y + new_h, pad_x:pad_x + new_w] = frame[..., ::-1]
+        return scale, pad_x, pad_y
+
+    def _copy_tile(self, frame: np.ndarray, origin: Tuple[int, int]) -> Tuple[float, int, int]:
+        """
+        타일 영역을 원본 해상도 그대로 캔버스 좌상단에 복사
+
+        :return: letterbox 와 같은 형식 (scale=1, 음수 pad = 타일 오프셋)
+        """
+        x, y = origin
+        tile = frame[y:y + self.img_size, x:x + self.img_size]
+        th, tw = tile.shape[:2]
+
+        self._canvas[:] = self.PAD_VALUE
+        self._canvas[:th, :tw] = tile[..., ::-1]
+        return 1.0, -x, -y
+
+    def _inference_loop(self):
+        """2단계: 전처리된 텐서로 모델 추론"""
+        log("추론 루프 실행 중.")
 
-                self.batch_count += 1
+        while self.running:
+            batch = self._get_stage(self._infer_queue)
+            if batch is None:
+                continue
 
+            t_start = time.perf_counter()
+            try:
+                tensor = self._input_buffers[batch.slot][:batch.size]
+                backend = self.backend  # swap_model 교체는 배치 사이에서만 반영
+                backend.set_batch_context(list(zip(batch.cam_ids, batch.letterbox, batch.metas)))
+                batch.results = backend.infer(tensor)
+                self.batch_launches += 1
             except Exception as e:
-                log(f"배치 추론 오류: {e}")
+                log(f"배치 추론 오류 (카메라 {batch.cam_ids}): {e}")
+                batch.results = None
+            finally:
+                # 모델 입력으로 복사가 끝났으므로 버퍼 반환
+                self._free_slots.put(batch.slot)
+
+            self._record_latency('inference', t_start)
+            if batch.results is None:
+                # 실패한 배치는 빈 결과로 내보내지 않고 드롭 (트랙/박스 상태가 "물체 없음"으로 갱신되지 않도록)
+                self.failed_batches += 1
+                for cam_id in set(batch.cam_ids):
+                    self.dropped_frames[cam_id] += 1
+                continue
+            self._put_stage(self._post_queue, batch)
+
+    def _postprocess_loop(self):
+        """3단계: 결과 파싱 + 카메라별 트래킹 + 결과 분배"""
+        log("후처리 루프 실행 중.")
 
-    def _parse_result(self, result) -> List[DetectedObject]:
-        """YOLO 결과 파싱"""
-        detected_objects = []
+        while self.running:
+            batch = self._get_stage(self._post_queue)
+            if batch is None:
+                continue
+
+            t_start = time.perf_counter()
+            for i, cam_id in enumerate(batch.cam_ids):
+                try:
+                    detected_objects = DetectionBatch.empty(self.CLASS_NAMES)
+                    if i < len(batch.results):
+                        detected_objects = self._parse_result(
+                            batch.results[i], batch.letterbox[i], batch.frame_shapes[i]
+                        )
+                        # 구역 크롭 프레임이면 원본 프레임 좌표로 이동
+                        detected_objects.translate(*batch.metas[i].offset)
 
-        try:
-            boxes = result.boxes
-
-            if boxes is None or len(boxes) == 0:
-                return detected_objects
-
-            # Tracking ID 확인
-            if boxes.id is None:
-                # Tracking 실패 - 기본 ID 사용
-                xyxy = boxes.xyxy.cpu().numpy()
-                conf = boxes.conf.cpu().numpy()
-                cls = boxes.cls.cpu().numpy().astype(int)
-
-                for idx, (box, confidence, class_id) in enumerate(zip(xyxy, conf, cls)):
-                    if class_id >= len(self.CLASS_NAMES):
-                        continue
-
-                    x1, y1, x2, y2 = map(int, box)
-                    center_x = (x1 + x2) // 2
-                    center_y = (y1 + y2) // 2
-
-                    detected_obj = DetectedObject(
-                        id=idx,
-                        class_name=self.CLASS_NAMES[class_id],
-                        center=(center_x, center_y),
-                        bbox=(x1, y1, x2, y2),
-                        confidence=float(confidence)
-                    )
-                    detected_objects.append(detected_obj)
-
-                return detected_objects
-
-            # GPU에서 배치 연산 (최적화)
-            with torch.no_grad():
-                # GPU에서 배치 연산
-                xyxy_gpu = boxes.xyxy
-                centers_gpu = torch.stack([
-                    (xyxy_gpu[:, 0] + xyxy_gpu[:, 2]) / 2,
-                    (xyxy_gpu[:, 1] + xyxy_gpu[:, 3]) / 2
-                ], dim=1).int()
-
-                # CPU로 변환
-                xyxy = xyxy_gpu.cpu().numpy()
-                centers = centers_gpu.cpu().numpy()
-                conf = boxes.conf.cpu().numpy()
-                cls = boxes.cls.cpu().numpy().astype(int)
-                track_ids = boxes.id.cpu().numpy().astype(int)
-
-            # 객체 생성
-            for i, _ in enumerate(xyxy):
-                if cls[i] >= len(self.CLASS_NAMES):
-                    continue
+                    # 타일 모드: 프레임의 모든 타일 결과가 모이면 경계 중복을 NMS로 병합
+                    if batch.num_parts[i] > 1:
+                        detected_objects = self._merge_tile_part(
+                            cam_id, batch.metas[i], batch.num_parts[i], detected_objects
+                        )
+                        if detected_objects is None:
+                            continue
 
-                detected_obj = DetectedObject(
-                    id=int(track_ids[i]),
-                    class_name=self.CLASS_NAMES[cls[i]],
-                    center=(int(centers[i][0]), int(centers[i][1])),
-                    bbox=tuple(map(int, xyxy[i])),
-                    confidence=float(conf[i])
-                )
-                detected_objects.append(detected_obj)
+                    detected_objects = self._filter_detections(cam_id, detected_objects)
 
-        except Exception as e:
-            log(f"결과 파싱 오류: {e}")
+                    detected_objects = self.trackers[cam_id].update(detected_objects)
+                    if self.classifier is not None and batch.frames:
+                        detected_objects = self.classifier.update(
+                            cam_id, detected_objects, batch.frames[i], batch.metas[i].offset,
+                            batch.metas[i].input_scale
+                        )
+                    detected_objects.frame_id = batch.metas[i].frame_id
+                    detected_objects.capture_time = batch.metas[i].capture_time
+
+                    self._put_result(cam_id, detected_objects, batch.metas[i])
+                    self.total_inferences += 1
+
+                except Exception as cam_e:
+                    log(f"카메라 {cam_id} 후처리 오류: {cam_e}")
+
+            self._record_latency('postprocess', t_start)
+            self._record_latency('total', batch.t_collected)
+
+    def _merge_tile_part(self, cam_id: int, meta: _FrameMeta, num_parts: int,
+                         part: DetectionBatch) -> Optional[DetectionBatch]:
+        """
+        타일 결과 하나 추가, 프레임의 모든 타일이 모이면 경계 중복을 NMS로 병합한 결과 반환
+
+        중지/추론 실패/후처리 오류로 빠진 타일이 있으면 다음 프레임 타일이 올 때 덜 모인 묶음을 버림
+        (이전 프레임 타일이 다음 프레임 결과에 섞이지 않도록 프레임 번호 + 입력 시각으로 구분)
+
+        :return: 병합 결과, 아직 덜 모였으면 None
+        """
+        key = (meta.frame_id, meta.t_submit)
+        pending = self._pending_parts.get(cam_id)
+        if pending is None or pending[0] != key:
+            if pending is not None:
+                self.dropped_tile_sets += 1
+                log(f"카메라 {cam_id} 타일 결과 누락, 프레임 {pending[0][0]} 버림")
+            pending = self._pending_parts[cam_id] = (key, [])
+
+        parts = pending[1]
+        parts.append(part)
+        if len(parts) < num_parts:
+            return None
+        del self._pending_parts[cam_id]
+        return DetectionBatch.concatenate(parts, self.CLASS_NAMES) \
+            .nms(self.tile_nms_iou, metric='ios', class_aware=self.class_aware_nms)
 
-        return detected_objects
+    def _acquire_slot(self) -> Optional[int]:
+        """비어있는 입력 버퍼 번호 가져오기 (중지되면 None)"""
+        while self.running:
+            try:
+                return self._free_slots.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return None
 
-    def put_frame(self, camera_id: int, frame: np.ndarray):
-        """프레임 입력 (카메라 스레드에서 호출)"""
-        if camera_id >= self.num_cameras:
+    def _put_stage(self, stage_queue: queue.Queue, item) -> bool:
+        """다음 단계 큐에 넣기 (가득 차면 빌 때까지 대기)"""
+        while self.running:
+            try:
+                stage_queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get_stage(self, stage_queue: queue.Queue):
+        """이전 단계 결과 가져오기 (없으면 None)"""
+        try:
+            return stage_queue.get(timeout=0.1)
+        except queue.Empty:
+            return None
+
+    def _record_latency(self, stage: str, t_start: float):
+        """단계별 지연시간 기록 (ms)"""
+        self.stage_latency[stage].append((time.perf_counter() - t_start) * 1000)
+
+    def _put_result(self, cam_id: int, detected_objects: DetectionBatch, meta: _FrameMeta):
+        """결과 큐에 넣기 (가득 차면 오래된 결과 버림)"""
+        if self.result_callback is not None:
+            # 추론 프로세스 모드: 결과를 공유 메모리 결과 링으로 바로 전달
+            self.result_callback(cam_id, detected_objects)
             return
 
-        # 큐가 가득 차면 오래된 프레임 버림
-        if self.input_queues[camera_id].full():
+        if self.output_queues[cam_id].full():
             try:
-                self.input_queues[camera_id].get_nowait()
-                self.dropped_frames[camera_id] += 1
-
-                # ✅ 50번마다 한 번만 로그
-                # if self.dropped_frames[camera_id] % 50 == 0:
-                #     log(f"⚠️ 카메라 {camera_id}: 총 {self.dropped_frames[camera_id]}개 프레임 드롭")
+                self.output_queues[cam_id].get_nowait()
             except queue.Empty:
                 pass
 
-        self.input_queues[camera_id].put(frame)
+        self.output_queues[cam_id].put((detected_objects, meta))
+
+    def _filter_detections(self, cam_id: int, det: DetectionBatch) -> DetectionBatch:
+        """
+        클래스별 / 구역별 신뢰도 기준 적용 (+ 클래스별 NMS)
+
+        구역 안(중심 기준) 검출은 그 구역 기준, 여러 구역에 걸치면 가장 낮은 기준을 사용
+        """
+        if not det:
+            return det
+
+        cls = det.data['cls']
+        thr = self._class_conf[cls]
+        zones = self._zone_conf[cam_id]
+        if zones:
+            centers = det.centers
+            zone_thr = np.full(len(det), np.inf, dtype=np.float32)
+            for rect, lut in zones:
+                inside = (centers[:, 0] >= rect[0]) & (centers[:, 0] < rect[2]) & \
+                         (centers[:, 1] >= rect[1]) & (centers[:, 1] < rect[3])
+                zone_thr = np.where(inside, np.minimum(zone_thr, lut[cls]), zone_thr)
+            thr = np.where(np.isfinite(zone_thr), zone_thr, thr)
+
+        keep = det.data['conf'] >= thr
+        if not keep.all():
+            det = det[keep]
+        if self.class_aware_nms:
+            det = det.nms(self.nms_iou, class_aware=True)
+        return det
+
+    def _parse_result(self, result: RawDetections,
+                      letterbox: Optional[Tuple[float, int, int]] = None,
+                      frame_shape: Optional[Tuple[int, int]] = None) -> DetectionBatch:
+        """
+        백엔드 검출 결과 파싱 (트래킹 전)
+
+        결과 하나를 벡터 연산 한 번으로 DetectionBatch 로 변환하고,
+        letterbox 정보가 있으면 입력 텐서 좌표를 원본 프레임 좌표로 복원
+        """
+        try:
+            xyxy, conf, cls = result
+
+            if len(xyxy) == 0:
+                return DetectionBatch.empty(self.CLASS_NAMES)
+
+            xyxy = xyxy.copy()
+
+            if letterbox is not None:
+                scale, pad_x, pad_y = letterbox
+                xyxy[:, [0, 2]] = (xyxy[:, [0, 2]] - pad_x) / scale
+                xyxy[:, [1, 3]] = (xyxy[:, [1, 3]] - pad_y) / scale
+                if frame_shape is not None:
+                    h, w = frame_shape
+                    xyxy[:, [0, 2]] = xyxy[:, [0, 2]].clip(0, w)
+                    xyxy[:, [1, 3]] = xyxy[:, [1, 3]].clip(0, h)
+
+            # ID는 트래커에서 부여
+            return DetectionBatch.from_arrays(xyxy, conf, cls, class_names=self.CLASS_NAMES)
 
-    def get_result(self, camera_id: int) -> Optional[List[DetectedObject]]:
+        except Exception as e:
+            log(f"결과 파싱 오류: {e}")
+            return DetectionBatch.empty(self.CLASS_NAMES)
+
+    def put_frame(self, camera_id: int, frame: np.ndarray, offset: Tuple[int, int] = (0, 0),
+                  frame_id: int = -1, capture_time: Optional[float] = None, input_scale: float = 1.0):
+        """
+        프레임 입력 (카메라 스레드에서 호출)
+
+        :param frame: 카메라 프레임 또는 그 일부를 잘라낸 영역
+        :param offset: 잘라낸 영역의 원본 프레임 좌상단 (x, y) - 결과 좌표는 원본 기준으로 복원됨
+        :param frame_id: 카메라 프레임 번호 (결과의 frame_id 로 전달)
+        :param capture_time: 촬영 시각 (time.perf_counter 기준), 없으면 입력 시각
+        :param input_scale: 원본 대비 frame 배율 (절반 해상도면 0.5, 결과는 원본 좌표로 복원됨)
+        """
+        if camera_id >= self.num_cameras:
+            return
+
+        t_submit = time.perf_counter()
+        meta = _FrameMeta(
+            offset=offset, t_submit=t_submit, frame_id=frame_id,
+            capture_time=capture_time if capture_time else t_submit,
+            input_scale=input_scale
+        )
+        # 아직 수집되지 않은 이전 프레임은 덮어씀 (드롭으로 집계)
+        if self.frame_mailbox.put(camera_id, (frame, meta)):
+            self.dropped_frames[camera_id] += 1
+
+    def get_result(self, camera_id: int) -> Optional[DetectionBatch]:
         """결과 가져오기 (카메라 스레드에서 호출)"""
         if camera_id >= self.num_cameras:
             return None
 
         try:
-            return self.output_queues[camera_id].get_nowait()
+            detected_objects, meta = self.output_queues[camera_id].get_nowait()
         except queue.Empty:
             return None
 
+        self.result_latency[camera_id].append((time.perf_counter() - meta.t_submit) * 1000)
+        return detected_objects
+
+    def get_camera_load(self, camera_id: int) -> Tuple[float, int]:
+        """
+        카메라별 부하 (적응형 추론 간격 제어용)
+
+        :return: (최근 평균 결과 지연 ms, 우편함 누적 드롭 수 - 수집 전에 덮어쓴 프레임)
+        """
+        if camera_id >= self.num_cameras:
+            return 0.0, 0
+        return self._mean(self.result_latency[camera_id]), self.dropped_frames[camera_id]
+
     def stop(self):
         """중지"""
         log("BatchAIManager 중지 중...")
+        with self._state_lock:
+            self._start_requested = False
         self.running = False
+        self.frame_mailbox.close()
 
-        if self.inference_thread and self.inference_thread.is_alive():
-            self.inference_thread.join(timeout=2.0)
+        for thread in (self.preprocess_thread, self.inference_thread, self.postprocess_thread):
+            if thread and thread.is_alive():
+                thread.join(timeout=2.0)
+        # 중지로 버려진 배치의 타일이 재시작 후 결과에 섞이지 않도록
+        self._pending_parts.clear()
 
         log("BatchAIManager 중지 완료")
 
@@ -384,5 +956,27 @@ class BatchAIManager:
         return {
             'total_inferences': self.total_inferences,
             'batch_count': self.batch_count,
-            'avg_batch_size': avg_batch
+            'avg_batch_size': avg_batch,
+            'batch_size': self.batch_size,
+            'batch_launches': self.batch_launches,
+            'failed_batches': self.failed_batches,
+            'dropped_tile_sets': self.dropped_tile_sets,
+            'stage_latency_ms': {
+                stage: self._mean(samples) for stage, samples in self.stage_latency.items()
+            },
+            'result_latency_ms': {
+                cam_id: self._mean(samples) for cam_id, samples in self.result_latency.items()
+            },
+            'dropped_frames': dict(self.dropped_frames),
+            'classifier': self.classifier.get_stats() if self.classifier is not None else None,
+            'stage_queue_depth': {
+                'inference': self._infer_queue.qsize(),
+                'postprocess': self._post_queue.qsize()
+            }
         }
+
+    @staticmethod
+    def _mean(samples: deque) -> float:
+        """다른 스레드에서 추가 중인 deque의 평균"""
+        values = list(samples)
+        return sum(values) / len(values) if values else 0.0
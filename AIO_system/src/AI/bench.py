@@ -0,0 +1,247 @@
+"""
+src/AI/bench.py
+
+검출 경로 오프라인 벤치마크
+- 녹화된 ROI 프레임(이미지 폴더 또는 .npy 스택)을 BatchAIManager 로 재생
+- 단계별 지연 p50/p95/p99, 처리량, 드롭 수, 검출 수를 JSON으로 출력
+
+사용 예:
+    python -m src.AI.bench --frames recorded/cam1 --cameras 2 --duration 30
+    python -m src.AI.bench --frames frames.npy --backend onnxruntime --threads 8 --output bench.json
+    python -m src.AI.bench --backend synthetic --cameras 2 --duration 60   (모델/GPU 없이 시나리오 재생)
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from typing import Dict, List
+
+import cv2
+import numpy as np
+
+from src.AI.AI_manager import BatchAIManager
+from src.AI.synthetic_detector import ScenarioPlayer
+from src.utils.config_util import AI_BACKEND_CONFIG, AI_MODEL_PATHS
+
+IMAGE_EXTS = ('.png', '.jpg', '.jpeg', '.bmp', '.tif', '.tiff')
+
+
+class _BenchAIManager(BatchAIManager):
+    """단계별 지연을 전부 보관 (퍼센타일 계산용)"""
+    STATS_WINDOW = None
+
+
+def load_frames(path: str, limit: int = 0) -> List[np.ndarray]:
+    """
+    녹화 프레임 로드 (RGB)
+
+    :param path: 이미지 폴더 또는 (N, H, W, 3) .npy 스택
+    :param limit: 최대 프레임 수 (0이면 전부)
+    """
+    if path.endswith('.npy'):
+        stack = np.load(path, mmap_mode='r')
+        if stack.ndim == 3:
+            stack = stack[None]
+        frames = [np.ascontiguousarray(frame) for frame in stack[:limit or None]]
+    else:
+        names = sorted(n for n in os.listdir(path) if n.lower().endswith(IMAGE_EXTS))[:limit or None]
+        frames = []
+        for name in names:
+            bgr = cv2.imread(os.path.join(path, name), cv2.IMREAD_COLOR)
+            if bgr is not None:
+                frames.append(cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB))
+
+    if not frames:
+        raise ValueError(f"프레임이 없음: {path}")
+    return frames
+
+
+def percentiles(samples) -> Dict[str, float]:
+    """p50 / p95 / p99 / 평균 (ms)"""
+    values = np.asarray(list(samples), dtype=np.float64)
+    if values.size == 0:
+        return {'count': 0}
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {
+        'count': int(values.size),
+        'mean': round(float(values.mean()), 3),
+        'p50': round(float(p50), 3),
+        'p95': round(float(p95), 3),
+        'p99': round(float(p99), 3),
+    }
+
+
+def run_bench(args) -> Dict:
+    """벤치마크 실행"""
+    backend_config = dict(AI_BACKEND_CONFIG)
+    if args.backend:
+        backend_config['type'] = args.backend
+    if args.precision:
+        backend_config['precision'] = args.precision
+    if args.threads is not None:
+        backend_config['num_threads'] = args.threads
+    model_path = args.model or os.path.join(sys.path[0], AI_MODEL_PATHS[backend_config['type']])
+
+    if args.frames:
+        frames = load_frames(args.frames, args.limit)
+    elif backend_config['type'] == 'synthetic':
+        # 가상 검출기는 픽셀을 보지 않으므로 시나리오 크기의 빈 프레임 하나로 재생
+        player = ScenarioPlayer.load(model_path)
+        frames = [np.zeros((player.height, player.width, 3), dtype=np.uint8)]
+    else:
+        raise ValueError("--frames 가 필요함 (synthetic 백엔드만 생략 가능)")
+
+    manager = _BenchAIManager(
+        num_cameras=args.cameras,
+        confidence_threshold=args.conf,
+        img_size=args.imgsz,
+        max_det=args.max_det,
+        batch_size=args.batch_size,
+        tracker_type=args.tracker,
+        pipeline_depth=args.pipeline_depth,
+        warmup_iterations=args.warmup,
+        tile_mode=args.tile,
+        backend_config=backend_config
+    )
+
+    t_start = time.perf_counter()
+    if not manager.initialize(model_path):
+        raise RuntimeError(f"모델 초기화 실패: {model_path}")
+    init_s = time.perf_counter() - t_start
+    manager.start()
+
+    submitted = {cam_id: 0 for cam_id in range(args.cameras)}
+    results = {cam_id: 0 for cam_id in range(args.cameras)}
+    detections = {cam_id: 0 for cam_id in range(args.cameras)}
+    end_to_end = deque()
+    submit_times: Dict[tuple, float] = {}
+
+    def _drain():
+        for cam_id in range(args.cameras):
+            result = manager.get_result(cam_id)
+            if result is None:
+                continue
+            results[cam_id] += 1
+            detections[cam_id] += len(result)
+            t_submit = submit_times.pop((cam_id, result.frame_id), None)
+            if t_submit is not None:
+                end_to_end.append((time.perf_counter() - t_submit) * 1000)
+
+    # 카메라마다 재생 위치를 어긋나게 해서 같은 프레임이 동시에 들어가지 않도록 함
+    period = 1.0 / args.fps if args.fps > 0 else 0.0
+    t_bench = time.perf_counter()
+    frame_id = 0
+    while True:
+        elapsed = time.perf_counter() - t_bench
+        if (args.duration and elapsed >= args.duration) or \
+           (args.iterations and frame_id >= args.iterations):
+            break
+
+        for cam_id in range(args.cameras):
+            frame = frames[(frame_id + cam_id * len(frames) // args.cameras) % len(frames)]
+            submit_times[(cam_id, frame_id)] = time.perf_counter()
+            manager.put_frame(cam_id, frame, frame_id=frame_id)
+            submitted[cam_id] += 1
+        frame_id += 1
+
+        _drain()
+        if period:
+            next_tick = t_bench + frame_id * period
+            while time.perf_counter() < next_tick:
+                _drain()
+                time.sleep(0.0005)
+
+    # 남은 결과 회수
+    t_flush = time.perf_counter() + 1.0
+    while time.perf_counter() < t_flush and sum(results.values()) < sum(submitted.values()):
+        _drain()
+        time.sleep(0.001)
+    wall_s = time.perf_counter() - t_bench
+    manager.stop()
+
+    stats = manager.get_stats()
+    total_results = sum(results.values())
+    return {
+        'config': {
+            'frames': args.frames,
+            'num_frames': len(frames),
+            'frame_shape': list(frames[0].shape),
+            'cameras': args.cameras,
+            'backend': backend_config,
+            'model': model_path,
+            'imgsz': args.imgsz,
+            'max_det': args.max_det,
+            'conf': args.conf,
+            'requested_batch_size': args.batch_size,
+            'batch_size': manager.batch_size,
+            'dynamic_batch': manager.dynamic_batch,
+            'pipeline_depth': args.pipeline_depth,
+            'tile_mode': args.tile,
+            'target_fps': args.fps,
+        },
+        'init_s': round(init_s, 3),
+        'wall_s': round(wall_s, 3),
+        'throughput': {
+            'submitted_fps': round(sum(submitted.values()) / wall_s, 2),
+            'result_fps': round(total_results / wall_s, 2),
+            'batch_launches_per_s': round(stats['batch_launches'] / wall_s, 2),
+        },
+        'latency_ms': {
+            **{stage: percentiles(samples) for stage, samples in manager.stage_latency.items()},
+            'end_to_end': percentiles(end_to_end),
+        },
+        'avg_batch_size': round(stats['avg_batch_size'], 3),
+        'submitted': submitted,
+        'results': results,
+        'dropped_frames': stats['dropped_frames'],
+        'lost_frames': {
+            cam_id: submitted[cam_id] - results[cam_id] - stats['dropped_frames'][cam_id]
+            for cam_id in submitted
+        },
+        'detections': {
+            'total': sum(detections.values()),
+            'per_camera': detections,
+            'per_result': round(sum(detections.values()) / total_results, 3) if total_results else 0.0,
+        },
+    }
+
+
+def main(argv=None):
+    """명령행 진입점"""
+    parser = argparse.ArgumentParser(description="BatchAIManager 오프라인 벤치마크")
+    parser.add_argument('--frames', default=None, help="녹화 프레임 폴더 또는 .npy 스택 (synthetic 이면 생략 가능)")
+    parser.add_argument('--limit', type=int, default=0, help="사용할 최대 프레임 수 (0: 전부)")
+    parser.add_argument('--model', default=None, help="모델 경로 (synthetic 이면 시나리오 JSON, 기본: AI_MODEL_PATHS)")
+    parser.add_argument('--backend', default=None, choices=['ultralytics', 'onnxruntime', 'openvino', 'synthetic'])
+    parser.add_argument('--precision', default=None, choices=['fp32', 'fp16', 'int8'])
+    parser.add_argument('--threads', type=int, default=None, help="CPU 추론 스레드 수")
+    parser.add_argument('--cameras', type=int, default=2)
+    parser.add_argument('--imgsz', type=int, default=640)
+    parser.add_argument('--max-det', type=int, default=50)
+    parser.add_argument('--conf', type=float, default=0.6)
+    parser.add_argument('--batch-size', type=int, default=None, help="배치 크기 (기본: 모델에서 판별)")
+    parser.add_argument('--pipeline-depth', type=int, default=2)
+    parser.add_argument('--tracker', default='bytetrack')
+    parser.add_argument('--tile', action='store_true', help="타일 추론 모드")
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--fps', type=float, default=60.0, help="카메라별 입력 속도 (0: 최대한 빠르게)")
+    parser.add_argument('--duration', type=float, default=10.0, help="재생 시간 (초, 0: 제한 없음)")
+    parser.add_argument('--iterations', type=int, default=0, help="카메라별 입력 프레임 수 (0: 제한 없음)")
+    parser.add_argument('--output', default=None, help="JSON 저장 경로 (기본: 표준 출력)")
+    args = parser.parse_args(argv)
+
+    if not args.duration and not args.iterations:
+        parser.error("--duration 또는 --iterations 중 하나는 지정해야 함")
+
+    report = run_bench(args)
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    print(text)
+
+
+if __name__ == '__main__':
+    main()
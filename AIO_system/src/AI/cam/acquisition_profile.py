@@ -0,0 +1,235 @@
+"""
+src/AI/cam/acquisition_profile.py
+
+카메라 시리얼별 촬영 프로파일 (CAMERA_ACQUISITION_PROFILES)
+- 'default' 위에 시리얼 항목을 덮어써서 카메라마다 ROI/비닝/데시메이션/픽셀 포맷/패킷 설정을 결정
+- 정수 노드는 카메라 최소/최대/증분에 맞춰 보정, 열거형 노드는 지원 값인지 확인 후 적용
+- 적용 후 카메라에서 실제 값을 다시 읽어 로그/JSON 으로 남김 (설정값과 실제값 비교용)
+"""
+import json
+from pathlib import Path
+from typing import Dict, Optional
+
+from pypylon import genicam
+
+from src.utils.logger import log
+from src.utils.config_util import CAMERA_ACQUISITION_PROFILES, CAMERA_PROFILE_DUMP_DIR
+
+PROFILE_KEYS = (
+    'pixel_format', 'binning', 'decimation', 'roi', 'fallback_size',
+    'fps', 'exposure_us', 'gain', 'packet_size', 'inter_packet_delay', 'max_num_buffer',
+    'frame_transmission_delay', 'socket_buffer_kb',
+)
+
+
+def resolve_profile(serial: str, roi: Optional[dict] = None,
+                    profiles: Optional[Dict[str, dict]] = None) -> dict:
+    """
+    시리얼에 해당하는 프로파일 ('default' + 시리얼 항목)
+
+    :param roi: 프로파일에 roi 가 없을 때 쓸 ROI (CAMERA_CONFIGS 의 roi)
+    """
+    profiles = CAMERA_ACQUISITION_PROFILES if profiles is None else profiles
+    profile = dict(profiles.get('default', {}))
+    profile.update(profiles.get(str(serial), {}))
+    if profile.get('roi') is None:
+        profile['roi'] = roi
+
+    unknown = sorted(set(profile) - set(PROFILE_KEYS))
+    if unknown:
+        log(f"⚠️ 프로파일 알 수 없는 항목 무시 ({serial}): {unknown}")
+        for key in unknown:
+            profile.pop(key)
+    return profile
+
+
+def _readable(camera, name: str) -> bool:
+    node = getattr(camera, name, None)
+    return node is not None and genicam.IsReadable(node)
+
+
+def _writable(camera, name: str) -> bool:
+    node = getattr(camera, name, None)
+    return node is not None and genicam.IsWritable(node)
+
+
+def set_int(camera, name: str, value: float) -> Optional[int]:
+    """정수 노드를 최소/최대/증분에 맞춰 설정, 실제 적용 값 반환 (노드가 없거나 쓸 수 없으면 None)"""
+    if not _writable(camera, name):
+        return None
+    node = getattr(camera, name)
+    lo, hi = node.GetMin(), node.GetMax()
+    inc = max(node.GetInc(), 1)
+    adjusted = min(max(int(value), lo), hi)
+    adjusted = lo + ((adjusted - lo) // inc) * inc
+    if adjusted != int(value):
+        log(f"⚠️ {name} = {int(value)} -> {adjusted} 로 보정 (범위 {lo}~{hi}, 증분 {inc})")
+    node.SetValue(adjusted)
+    return adjusted
+
+
+def set_float(camera, name: str, value: float) -> Optional[float]:
+    """실수 노드를 범위 안으로 보정해서 설정"""
+    if not _writable(camera, name):
+        return None
+    node = getattr(camera, name)
+    adjusted = min(max(float(value), node.GetMin()), node.GetMax())
+    if adjusted != float(value):
+        log(f"⚠️ {name} = {value} -> {adjusted} 로 보정")
+    node.SetValue(adjusted)
+    return adjusted
+
+
+def set_enum(camera, name: str, value: str) -> Optional[str]:
+    """열거형 노드 설정 (지원하지 않는 값이면 현재 값 유지)"""
+    if not _writable(camera, name):
+        return None
+    node = getattr(camera, name)
+    symbols = list(node.GetSymbolics())
+    if value not in symbols:
+        log(f"⚠️ {name} = {value} 미지원 (가능: {symbols}), 현재 {node.GetValue()} 유지")
+        return None
+    node.SetValue(value)
+    return value
+
+
+def apply_roi(camera, roi: Optional[dict], scale: int = 1,
+              fallback_size: tuple = (1280, 720)) -> dict:
+    """
+    ROI 적용 (Offset 0 -> Width/Height -> Offset 순서, 범위 밖이면 증분에 맞춰 보정)
+
+    :param roi: {'x', 'y', 'width', 'height'} 센서 픽셀 기준, 없으면 fallback_size
+    :param scale: 비닝 x 데시메이션 배율 (ROI 를 출력 픽셀로 환산)
+    """
+    for name in ('OffsetX', 'OffsetY'):
+        if _writable(camera, name):
+            getattr(camera, name).SetValue(0)
+
+    if roi:
+        width = set_int(camera, 'Width', roi.get('width', 1280) // scale)
+        height = set_int(camera, 'Height', roi.get('height', 1080) // scale)
+        # 크기를 먼저 정했으므로 Offset 최대값이 남은 영역에 맞게 줄어 있음
+        set_int(camera, 'OffsetX', roi.get('x', 0) // scale)
+        set_int(camera, 'OffsetY', roi.get('y', 0) // scale)
+    else:
+        width = set_int(camera, 'Width', fallback_size[0])
+        height = set_int(camera, 'Height', fallback_size[1])
+        log(f"✓ 기본 해상도: {width}x{height}")
+
+    return read_roi(camera)
+
+
+def read_roi(camera) -> dict:
+    """현재 ROI (출력 픽셀 기준)"""
+    return {
+        'x': camera.OffsetX.Value if _readable(camera, 'OffsetX') else 0,
+        'y': camera.OffsetY.Value if _readable(camera, 'OffsetY') else 0,
+        'width': camera.Width.Value,
+        'height': camera.Height.Value,
+    }
+
+
+def apply_binning(camera, binning, decimation) -> int:
+    """
+    센서 비닝/데시메이션 (ROI 보다 먼저 적용해야 Width/Height 범위가 맞음)
+
+    :return: 적용된 배율 (가로 기준)
+    """
+    scale_x = 1
+    for prefix, values in (('Binning', binning), ('Decimation', decimation)):
+        h, v = (values, values) if isinstance(values, int) else tuple(values)
+        applied_h = set_int(camera, f'{prefix}Horizontal', h)
+        applied_v = set_int(camera, f'{prefix}Vertical', v)
+        if (h, v) != (1, 1) and applied_h is None:
+            log(f"⚠️ {prefix} 미지원 카메라, 무시")
+        scale_x *= applied_h or 1
+        if applied_v and applied_h and applied_v != applied_h:
+            log(f"⚠️ {prefix} 가로/세로 배율이 다름 ({applied_h}x{applied_v}), ROI 는 가로 배율로 환산")
+    return scale_x
+
+
+def apply_transport(camera, profile: dict):
+    """
+    GigE 전송 설정 (USB 카메라는 노드가 없어 무시)
+
+    - packet_size: 패킷 크기 (점보 프레임이면 8192 이상, NIC MTU 보다 크면 패킷 손실)
+    - inter_packet_delay / frame_transmission_delay: 한 NIC 에 카메라 여러 대일 때 링크 대역폭 분배
+    - socket_buffer_kb: 호스트 수신 소켓 버퍼 (스트림 그래버, grab 시작 전에만 설정 가능)
+    """
+    if profile.get('packet_size'):
+        set_int(camera, 'GevSCPSPacketSize', profile['packet_size'])
+    if profile.get('inter_packet_delay') is not None:
+        set_int(camera, 'GevSCPD', profile['inter_packet_delay'])
+    if profile.get('frame_transmission_delay') is not None:
+        set_int(camera, 'GevSCFTD', profile['frame_transmission_delay'])
+    if profile.get('socket_buffer_kb'):
+        grabber = getattr(camera, 'StreamGrabber', None)
+        if grabber is not None:
+            set_int(grabber, 'SocketBufferSize', profile['socket_buffer_kb'])
+
+
+def _stream_value(camera, name: str):
+    """스트림 그래버 파라미터 값 (없으면 None)"""
+    grabber = getattr(camera, 'StreamGrabber', None)
+    if grabber is None or not _readable(grabber, name):
+        return None
+    return getattr(grabber, name).GetValue()
+
+
+# 스트림 그래버 통계 노드 -> 통계 키 (GigE 전송 계층, 카메라 모델/드라이버에 따라 일부만 있음)
+STREAM_STATISTICS = {
+    'Statistic_Total_Buffer_Count': 'stream_buffers',
+    'Statistic_Failed_Buffer_Count': 'failed_buffers',
+    'Statistic_Buffer_Underrun_Count': 'buffer_underruns',
+    'Statistic_Total_Packet_Count': 'packets',
+    'Statistic_Failed_Packet_Count': 'failed_packets',
+    'Statistic_Resend_Request_Count': 'resend_requests',
+    'Statistic_Resend_Packet_Count': 'resent_packets',
+    'Statistic_Missed_Frame_Count': 'missed_frames',
+}
+
+
+def read_stream_statistics(camera) -> dict:
+    """스트림 그래버 누적 통계 (읽을 수 있는 항목만)"""
+    stats = {}
+    for node, key in STREAM_STATISTICS.items():
+        value = _stream_value(camera, node)
+        if value is not None:
+            stats[key] = int(value)
+    return stats
+
+
+def read_applied(camera) -> dict:
+    """카메라에서 실제 적용된 값 읽기 (프로파일 형식)"""
+    def value(name):
+        return getattr(camera, name).GetValue() if _readable(camera, name) else None
+
+    applied = {
+        'pixel_format': value('PixelFormat'),
+        'binning': [value('BinningHorizontal') or 1, value('BinningVertical') or 1],
+        'decimation': [value('DecimationHorizontal') or 1, value('DecimationVertical') or 1],
+        'roi': read_roi(camera),
+        'fps': value('ResultingFrameRateAbs') or value('ResultingFrameRate'),
+        'exposure_us': value('ExposureTimeRaw') or value('ExposureTimeAbs') or value('ExposureTime'),
+        'gain': value('GainRaw') if _readable(camera, 'GainRaw') else value('Gain'),
+        'packet_size': value('GevSCPSPacketSize'),
+        'inter_packet_delay': value('GevSCPD'),
+        'frame_transmission_delay': value('GevSCFTD'),
+        'socket_buffer_kb': _stream_value(camera, 'SocketBufferSize'),
+        'max_num_buffer': camera.MaxNumBuffer.Value,
+    }
+    return applied
+
+
+def dump_profile(serial: str, applied: dict, dump_dir: Optional[str] = CAMERA_PROFILE_DUMP_DIR):
+    """적용 결과 로그 + dump_dir 이 있으면 <시리얼>.json 으로 저장"""
+    lines = [f"  {key}: {applied[key]}" for key in PROFILE_KEYS if key in applied]
+    log(f"촬영 프로파일 적용 결과 ({serial}):\n" + "\n".join(lines))
+    if dump_dir:
+        try:
+            path = Path(dump_dir)
+            path.mkdir(parents=True, exist_ok=True)
+            with open(path / f"{serial}.json", 'w', encoding='utf-8') as f:
+                json.dump(applied, f, ensure_ascii=False, indent=2, default=str)
+        except OSError as e:
+            log(f"프로파일 저장 실패: {e}")
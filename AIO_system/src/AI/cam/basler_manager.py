@@ -1,11 +1,24 @@
 """Basler 카메라 매니저"""
+import time
 import traceback
-from typing import Optional
+from collections import deque
+from typing import Optional, Tuple
 
 import numpy as np
 from pypylon import pylon, genicam
 
+from src.AI.cam.acquisition_profile import (
+    apply_binning, apply_roi, apply_transport, dump_profile, read_applied,
+    read_stream_statistics, resolve_profile, set_enum, set_float, set_int
+)
+from src.AI.cam.bayer import BayerProcessor, BufferRing
+from src.AI.cam.device_registry import DeviceRegistry
+from src.AI.cam.trigger_counter import (
+    CHUNK_COUNTER_MODULUS, EXTENDED_BLOCK_ID_MODULUS, GEV1_BLOCK_ID_MODULUS, TriggerCounter
+)
+from src.AI.frame_mailbox import LatestFrameMailbox
 from src.utils.logger import log
+from src.utils.config_util import CAMERA_CAPTURE_CONFIG
 
 
 def get_camera_count() -> int:
@@ -13,8 +26,7 @@ def get_camera_count() -> int:
     연결된 카메라 개수 확인
     """
     try:
-        tl_factory = pylon.TlFactory.GetInstance()
-        devices = tl_factory.EnumerateDevices()
+        devices = DeviceRegistry.get_instance().devices()
         count = len(devices)
         log(f"카메라 {count}대 확인")
 
@@ -27,241 +39,226 @@ def get_camera_count() -> int:
         return 0
 
 
+class _GrabEventHandler(pylon.ImageEventHandler):
+    """pylon grab 스레드에서 프레임이 도착할 때마다 호출 (처리는 매니저에 위임)"""
+
+    def __init__(self, manager: "BaslerCameraManager"):
+        super().__init__()
+        self.manager = manager
+
+    def OnImageGrabbed(self, camera, grab_result):
+        self.manager._on_image_grabbed(grab_result)
+
+
 class BaslerCameraManager:
     """Basler 산업용 카메라 관리"""
-    def __init__(self, camera_index: int = 0, roi:dict = None):
+    # 링 버퍼 프레임을 추론 외에 붙잡고 있는 곳: grab 중 1 + 이벤트 우편함 1 + 카메라 스레드 1 + 화면 시그널 2
+    LOCAL_FRAMES = 5
+
+    def __init__(self, camera_index: int = 0, roi:dict = None, capture_config: dict = None,
+                 trigger_config: dict = None, frames_in_flight: int = 0):
+        """
+        :param frames_in_flight: 추론 쪽이 복사 없이 붙잡을 수 있는 프레임 수 (AI 매니저 frames_in_flight),
+                                 링 버퍼는 이것보다 커야 쓰는 중인 프레임을 덮어쓰지 않음
+        """
         self.camera = None
         self.converter = None
         self.camera_index = camera_index
         self.is_connected = False
         self.roi = roi
 
-    def initialize(self, camera_ip: str = None) -> bool:
-        """카메라 연결"""
-        try:
-            tl_factory = pylon.TlFactory.GetInstance()
-
-            if camera_ip:
-                device_info = pylon.DeviceInfo()
-                device_info.SetIpAddress(camera_ip)
-                self.camera = pylon.InstantCamera(tl_factory.CreateDevice(device_info))
-            else:
-                devices = tl_factory.EnumerateDevices()
-                if not devices:
-                    return False
-                if self.camera_index >= len(devices):
-                    return False
-                self.camera = pylon.InstantCamera(
-                    tl_factory.CreateDevice(devices[self.camera_index])
-                )
+        # Bayer 모드면 grab_frame 이 RGB 대신 RAW (H, W) 를 돌려줌 (bayer 로 필요할 때 변환)
+        self.capture_config = dict(capture_config if capture_config is not None else CAMERA_CAPTURE_CONFIG)
+        self.pixel_format = self.capture_config.get('pixel_format', 'BayerBG8')
+        self.bayer: Optional[BayerProcessor] = None
+        self.pool_size = max(self.capture_config.get('pool_size', 6), frames_in_flight + self.LOCAL_FRAMES)
+        if self.pool_size > self.capture_config.get('pool_size', 6):
+            log(f"카메라 {camera_index}: 링 버퍼 {self.capture_config.get('pool_size', 6)} -> {self.pool_size}개 "
+                f"(추론 파이프라인 {frames_in_flight} + 카메라 쪽 {self.LOCAL_FRAMES})")
+
+        self.startup_timing = {}        # 시작 단계별 소요 시간 (초)
+
+        # 촬영 프로파일 (연결 후 시리얼로 결정)
+        self.serial = ''
+        self.profile: dict = {}
+        self.applied_profile: dict = {}
+        self.sensor_scale = 1           # 비닝 x 데시메이션 배율
+
+        # 하드웨어 트리거 모드 (엔코더/라인 트리거 펄스마다 한 프레임)
+        self.trigger_config = dict(trigger_config or {})
+        self.trigger_mode = bool(self.trigger_config.get('enabled', False))
+        self.last_trigger_count = -1    # 마지막 프레임의 누적 트리거 수 (카운터 되감김 보정)
+        self._trigger_counter = TriggerCounter()
+        self._counter_chunk = None      # 트리거 카운터 청크 이름 (카메라 모델별로 다름)
+
+        # 마지막 프레임 촬영 시각 (time.perf_counter 기준으로 환산한 카메라 타임스탬프)
+        self.last_capture_time = 0.0
+        self.last_block_id = -1
+        self._tick_frequency = 1e9      # 카메라 타임스탬프 틱 주파수 (Hz)
+        self._clock_offset = None       # perf_counter - 카메라 시각 (초), 최소값 추적
+
+        # 캡처 쪽 손실 통계 (추론 쪽 손실과 구분용)
+        self.grabbed_frames = 0
+        self.grab_failed = 0            # GrabSucceeded() == False (불완전 프레임 등)
+        self.grab_errors = 0            # 타임아웃/예외
+        self.skipped_images = 0         # LatestImageOnly 로 덮어써진 프레임 (호스트가 늦게 꺼냄)
+        self.last_grab_error = ''
+        self.bandwidth_mb_s = 0.0
+        self._bw_bytes = 0
+        self._bw_start = time.perf_counter()
+
+        # 이벤트 grab 모드: pylon grab 스레드가 미리 할당한 링에 프레임을 쓰고 우편함으로 처리 스레드를 깨움
+        # (RetrieveResult 타임아웃 폴링 없음, 프레임 간격은 도착 시점에 측정)
+        self.event_mode = self.capture_config.get('grab_mode', 'poll') == 'event'
+        self._event_handler = None
+        self._mailbox: Optional[LatestFrameMailbox] = None
+        self._rgb_ring: Optional[BufferRing] = None
+        self._last_arrival = 0.0
+        self.frame_intervals = deque(maxlen=120)  # 도착 간격 (초)
+
+    def initialize(self, camera_ip: str = None, serial: str = None) -> bool:
+        """
+        카메라 연결 (장치 목록은 DeviceRegistry 캐시 공유)
 
-                device = devices[self.camera_index]
-                log(f"선택된 카메라: {device.GetModelName()} - {device.GetSerialNumber()}")
-                log(f"  • IP 주소: {device.GetIpAddress()}")
-                log(f"  • 맥 주소: {device.GetMacAddress()}")
-                self.camera = pylon.InstantCamera(tl_factory.CreateDevice(device))
+        serial > camera_ip > camera_index 순으로 장치 선택, 단계별 소요 시간은 startup_timing
+        """
+        registry = DeviceRegistry.get_instance()
+        self.startup_timing = {}
+        try:
+            t0 = time.perf_counter()
+            device = registry.find(serial=serial, ip=camera_ip, index=self.camera_index)
+            t1 = time.perf_counter()
+            self.startup_timing['enumerate'] = t1 - t0
+            if device is None:
+                log(f"카메라 {self.camera_index} 장치 없음 (serial={serial}, ip={camera_ip})")
+                return False
+
+            log(f"선택된 카메라: {device.GetModelName()} - {device.GetSerialNumber()} "
+                f"(IP {device.GetIpAddress()}, MAC {device.GetMacAddress()})")
+            self.camera = pylon.InstantCamera(pylon.TlFactory.GetInstance().CreateDevice(device))
+            t2 = time.perf_counter()
+            self.startup_timing['create'] = t2 - t1
 
             self.camera.Open()
+            t3 = time.perf_counter()
+            self.startup_timing['open'] = t3 - t2
+            self.serial = device.GetSerialNumber()
+            self.profile = resolve_profile(self.serial, self.roi)
+            if self.profile.get('pixel_format'):
+                self.pixel_format = self.profile['pixel_format']
             self.setup_camera_parameters()
-
-            self.converter = pylon.ImageFormatConverter()
-            self.converter.OutputPixelFormat = pylon.PixelType_RGB8packed
-            self.converter.OutputBitAlignment = pylon.OutputBitAlignment_MsbAligned
+            self.startup_timing['configure'] = time.perf_counter() - t3
+
+            current_format = self.camera.PixelFormat.GetValue()
+            if self.capture_config.get('bayer_mode', False) and current_format.startswith('Bayer'):
+                self.bayer = BayerProcessor(
+                    current_format,
+                    pool_size=self.pool_size,
+                    preview_pool_size=self.capture_config.get('preview_pool_size', 3)
+                )
+                log(f"Bayer RAW 캡처 ({current_format}, 버퍼 {self.pool_size}개)")
+            else:
+                if self.capture_config.get('bayer_mode', False):
+                    log(f"⚠️ Bayer 모드 불가 (현재 {current_format}), RGB 변환 사용")
+                self.converter = pylon.ImageFormatConverter()
+                self.converter.OutputPixelFormat = pylon.PixelType_RGB8packed
+                self.converter.OutputBitAlignment = pylon.OutputBitAlignment_MsbAligned
 
             self.is_connected = True
-            log("Basler 카메라 연결 성공!")
+            log(f"Basler 카메라 연결 성공! ({self._format_timing()})")
             return True
         except Exception as e:
             log(f"카메라 연결 실패: {e}")
+            # 장치가 빠졌거나 IP 가 바뀌었을 수 있으므로 다음 시도에서 다시 검색
+            registry.invalidate()
             return False
 
+    def _format_timing(self) -> str:
+        """시작 단계별 시간 로그 문자열"""
+        return ", ".join(f"{name} {sec * 1000:.0f}ms" for name, sec in self.startup_timing.items())
+
     def setup_camera_parameters(self):
         """
-        카메라별 옵션 상세 설정 필요함.
-        
-        카메라 인덱스 받아서 각 카메라별 설정값 명백히 맵핑해서 동작해야함.
+        카메라 시리얼별 촬영 프로파일 적용 (CAMERA_ACQUISITION_PROFILES)
+
+        순서: 버퍼/픽셀 포맷 -> 비닝/데시메이션 -> ROI -> 패킷 -> 노출/게인 -> 트리거/프레임 속도
+        (비닝이 Width/Height 범위를 바꾸므로 ROI 보다 먼저)
         """
         try:
-            log("\n" + "="*50)
-            log(f"Basler 카메라 {self.camera_index} 설정 시작...")
-            log("="*50)
-
-            # 카메라 최대 해상도 및 제약사항 확인
-            max_width = self.camera.Width.Max
-            max_height = self.camera.Height.Max
-            min_width = self.camera.Width.Min
-            min_height = self.camera.Height.Min
-            width_inc = self.camera.Width.GetInc()
-            height_inc = self.camera.Height.GetInc()
-
-            log("카메라 해상도 제약:")
-            log(f"  Width: {min_width} ~ {max_width} (증분: {width_inc})")
-            log(f"  Height: {min_height} ~ {max_height} (증분: {height_inc})")
-
-            # 1) 버퍼 최소화
-            self.camera.MaxNumBuffer.Value = 3
+            log(f"Basler 카메라 {self.camera_index} 설정 시작... (시리얼 {self.serial}, "
+                f"최대 {self.camera.Width.Max}x{self.camera.Height.Max})")
+            profile = self.profile
+
+            # 1) 드라이버 버퍼 수
+            self.camera.MaxNumBuffer.Value = int(profile.get('max_num_buffer', 3))
             log(f"✓ MaxNumBuffer = {self.camera.MaxNumBuffer.Value}")
 
-            # 2) PixelFormat RAW 설정
+            # 2) PixelFormat
             try:
-                if self.camera.PixelFormat.GetAccessMode() == genicam.RW:
-                    self.camera.PixelFormat.SetValue("BayerBG8")
-                    log("✓ PixelFormat = BayerBG8 (RAW)")
+                if set_enum(self.camera, 'PixelFormat', self.pixel_format):
+                    log(f"✓ PixelFormat = {self.pixel_format}")
                 else:
-                    current_format = self.camera.PixelFormat.GetValue()
-                    log(f"⚠️ PixelFormat 변경 불가, 현재: {current_format}")
+                    log(f"⚠️ PixelFormat 변경 불가, 현재: {self.camera.PixelFormat.GetValue()}")
             except Exception as e:
                 log(f"❌ PixelFormat 설정 실패: {e}")
 
-            # 3) ROI 설정
-            if self.roi:
-                try:
-                    offset_x = self.roi.get('x', 0)
-                    offset_y = self.roi.get('y', 0)
-                    width = self.roi.get('width', 1280)
-                    height = self.roi.get('height', 1080)
-
-                    log("\n요청 ROI:")
-                    log(f"  Offset: ({offset_x}, {offset_y})")
-                    log(f"  Size: {width} x {height}")
-
-                    # Step 1: Offset을 0으로 초기화
-                    if hasattr(self.camera, 'OffsetX') and \
-                    self.camera.OffsetX.GetAccessMode() == genicam.RW:
-                        self.camera.OffsetX.SetValue(0)
-                        log("✓ OffsetX = 0 (초기화)")
-
-                    if hasattr(self.camera, 'OffsetY') and \
-                    self.camera.OffsetY.GetAccessMode() == genicam.RW:
-                        self.camera.OffsetY.SetValue(0)
-                        log("✓ OffsetY = 0 (초기화)")
-
-                    # Step 2: Width 설정
-                    adjusted_width = (width // width_inc) * width_inc
-
-                    # 최소/최대값 검증
-                    if adjusted_width < min_width:
-                        adjusted_width = min_width
-                        log(f"⚠️ Width가 최소값({min_width})보다 작음. 조정함")
-
-                    if adjusted_width > max_width:
-                        adjusted_width = max_width
-                        log(f"⚠️ Width가 최대값({max_width})보다 큼. 조정함")
-
-                    # Offset 고려
-                    if offset_x + adjusted_width > max_width:
-                        adjusted_width = max_width - offset_x
-                        adjusted_width = (adjusted_width // width_inc) * width_inc
-                        log(f"⚠️ OffsetX 고려하여 Width 재조정: {adjusted_width}")
-
-                    self.camera.Width.SetValue(adjusted_width)
-                    log(f"✓ Width = {adjusted_width}")
-
-                    # Step 3: Height 설정
-                    adjusted_height = (height // height_inc) * height_inc
-
-                    # 최소/최대값 검증
-                    if adjusted_height < min_height:
-                        adjusted_height = min_height
-                        log(f"⚠️ Height가 최소값({min_height})보다 작음. 조정함")
-
-                    if adjusted_height > max_height:
-                        adjusted_height = max_height
-                        log(f"⚠️ Height가 최대값({max_height})보다 큼. 조정함")
-
-                    # Offset 고려
-                    if offset_y + adjusted_height > max_height:
-                        adjusted_height = max_height - offset_y
-                        adjusted_height = (adjusted_height // height_inc) * height_inc
-                        log(f"⚠️ OffsetY 고려하여 Height 재조정: {adjusted_height}")
-
-                    self.camera.Height.SetValue(adjusted_height)
-                    log(f"✓ Height = {adjusted_height}")
-
-                    # Step 4: Offset 설정
-                    if hasattr(self.camera, 'OffsetX') and \
-                    self.camera.OffsetX.GetAccessMode() == genicam.RW:
-                        offset_x_inc = self.camera.OffsetX.GetInc()
-                        adjusted_offset_x = (offset_x // offset_x_inc) * offset_x_inc
-
-                        # 범위 검증
-                        current_width = self.camera.Width.Value
-                        if adjusted_offset_x + current_width > max_width:
-                            adjusted_offset_x = max_width - current_width
-                            adjusted_offset_x = (adjusted_offset_x // offset_x_inc) * offset_x_inc
-                            log(f"⚠️ OffsetX 재조정: {adjusted_offset_x}")
-
-                        self.camera.OffsetX.SetValue(adjusted_offset_x)
-                        log(f"✓ OffsetX = {adjusted_offset_x}")
-
-                    if hasattr(self.camera, 'OffsetY') and \
-                    self.camera.OffsetY.GetAccessMode() == genicam.RW:
-                        offset_y_inc = self.camera.OffsetY.GetInc()
-                        adjusted_offset_y = (offset_y // offset_y_inc) * offset_y_inc
-
-                        # 범위 검증
-                        current_height = self.camera.Height.Value
-                        if adjusted_offset_y + current_height > max_height:
-                            adjusted_offset_y = max_height - current_height
-                            adjusted_offset_y = (adjusted_offset_y // offset_y_inc) * offset_y_inc
-                            log(f"⚠️ OffsetY 재조정: {adjusted_offset_y}")
-
-                        self.camera.OffsetY.SetValue(adjusted_offset_y)
-                        log(f"OffsetY = {adjusted_offset_y}")
-
-                    # 최종 확인
-                    final_offset_x = self.camera.OffsetX.Value \
-                        if hasattr(self.camera, 'OffsetX') else 0
-                    final_offset_y = self.camera.OffsetY.Value \
-                        if hasattr(self.camera, 'OffsetY') else 0
-                    final_width = self.camera.Width.Value
-                    final_height = self.camera.Height.Value
-
-                    log("\n최종 ROI 설정:")
-                    log(f"  Offset: ({final_offset_x}, {final_offset_y})")
-                    log(f"  Size: {final_width} x {final_height}")
-                    log(f"  영역: X[{final_offset_x}~{final_offset_x+final_width}], Y[{final_offset_y}~{final_offset_y+final_height}]")
-
-                except Exception as e:
-                    log(f"ROI 설정 실패: {e}")
-                    traceback.print_exc()
-                    # ROI 실패 시 기본 해상도
-                    self.camera.Width.SetValue(min(1280, max_width))
-                    self.camera.Height.SetValue(min(720, max_height))
-            else:
-                # ROI 없으면 기본 해상도
-                self.camera.Width.SetValue(min(1280, max_width))
-                self.camera.Height.SetValue(min(720, max_height))
-                log(f"✓ 기본 해상도: {self.camera.Width.Value}x{self.camera.Height.Value}")
+            # 3) 비닝 / 데시메이션 (센서 쪽에서 픽셀 수 감소)
+            try:
+                self.sensor_scale = apply_binning(
+                    self.camera, profile.get('binning', [1, 1]), profile.get('decimation', [1, 1])
+                )
+                if self.sensor_scale > 1:
+                    log(f"✓ 비닝/데시메이션 배율 x{self.sensor_scale}")
+            except Exception as e:
+                log(f"비닝/데시메이션 설정 실패: {e}")
+
+            # 4) ROI (센서 픽셀 기준 -> 출력 픽셀로 환산)
+            fallback_size = tuple(profile.get('fallback_size', (1280, 720)))
+            try:
+                final = apply_roi(self.camera, profile.get('roi'), self.sensor_scale, fallback_size)
+                log(f"✓ ROI: ({final['x']}, {final['y']}) {final['width']}x{final['height']} "
+                    f"(요청 {profile.get('roi')})")
+            except Exception as e:
+                log(f"ROI 설정 실패: {e}")
+                traceback.print_exc()
+                # ROI 실패 시 기본 해상도
+                apply_roi(self.camera, None, 1, fallback_size)
+
+            # 5) GigE 패킷 크기 / 패킷 간 지연 / 수신 버퍼
+            try:
+                apply_transport(self.camera, profile)
+            except Exception as e:
+                log(f"패킷 설정 실패: {e}")
 
-            # 4) 자동 노출 끄기
+            # 6) 자동 노출 끄기
             self.camera.ExposureAuto.SetValue("Off")
             log("ExposureAuto: Off")
+            target_fps = float(profile.get('fps') or 60.0)
             try:
-                target_fps = 60
-                exposure_us = int(1_000_000 / target_fps)
-                exposure_us = max(self.camera.ExposureTimeRaw.Min, 
-                                min(exposure_us, self.camera.ExposureTimeRaw.Max))
-                self.camera.ExposureTimeRaw.SetValue(exposure_us)
-                log(f"ExposureTimeRaw = {exposure_us} us (≈{1_000_000/exposure_us:.1f} FPS 제한)")
+                exposure_us = profile.get('exposure_us') or int(1_000_000 / target_fps)
+                if self.trigger_mode:
+                    # 트리거 모드는 펄스 간격보다 짧은 고정 노출 (움직임 번짐 방지)
+                    exposure_us = int(self.trigger_config.get('exposure_us', 1000))
+                exposure_us = set_int(self.camera, 'ExposureTimeRaw', exposure_us) \
+                    or set_float(self.camera, 'ExposureTime', exposure_us)
+                log(f"ExposureTime = {exposure_us} us (≈{1_000_000/exposure_us:.1f} FPS 제한)")
             except Exception as e:
                 log(f"ExposureTime 설정 실패: {e}")
 
-            # GainAuto 끄기
+            # GainAuto 끄기 (gain 이 있으면 값도 설정)
             try:
                 if hasattr(self.camera, "GainAuto"):
                     self.camera.GainAuto.SetValue("Off")
                     log("GainAuto: Off")
+                if profile.get('gain') is not None:
+                    gain = set_int(self.camera, 'GainRaw', profile['gain']) \
+                        or set_float(self.camera, 'Gain', profile['gain'])
+                    log(f"Gain = {gain}")
             except Exception as e:
-                log(f"GainAuto 설정 실패: {e}")
+                log(f"Gain 설정 실패: {e}")
 
-            # TriggerMode off
-            try:
-                if hasattr(self.camera, "TriggerMode"):
-                    self.camera.TriggerMode.SetValue("Off")
-                    log("TriggerMode: Off")
-            except Exception as e:
-                log(f"TriggerMode 설정 실패: {e}")
+            # TriggerMode (기본 Off, 트리거 모드면 FrameStart 를 하드웨어 라인에 연결)
+            self._setup_trigger()
 
             # Continuous 모드
             try:
@@ -271,53 +268,353 @@ class BaslerCameraManager:
             except Exception as e:
                 log(f"AcquisitionMode 설정 실패: {e}")
 
-            if hasattr(self.camera, "AcquisitionFrameRateEnable"):
-                self.camera.AcquisitionFrameRateEnable.SetValue(True)
-                log("AcquisitionFrameRateEnable: On")
-            if hasattr(self.camera, "AcquisitionFrameRateAbs"):
-                target_fps = 60.0
-                self.camera.AcquisitionFrameRateAbs.SetValue(target_fps)
-                log(f"AcquisitionFrameRateAbs = {target_fps} Hz")
+            if self.trigger_mode:
+                # 프레임 속도는 트리거 펄스가 결정
+                if hasattr(self.camera, "AcquisitionFrameRateEnable"):
+                    self.camera.AcquisitionFrameRateEnable.SetValue(False)
+                    log("AcquisitionFrameRateEnable: Off (트리거)")
+            else:
+                if hasattr(self.camera, "AcquisitionFrameRateEnable"):
+                    self.camera.AcquisitionFrameRateEnable.SetValue(True)
+                    log("AcquisitionFrameRateEnable: On")
+                fps = set_float(self.camera, 'AcquisitionFrameRateAbs', target_fps) \
+                    or set_float(self.camera, 'AcquisitionFrameRate', target_fps)
+                log(f"AcquisitionFrameRate = {fps} Hz")
+
+            # 타임스탬프 청크 (프레임별 촬영 시각)
+            self._enable_timestamp_chunk()
+
+            # 실제 적용 값 다시 읽어서 남김
+            self.applied_profile = read_applied(self.camera)
+            dump_profile(self.serial, self.applied_profile)
 
             log("Basler 설정 완료!\n")
 
         except Exception as e:
             log(f"Basler 설정 오류: {e}")
 
+    def _setup_trigger(self):
+        """FrameStart 트리거 설정 (트리거 모드가 아니면 Off)"""
+        try:
+            if not hasattr(self.camera, "TriggerMode"):
+                if self.trigger_mode:
+                    log("⚠️ 트리거 미지원 카메라, 연속 촬영으로 동작")
+                    self.trigger_mode = False
+                return
+
+            if hasattr(self.camera, "TriggerSelector"):
+                self.camera.TriggerSelector.SetValue("FrameStart")
+            if not self.trigger_mode:
+                self.camera.TriggerMode.SetValue("Off")
+                log("TriggerMode: Off")
+                return
+
+            source = self.trigger_config.get('source', 'Line1')
+            activation = self.trigger_config.get('activation', 'RisingEdge')
+            self.camera.TriggerMode.SetValue("On")
+            self.camera.TriggerSource.SetValue(source)
+            if hasattr(self.camera, "TriggerActivation"):
+                self.camera.TriggerActivation.SetValue(activation)
+            log(f"TriggerMode: On (FrameStart <- {source}, {activation}, "
+                f"{self.trigger_config.get('px_per_trigger', 0)} px/트리거)")
+        except Exception as e:
+            log(f"TriggerMode 설정 실패 (연속 촬영으로 동작): {e}")
+            self.trigger_mode = False
+            try:
+                self.camera.TriggerMode.SetValue("Off")
+            except Exception:
+                pass
+
+    def _enable_timestamp_chunk(self):
+        """Chunk Timestamp 활성화 + 타임스탬프 틱 주파수 확인"""
+        try:
+            if hasattr(self.camera, "GevTimestampTickFrequency"):
+                self._tick_frequency = float(self.camera.GevTimestampTickFrequency.Value)
+        except Exception:
+            pass
+
+        try:
+            if hasattr(self.camera, "ChunkModeActive") and \
+            self.camera.ChunkModeActive.GetAccessMode() == genicam.RW:
+                self.camera.ChunkModeActive.SetValue(True)
+                self.camera.ChunkSelector.SetValue("Timestamp")
+                self.camera.ChunkEnable.SetValue(True)
+                log(f"ChunkTimestamp: On ({self._tick_frequency / 1e6:.0f} MHz)")
+        except Exception as e:
+            log(f"ChunkTimestamp 설정 실패: {e}")
+
+        if self.trigger_mode:
+            self._enable_counter_chunk()
+
+    # 트리거 입력 카운터 청크 (GigE: Triggerinputcounter, USB: CounterValue - Counter1 이벤트 소스 FrameTrigger)
+    # Framecounter 는 촬영한 프레임 수라 트리거 분주(divider)가 1이 아니면 트리거 수와 다르므로 쓰지 않음
+    TRIGGER_COUNTER_CHUNKS = ("Triggerinputcounter", "CounterValue")
+
+    def _enable_counter_chunk(self):
+        """
+        트리거 수 출처를 시작할 때 한 번만 정함 (이후 절대 바꾸지 않음)
+
+        카운터 청크가 있으면 청크, 없으면 블록 ID. 되감김 주기는 출처의 실제 비트 폭으로 결정
+        """
+        try:
+            chunk_mode = bool(self.camera.ChunkModeActive.GetValue())
+        except Exception:
+            chunk_mode = False
+
+        for name in self.TRIGGER_COUNTER_CHUNKS if chunk_mode else ():
+            try:
+                self.camera.ChunkSelector.SetValue(name)
+                self.camera.ChunkEnable.SetValue(True)
+            except Exception:
+                continue
+            self._counter_chunk = f"Chunk{name}"
+            modulus = CHUNK_COUNTER_MODULUS
+            try:
+                modulus = int(getattr(self.camera, self._counter_chunk).GetMax()) + 1
+            except Exception:
+                pass
+            self._trigger_counter.restart(modulus)
+            log(f"Chunk{name}: On (트리거 카운트, 주기 {modulus})")
+            return
+
+        self._counter_chunk = None
+        self._trigger_counter.restart(self._block_id_modulus())
+        log(f"⚠️ 트리거 카운터 청크 없음, 블록 ID로 트리거 수 추정 (주기 {self._trigger_counter.modulus}, "
+            f"프레임 수 기준이라 트리거 분주가 1이어야 px_per_trigger 가 맞음)")
+
+    def _block_id_modulus(self) -> int:
+        """
+        블록 ID 되감김 주기
+
+        GigE Vision 1.x 는 16비트이고 0 을 건너뛰므로 1 ~ 65535 (주기 65535),
+        GigE 확장 ID / USB3 는 64비트
+        """
+        try:
+            if self.camera.GetDeviceInfo().GetDeviceClass() != "BaslerGigE":
+                return EXTENDED_BLOCK_ID_MODULUS
+            mode = getattr(self.camera, "GevGVSPExtendedIDMode", None)
+            if mode is not None and genicam.IsReadable(mode) and mode.GetValue() == "On":
+                return EXTENDED_BLOCK_ID_MODULUS
+        except Exception:
+            pass
+        return GEV1_BLOCK_ID_MODULUS
+
+    def _trigger_count(self, grab_result) -> int:
+        """
+        누적 트리거 수 (시작 시 정한 한 가지 출처만 사용, 출처 비트 폭으로 되감김 보정)
+
+        카운터 청크를 이번 프레임에 읽지 못하면 블록 ID 로 대신하지 않고 이전 값을 유지
+        (다음에 읽히는 프레임의 증가분에 빠진 트리거가 포함됨)
+        """
+        if self._counter_chunk:
+            try:
+                node = getattr(grab_result, self._counter_chunk)
+                raw = int(node.Value) if node.IsReadable() else None
+            except Exception:
+                raw = None
+        else:
+            raw = int(grab_result.GetBlockID())
+        return self._trigger_counter.update(raw)
+
+    def _capture_time(self, grab_result) -> float:
+        """
+        프레임 촬영 시각 (time.perf_counter 기준)
+
+        카메라 타임스탬프(청크 > 전송 계층 순)를 호스트 시계로 환산.
+        (수신 시각 - 카메라 시각)의 최소값을 오프셋으로 써서 전송 지연을 빼고,
+        타임스탬프가 없으면 수신 시각을 사용
+        """
+        now = time.perf_counter()
+        try:
+            if hasattr(grab_result, "ChunkTimestamp") and grab_result.ChunkTimestamp.IsReadable():
+                ticks = grab_result.ChunkTimestamp.Value
+            else:
+                ticks = grab_result.GetTimeStamp()
+        except Exception:
+            return now
+        if not ticks:
+            return now
+
+        camera_time = ticks / self._tick_frequency
+        if self._clock_offset is None or now - camera_time < self._clock_offset:
+            self._clock_offset = now - camera_time
+        return camera_time + self._clock_offset
+
     def grab_frame(self) -> Optional[np.ndarray]:
-        """프레임 grab"""
+        """
+        프레임 grab
+
+        :return: RGB (H, W, 3), Bayer 모드면 RAW (H, W) - 링 버퍼라 pool_size 프레임 뒤에 덮어써짐
+        """
         if not self.is_connected or not self.camera:
             return None
+        if self.event_mode:
+            return self._wait_frame()
         try:
             if self.camera and self.camera.IsGrabbing():
-                grab_result = self.camera.RetrieveResult(100, pylon.TimeoutHandling_ThrowException)
-                if grab_result.GrabSucceeded():
-                    image = self.converter.Convert(grab_result)
-                    frame = image.GetArray()
-                    if not hasattr(self, '_frame_size_logged'):
-                        log(f"[카메라 {self.camera_index}] 실제 프레임 크기: {frame.shape}")
-                        log(f"[카메라 {self.camera_index}] 설정된 Width: {self.camera.Width.Value}")
-                        log(f"[카메라 {self.camera_index}] 설정된 Height: {self.camera.Height.Value}")
-                        log(f"[카메라 {self.camera_index}] 설정된 OffsetX: {self.camera.OffsetX.Value if hasattr(self.camera, 'OffsetX') else 0}")
-                        log(f"[카메라 {self.camera_index}] 설정된 OffsetY: {self.camera.OffsetY.Value if hasattr(self.camera, 'OffsetY') else 0}")
-                        self._frame_size_logged = True
-                    grab_result.Release()
-                    return frame
+                if self.trigger_mode:
+                    # 벨트가 멈추면 트리거가 없으므로 타임아웃은 오류가 아님
+                    grab_result = self.camera.RetrieveResult(100, pylon.TimeoutHandling_Return)
+                    if not grab_result.IsValid():
+                        return None
                 else:
+                    grab_result = self.camera.RetrieveResult(100, pylon.TimeoutHandling_ThrowException)
+                try:
+                    grabbed = self._read_result(grab_result)
+                finally:
                     grab_result.Release()
+                if grabbed is not None:
+                    frame, self.last_capture_time, self.last_trigger_count = grabbed
+                    return frame
         except Exception as e:
+            self.grab_errors += 1
             log(f"프레임 캡처 오류: {e}")
         return None
 
+    def _read_result(self, grab_result) -> Optional[Tuple[np.ndarray, float, int]]:
+        """
+        grab 결과 -> (프레임, 촬영 시각, 누적 트리거 수), 실패면 None (grab_result 해제는 호출 측)
+
+        Bayer 모드는 RAW 링으로, 이벤트 모드 RGB 는 RGB 링으로 복사해서 카메라 버퍼를 바로 반납
+        """
+        if not grab_result.GrabSucceeded():
+            self.grab_failed += 1
+            self.last_grab_error = f"{grab_result.GetErrorCode():#x} {grab_result.GetErrorDescription()}"
+            log(f"[카메라 {self.camera_index}] grab 실패: {self.last_grab_error}")
+            return None
+
+        self._count_grab(grab_result)
+        capture_time = self._capture_time(grab_result)
+        self.last_block_id = grab_result.GetBlockID()
+        trigger_count = self._trigger_count(grab_result) if self.trigger_mode else -1
+        if self.bayer is not None:
+            # 카메라 버퍼를 그대로 보고 RAW 링으로 1바이트/픽셀 복사 후 바로 반납
+            with grab_result.GetArrayZeroCopy() as raw_view:
+                frame = self.bayer.store(raw_view)
+        else:
+            frame = self.converter.Convert(grab_result).GetArray()
+            if self._rgb_ring is not None:
+                ring_frame = self._rgb_ring.next(frame.shape)
+                np.copyto(ring_frame, frame)
+                frame = ring_frame
+        if not hasattr(self, '_frame_size_logged'):
+            log(f"[카메라 {self.camera_index}] 실제 프레임 크기: {frame.shape}")
+            log(f"[카메라 {self.camera_index}] 설정된 Width: {self.camera.Width.Value}")
+            log(f"[카메라 {self.camera_index}] 설정된 Height: {self.camera.Height.Value}")
+            log(f"[카메라 {self.camera_index}] 설정된 OffsetX: {self.camera.OffsetX.Value if hasattr(self.camera, 'OffsetX') else 0}")
+            log(f"[카메라 {self.camera_index}] 설정된 OffsetY: {self.camera.OffsetY.Value if hasattr(self.camera, 'OffsetY') else 0}")
+            self._frame_size_logged = True
+        return frame, capture_time, trigger_count
+
+    def _on_image_grabbed(self, grab_result):
+        """이벤트 모드: pylon grab 스레드에서 프레임 도착 (링에 복사 후 우편함에 최신 프레임으로 등록)"""
+        try:
+            now = time.perf_counter()
+            if self._last_arrival:
+                self.frame_intervals.append(now - self._last_arrival)
+            self._last_arrival = now
+
+            grabbed = self._read_result(grab_result)
+            if grabbed is not None:
+                self._mailbox.put(0, grabbed)
+        except Exception as e:
+            self.grab_errors += 1
+            log(f"프레임 캡처 오류: {e}")
+
+    def is_grabbing(self) -> bool:
+        """grab 중인지 (False 면 grab_frame 이 기다리지 않고 None 을 돌려주므로 호출 측 루프 종료)"""
+        if not (self.camera and self.is_connected):
+            return False
+        if self.event_mode and (self._mailbox is None or self._mailbox.closed):
+            return False
+        return self.camera.IsGrabbing()
+
+    def _wait_frame(self, timeout: float = 0.1) -> Optional[np.ndarray]:
+        """이벤트 모드: 새 프레임이 올 때까지 대기 (타임아웃/종료면 None)"""
+        item = self._mailbox.collect(timeout, 0.0).get(0)
+        if item is None:
+            return None
+        frame, self.last_capture_time, self.last_trigger_count = item
+        return frame
+
+    def _count_grab(self, grab_result):
+        """수신 프레임 수 / 건너뛴 프레임 / 대역폭 집계"""
+        self.grabbed_frames += 1
+        self.skipped_images += grab_result.GetNumberOfSkippedImages()
+        self._bw_bytes += grab_result.GetPayloadSize()
+        now = time.perf_counter()
+        if now - self._bw_start >= 1.0:
+            self.bandwidth_mb_s = self._bw_bytes / (now - self._bw_start) / 1e6
+            self._bw_bytes = 0
+            self._bw_start = now
+
+    def get_transport_stats(self) -> dict:
+        """
+        캡처/전송 통계
+
+        capture_dropped: 카메라~호스트 구간에서 잃은 프레임 (grab 실패 + 실패 버퍼 + 놓친 프레임)
+        """
+        stats = {
+            'grabbed_frames': self.grabbed_frames,
+            'grab_failed': self.grab_failed,
+            'grab_errors': self.grab_errors,
+            'skipped_images': self.skipped_images,
+            'bandwidth_mb_s': round(self.bandwidth_mb_s, 2),
+        }
+        if self.last_grab_error:
+            stats['last_grab_error'] = self.last_grab_error
+        if self.trigger_mode:
+            stats['trigger_count_missing'] = self._trigger_counter.missing
+        if self.event_mode and self._mailbox is not None:
+            # 처리 스레드가 꺼내기 전에 새 프레임으로 덮어쓴 수 (호스트 처리 지연)
+            stats['host_overwritten'] = self._mailbox.overwrites[0]
+            intervals = list(self.frame_intervals)
+            if intervals:
+                stats['frame_interval_ms'] = round(sum(intervals) / len(intervals) * 1000, 2)
+                stats['frame_interval_max_ms'] = round(max(intervals) * 1000, 2)
+        if self.camera is not None and self.is_connected:
+            try:
+                stats.update(read_stream_statistics(self.camera))
+            except Exception:
+                pass
+        stats['capture_dropped'] = self.grab_failed + stats.get('failed_buffers', 0) \
+            + stats.get('missed_frames', 0)
+        return stats
+
     def start_grabbing(self):
-        """grab 시작"""
-        if self.camera and self.is_connected:
+        """grab 시작 (이벤트 모드면 pylon 내부 grab 루프 + 이벤트 핸들러)"""
+        if not (self.camera and self.is_connected):
+            return
+        t0 = time.perf_counter()
+        self._start_grabbing()
+        self.startup_timing['start'] = time.perf_counter() - t0
+
+    def _start_grabbing(self):
+        if not self.event_mode:
             self.camera.StartGrabbing(pylon.GrabStrategy_LatestImageOnly)
+            return
+
+        if self._mailbox is None:
+            self._mailbox = LatestFrameMailbox(1)
+            self._event_handler = _GrabEventHandler(self)
+            self.camera.RegisterImageEventHandler(
+                self._event_handler, pylon.RegistrationMode_ReplaceAll, pylon.Cleanup_None
+            )
+        else:
+            self._mailbox.reopen()
+        if self.bayer is None:
+            self._rgb_ring = BufferRing(self.pool_size)
+        self._last_arrival = 0.0
+        self.camera.StartGrabbing(pylon.GrabStrategy_LatestImageOnly, pylon.GrabLoop_ProvidedByInstantCamera)
+        log(f"카메라 {self.camera_index}: 이벤트 grab 모드")
 
     def stop_grabbing(self):
         """grab 종료"""
         if self.camera and self.is_connected:
             self.camera.StopGrabbing()
+        if self._mailbox is not None:
+            # 대기 중인 처리 스레드 깨우기
+            self._mailbox.close()
 
     def close(self):
         """연결 종료"""
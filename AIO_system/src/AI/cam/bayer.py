@@ -0,0 +1,95 @@
+"""
+src/AI/cam/bayer.py
+
+Bayer RAW 프레임 처리 (RGB 변환은 필요한 곳에서만)
+- 카메라 버퍼(zero-copy 뷰)를 미리 할당한 NumPy 링 버퍼로 1바이트/픽셀 복사만 하고 바로 반납
+- 추론용: 2x2 셀을 한 픽셀로 합치는 절반 해상도 디베이어 (보간 없음, 픽셀 수 1/4)
+- 화면용: OpenCV 디베이어를 미리 할당한 RGB 버퍼에 바로 기록
+"""
+from typing import Dict, Tuple
+
+import cv2
+import numpy as np
+
+# GenICam 패턴 -> 2x2 셀 안의 (R 위치, G 위치 2개, B 위치)
+_CELL_LAYOUT: Dict[str, Tuple[Tuple[int, int], Tuple[Tuple[int, int], Tuple[int, int]], Tuple[int, int]]] = {
+    'BayerBG8': ((1, 1), ((0, 1), (1, 0)), (0, 0)),
+    'BayerRG8': ((0, 0), ((0, 1), (1, 0)), (1, 1)),
+    'BayerGB8': ((1, 0), ((0, 0), (1, 1)), (0, 1)),
+    'BayerGR8': ((0, 1), ((0, 0), (1, 1)), (1, 0)),
+}
+
+# OpenCV 는 패턴 이름을 (1, 1) 위치 기준으로 붙이므로 GenICam 이름과 R/B 가 뒤바뀜
+_CV2_CODES = {
+    'BayerBG8': cv2.COLOR_BayerRG2RGB,
+    'BayerRG8': cv2.COLOR_BayerBG2RGB,
+    'BayerGB8': cv2.COLOR_BayerGR2RGB,
+    'BayerGR8': cv2.COLOR_BayerGB2RGB,
+}
+
+
+class BufferRing:
+    """같은 크기 버퍼를 돌려 쓰는 링 (소비 측이 pool_size 프레임 안에 다 쓴다는 가정)"""
+
+    def __init__(self, pool_size: int):
+        self.pool_size = max(2, pool_size)
+        self._buffers = []
+        self._index = 0
+
+    def next(self, shape: Tuple[int, ...]) -> np.ndarray:
+        if not self._buffers or self._buffers[0].shape != shape:
+            self._buffers = [np.empty(shape, dtype=np.uint8) for _ in range(self.pool_size)]
+            self._index = 0
+        buffer = self._buffers[self._index]
+        self._index = (self._index + 1) % self.pool_size
+        return buffer
+
+
+class BayerProcessor:
+    """RAW 보관 링 + 절반 해상도 / 화면용 디베이어"""
+
+    def __init__(self, pattern: str = 'BayerBG8', pool_size: int = 6, preview_pool_size: int = 3):
+        """
+        :param pattern: 카메라 PixelFormat (BayerBG8 / BayerRG8 / BayerGB8 / BayerGR8)
+        :param pool_size: RAW / 추론용 버퍼 수 (추론 파이프라인에 머무는 프레임 수보다 커야 함)
+        :param preview_pool_size: 화면용 RGB 버퍼 수 (UI 가 그리는 동안 덮어쓰지 않도록)
+        """
+        if pattern not in _CELL_LAYOUT:
+            raise ValueError(f"지원하지 않는 Bayer 패턴: {pattern}")
+        self.pattern = pattern
+        self._layout = _CELL_LAYOUT[pattern]
+        self._cv2_code = _CV2_CODES[pattern]
+        self._raw = BufferRing(pool_size)
+        self._half = BufferRing(pool_size)
+        self._preview = BufferRing(preview_pool_size)
+
+    def store(self, raw_view: np.ndarray) -> np.ndarray:
+        """카메라 버퍼 뷰를 RAW 링으로 복사 (이후 카메라 버퍼는 바로 반납 가능)"""
+        raw = self._raw.next(raw_view.shape)
+        np.copyto(raw, raw_view)
+        return raw
+
+    def half(self, raw: np.ndarray) -> np.ndarray:
+        """
+        절반 해상도 RGB (2x2 셀 -> 1픽셀, G 는 두 값 평균)
+
+        :param raw: (H, W) Bayer, 구역 크롭이면 짝수 좌표에서 시작해야 패턴이 맞음
+        :return: (H // 2, W // 2, 3) RGB
+        """
+        h, w = raw.shape[0] & ~1, raw.shape[1] & ~1
+        out = self._half.next((h // 2, w // 2, 3))
+        (ry, rx), ((g1y, g1x), (g2y, g2x)), (by, bx) = self._layout
+
+        out[..., 0] = raw[ry:h:2, rx:w:2]
+        out[..., 2] = raw[by:h:2, bx:w:2]
+        # (a + b) / 2 를 uint8 안에서 넘침 없이: (a >> 1) + (b >> 1) + (a & b & 1)
+        g1 = raw[g1y:h:2, g1x:w:2]
+        g2 = raw[g2y:h:2, g2x:w:2]
+        out[..., 1] = (g1 >> 1) + (g2 >> 1) + (g1 & g2 & 1)
+        return out
+
+    def preview(self, raw: np.ndarray) -> np.ndarray:
+        """화면 표시용 원본 해상도 RGB (OpenCV 디베이어, 재사용 버퍼에 기록)"""
+        out = self._preview.next(raw.shape + (3,))
+        cv2.cvtColor(raw, self._cv2_code, dst=out)
+        return out
@@ -1,9 +1,11 @@
 """
 src/AI/camera_thread.py
 """
+import os
+import sys
 import time
 import traceback
-from typing import List
+from datetime import datetime, timedelta
 
 import cv2
 import numpy as np
@@ -11,8 +13,13 @@ from PySide6.QtCore import QThread, Signal
 
 from src.utils.logger import log
 from src.AI.cam.basler_manager import BaslerCameraManager
-from src.utils.config_util import CAMERA_CONFIGS
-from src.AI.tracking.detection_box import ConveyorBoxZone, ConveyorBoxManager, DetectedObject
+from src.AI.cam.device_registry import DeviceRegistry
+from src.utils.config_util import CAMERA_CONFIGS, INFERENCE_SCHEDULE, AI_BACKEND_CONFIG, AI_MODEL_PATHS
+from src.AI.tracking.detection_box import ConveyorBoxZone, ConveyorBoxManager
+from src.AI.cam.motion_gate import MotionGate
+from src.AI.cam.interval_controller import AdaptiveIntervalController
+from src.AI.detection_batch import DetectionBatch
+from src.AI.synthetic_detector import ScenarioPlayer, SyntheticFrameSource
 #추가
 from src.AI.block_detect import BlockDetector
 
@@ -37,6 +44,9 @@ class CameraThread(QThread):
     #     'PLASTIC': (255, 255, 255)
     # }
 
+    # 트리거 모드 구역 시간 기준점 (벨트 위치 0)
+    _BELT_EPOCH = datetime(1970, 1, 1)
+
     def __init__(
         self,
         camera_index: int = 0,
@@ -58,7 +68,9 @@ class CameraThread(QThread):
         # Basler 카메라 초기화
         self.camera_manager = BaslerCameraManager(
             camera_index=camera_index,
-            roi=roi
+            roi=roi,
+            trigger_config=self.config.get('trigger'),
+            frames_in_flight=ai_manager.frames_in_flight if ai_manager is not None else 0
         )
 
         # 박스 매니저 생성
@@ -72,9 +84,15 @@ class CameraThread(QThread):
         )
 
         # 캐싱된 결과 (프레임 스킵용)
-        self.last_detected_objects = []
+        self.last_detected_objects = DetectionBatch.empty()
         self.frame_count = 0
-        self.inference_interval = 1  # 2프레임마다 추론
+        self.inference_interval = 1  # 고정 추론 간격 (1: 매 프레임 추론, 적응형 제어 미사용 시)
+
+        # 적응형 추론 간격 (결과 지연이 예산을 넘거나 우편함 드롭이 생기면 간격을 늘림)
+        self.interval_controller = None
+        schedule = dict(INFERENCE_SCHEDULE)
+        if schedule.pop('adaptive', False):
+            self.interval_controller = AdaptiveIntervalController(**schedule)
 
         # 통계
         self.fps_counter = 0
@@ -83,6 +101,37 @@ class CameraThread(QThread):
 
         self.frame_offset = camera_index * 8
 
+        # 결과 시각 보정 (촬영 후 오래된 결과는 버리고, 벨트 이동량만큼 위치 보정)
+        timing = self.config.get('timing', {})
+        self.max_result_age = timing.get('max_result_age_ms', 200) / 1000.0
+        self.belt_speed = timing.get('belt_speed_px_s', 0.0)  # 0이면 위치 보정 안 함
+        self.capture_time = 0.0
+        self.stale_results = 0
+
+        # 하드웨어 트리거 모드: 프레임마다 벨트 이동량이 px_per_trigger 로 일정
+        # (결과 위치 보정 / 구역 시간을 벽시계 대신 누적 트리거 수 기준으로 계산)
+        trigger = self.config.get('trigger', {})
+        self.px_per_trigger = trigger.get('px_per_trigger', 0.0) if trigger.get('enabled', False) else 0.0
+        self.use_basler = False   # Basler 로 열렸는지 (run 에서 결정, 아니면 웹캠/시나리오 프레임)
+        self.use_trigger = False  # 카메라가 실제로 트리거 모드로 열렸는지 (run 에서 결정)
+        self.trigger_count = -1
+        self._frame_triggers = {}  # frame_id -> 누적 트리거 수 (최근 프레임만)
+
+        # 구역 크롭 (박스 구역 + 접근 여유만 추론)
+        self.zone_crop = self.config.get('zone_crop', {})
+        self._crop_rect = None  # (x1, y1, x2, y2), 첫 프레임 크기 기준으로 계산
+        # 추론 쪽이 넘긴 프레임을 계속 참조하면 복사해서 전달 (추론 프로세스는 공유 메모리로 복사하므로 불필요)
+        self._copy_submit = ai_manager is not None and ai_manager.frames_in_flight > 0
+
+        # 움직임 게이트 (빈 벨트 프레임은 추론 생략)
+        self.motion_gate = None
+        self._gate_closed = False
+        self._last_motion_frame = -1  # 게이트가 마지막으로 변화를 본 프레임
+        gate_cfg = dict(self.config.get('motion_gate', {}))
+        if gate_cfg.pop('enabled', False):
+            self.motion_gate = MotionGate(regions=self._zone_rects(), **gate_cfg)
+        self.submitted_frames = 0
+
     def _create_box_manager(self):
         """카메라별 박스 생성"""
         boxes = []
@@ -99,6 +148,186 @@ class CameraThread(QThread):
         log(f"카메라 {self.camera_index}: {len(boxes)}개 박스 생성")
         return ConveyorBoxManager(boxes)
 
+    def _zone_rects(self) -> list:
+        """박스별 판정 영역 (박스 + 여유 + 상류 접근 여유), 프레임 범위 제한 전"""
+        margin = self.zone_crop.get('margin', 0)
+        upstream = self.zone_crop.get('upstream_margin', 0)
+        flow_down = self.zone_crop.get('flow', 'down') == 'down'
+
+        rects = []
+        for b in self.config.get('boxes', []):
+            x1, y1 = b['x'] - margin, b['y'] - margin
+            x2, y2 = b['x'] + b['width'] + margin, b['y'] + b['height'] + margin
+
+            # 물체가 들어오는 쪽으로 여유를 더 줘서 구역 진입 전에 트래킹이 시작되도록 함
+            if flow_down:
+                y1 -= upstream
+            else:
+                y2 += upstream
+            rects.append((x1, y1, x2, y2))
+        return rects
+
+    def _compute_crop_rect(self, frame_shape) -> tuple:
+        """박스 구역 합집합 + 여유 영역 (프레임 범위로 제한)"""
+        h, w = frame_shape[:2]
+        rects = self._zone_rects()
+        if not rects:
+            return 0, 0, w, h
+
+        x1 = min(r[0] for r in rects)
+        y1 = min(r[1] for r in rects)
+        x2 = max(r[2] for r in rects)
+        y2 = max(r[3] for r in rects)
+
+        x1, y1 = max(0, x1), max(0, y1)
+        x2, y2 = min(w, x2), min(h, y2)
+        log(f"카메라 {self.camera_index + 1} 구역 크롭: ({x1}, {y1}) ~ ({x2}, {y2}), "
+            f"픽셀 {(x2 - x1) * (y2 - y1) / (w * h) * 100:.0f}%")
+        return x1, y1, x2, y2
+
+    def _is_submit_frame(self) -> bool:
+        """추론 간격상 이번 프레임을 넣을 차례인지 (적응형이면 부하에 따라 간격 조정)"""
+        if self.interval_controller is None:
+            return self.frame_count % self.inference_interval == 0
+
+        latency_ms, dropped_frames = self.ai_manager.get_camera_load(self.camera_index)
+        self.interval_controller.update(latency_ms, dropped_frames)
+        return self.interval_controller.should_submit(self.frame_count)
+
+    def _should_infer(self, frame: np.ndarray) -> bool:
+        """움직임 게이트 판정 (게이트가 닫히면 마지막 결과를 그대로 사용)"""
+        if self.motion_gate is None:
+            return True
+        passed = self.motion_gate.update(frame)
+        if self.motion_gate.motion:
+            self._last_motion_frame = self.frame_count
+        self._gate_closed = not passed
+        return passed
+
+    def _submit_frame(self, frame: np.ndarray):
+        """추론용 프레임 전달 (구역 크롭 모드면 해당 영역만)"""
+        self.submitted_frames += 1
+        frame_info = {'frame_id': self.frame_count, 'capture_time': self.capture_time}
+        if frame.ndim == 2:
+            self._submit_raw(frame, frame_info)
+            return
+        # 화면 그리기(_draw_frame)가 원본 프레임에 덮어쓰므로 추론에는 복사본 전달
+        # (전처리 스레드가 아직 letterbox 중인 프레임에 박스가 그려져 모델 입력에 섞이지 않도록)
+        if not self.zone_crop.get('enabled', False):
+            self.ai_manager.put_frame(
+                self.camera_index, frame.copy() if self._copy_submit else frame, **frame_info
+            )
+            return
+
+        if self._crop_rect is None:
+            self._crop_rect = self._compute_crop_rect(frame.shape)
+        x1, y1, x2, y2 = self._crop_rect
+
+        # 잘라낸 영역만 복사
+        crop = np.ascontiguousarray(frame[y1:y2, x1:x2])
+        self.ai_manager.put_frame(self.camera_index, crop, offset=(x1, y1), **frame_info)
+
+    def _submit_raw(self, raw: np.ndarray, frame_info: dict):
+        """Bayer RAW 프레임을 절반 해상도로 디베이어해서 전달 (구역 크롭이면 해당 영역만 변환)"""
+        x1, y1, x2, y2 = 0, 0, raw.shape[1], raw.shape[0]
+        if self.zone_crop.get('enabled', False):
+            if self._crop_rect is None:
+                self._crop_rect = self._compute_crop_rect(raw.shape)
+            x1, y1, x2, y2 = self._crop_rect
+            # Bayer 패턴이 유지되도록 짝수 좌표에서 시작
+            x1, y1 = x1 & ~1, y1 & ~1
+
+        # 디베이어 결과는 별도 버퍼라 화면 그리기와 겹치지 않음 (추가 복사 없음)
+        half = self.camera_manager.bayer.half(raw[y1:y2, x1:x2])
+        self.ai_manager.put_frame(self.camera_index, half, offset=(x1, y1), input_scale=0.5, **frame_info)
+
+    def _accept_result(self, result: DetectionBatch):
+        """새 결과 반영 (이전 프레임 결과가 늦게 도착하면 버림)"""
+        if result.frame_id >= 0 and result.frame_id < self.last_detected_objects.frame_id:
+            self.stale_results += 1
+            return
+        self.last_detected_objects = result
+
+    def _current_detections(self) -> DetectionBatch:
+        """
+        지금 프레임 기준 검출 결과
+
+        - 촬영 후 max_result_age 가 지난 결과는 사용하지 않음 (빈 결과)
+        - 움직임 게이트가 닫혀 있고 정지 후 프레임의 결과면 나이와 관계없이 유지 (이동 보정 없음)
+        - 벨트 속도가 설정돼 있으면 촬영 후 이동한 만큼 위치를 옮겨서 반환
+        """
+        result = self.last_detected_objects
+        if not result:
+            return result
+
+        if self._gate_closed and result.frame_id > self._last_motion_frame:
+            # 게이트가 닫힌 정지 장면 (diff 모드에서 구역에 멈춘 물체 등):
+            # 변화가 멈춘 뒤(hold 구간) 프레임의 결과는 지금도 그대로 유효하므로 촬영 시각만 갱신
+            result.capture_time = self.capture_time
+            return result
+
+        age = result.age(self.capture_time)
+        if age > self.max_result_age:
+            self.stale_results += 1
+            self.last_detected_objects = result[:0]  # frame_id 는 유지 (늦게 온 이전 결과 거부용)
+            return self.last_detected_objects
+
+        shift = 0
+        if self.use_trigger:
+            # 트리거 모드: 결과 프레임 이후 들어온 트리거 수만큼 이동
+            start = self._frame_triggers.get(result.frame_id)
+            if start is not None:
+                shift = int(round((self.trigger_count - start) * self.px_per_trigger))
+        elif self.belt_speed and age > 0:
+            shift = int(round(self.belt_speed * age))
+
+        if shift:
+            if self.zone_crop.get('flow', 'down') != 'down':
+                shift = -shift
+            result = result.copy()
+            result.translate(0, shift)
+        return result
+
+    def _record_trigger(self):
+        """이번 프레임의 누적 트리거 수 기록"""
+        self.trigger_count = self.camera_manager.last_trigger_count
+        self._frame_triggers[self.frame_count] = self.trigger_count
+        if len(self._frame_triggers) > 64:
+            self._frame_triggers.pop(next(iter(self._frame_triggers)))
+
+    def _zone_clock(self):
+        """
+        구역 시간 기준
+
+        트리거 모드 + 벨트 속도가 있으면 벨트 위치를 벨트 속도로 나눈 시각 (벨트가 멈추면 시간도 멈춤),
+        아니면 None (박스 매니저가 지금 시각 사용)
+        """
+        if not self.use_trigger or not self.belt_speed:
+            return None
+        belt_px = self.trigger_count * self.px_per_trigger
+        return self._BELT_EPOCH + timedelta(seconds=belt_px / self.belt_speed)
+
+    def get_stats(self) -> dict:
+        """카메라 스레드 통계"""
+        stats = {
+            'fps': self.current_fps,
+            'frames': self.frame_count,
+            'submitted_frames': self.submitted_frames,
+            'stale_results': self.stale_results,
+        }
+        if self.use_trigger:
+            stats['trigger_count'] = self.trigger_count
+        if self.use_basler:
+            # 캡처 쪽 손실 (추론 쪽 손실은 stale_results / AI 매니저 dropped_frames)
+            stats.update(self.camera_manager.get_transport_stats())
+        if self.interval_controller is not None:
+            stats.update(self.interval_controller.get_stats())
+        if self.motion_gate is not None:
+            gate = self.motion_gate.get_stats()
+            stats['gate_skipped_frames'] = gate['skipped_frames']
+            stats['gate_skip_ratio'] = gate['skip_ratio']
+        return stats
+
     def run(self):
         """스레드 실행"""
         log(f"📷 카메라 {self.camera_index + 1} 스레드 시작")
@@ -106,27 +335,40 @@ class CameraThread(QThread):
 
         # 카메라 초기화
         camera_ip = None
-        if not self.camera_manager.initialize(camera_ip=camera_ip):
-            log(f"카메라 {self.camera_index + 1} Basler 실패, 웹캠 시도")
-
-            # 웹캠 폴백
-            cap = cv2.VideoCapture(self.camera_index, cv2.CAP_DSHOW)
-            if not cap.isOpened():
-                error_msg = f"카메라 {self.camera_index + 1} 초기화 실패"
-                log(error_msg)
-                self.error_occurred.emit(error_msg)
-                return
-
-            cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
-            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
-            cap.set(cv2.CAP_PROP_FPS, 60)
-            cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        if not self.camera_manager.initialize(camera_ip=camera_ip, serial=self.config.get('serial')):
+            if AI_BACKEND_CONFIG['type'] == 'synthetic':
+                # 가상 검출기 부하 테스트: 같은 시나리오를 그린 프레임 사용
+                log(f"카메라 {self.camera_index + 1} Basler 없음, 시나리오 프레임 사용")
+                scenario = os.path.join(sys.path[0], AI_MODEL_PATHS['synthetic'])
+                cap = SyntheticFrameSource(ScenarioPlayer.load(scenario), self.camera_index)
+            else:
+                log(f"카메라 {self.camera_index + 1} Basler 실패, 웹캠 시도")
+
+                # 웹캠 폴백
+                cap = cv2.VideoCapture(self.camera_index, cv2.CAP_DSHOW)
+                if not cap.isOpened():
+                    error_msg = f"카메라 {self.camera_index + 1} 초기화 실패"
+                    log(error_msg)
+                    self.error_occurred.emit(error_msg)
+                    return
+
+                cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
+                cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
+                cap.set(cv2.CAP_PROP_FPS, 60)
+                cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
 
             use_basler = False
         else:
             self.camera_manager.start_grabbing()
             use_basler = True
+            self.use_basler = True
             cap = None
+            self.use_trigger = self.camera_manager.trigger_mode and self.px_per_trigger > 0
+            if self.use_trigger and not self.belt_speed:
+                log(f"카메라 {self.camera_index + 1}: belt_speed_px_s 가 없어 구역 시간은 벽시계 기준")
+
+        # 동시 시작한 카메라들의 시작 시간 요약용 (실패/웹캠 폴백도 기록해야 요약이 나옴)
+        DeviceRegistry.get_instance().record_startup(self.camera_index, self.camera_manager.startup_timing)
 
         log(f"카메라 {self.camera_index + 1} 초기화 완료 ({'Basler' if use_basler else '웹캠'})")
 
@@ -140,33 +382,43 @@ class CameraThread(QThread):
                 if use_basler:
                     frame = self.camera_manager.grab_frame()
                     if frame is None:
+                        if not self.camera_manager.is_grabbing():
+                            # grab 이 멈췄으면 grab_frame 이 기다리지 않으므로 헛돌지 않고 종료
+                            log(f"카메라 {self.camera_index + 1} grab 중지됨")
+                            break
                         continue
+                    self.capture_time = self.camera_manager.last_capture_time
                 else:
                     ret, bgr_frame = cap.read()
                     if not ret:
                         break
+                    self.capture_time = time.perf_counter()
                     frame = cv2.cvtColor(bgr_frame, cv2.COLOR_BGR2RGB)
 
                 self.frame_count += 1
+                if self.use_trigger:
+                    self._record_trigger()
 
-                # 2. AI 추론 요청 (N프레임마다)
-                if self.frame_count % self.inference_interval == 0:
+                # 2. AI 추론 요청 (N프레임마다, 구역에 움직임이 있을 때만)
+                # Bayer 모드면 frame 은 RAW (H, W): 움직임 게이트는 RAW 를 밝기로 그대로 사용
+                if self.ai_manager and self._should_infer(frame) and self._is_submit_frame():
                     # BatchAIManager에 프레임 전달
-                    if self.ai_manager:
-                        self.ai_manager.put_frame(self.camera_index, frame)
+                    self._submit_frame(frame)
+
+                # Bayer 모드: 화면용 RGB 는 재사용 버퍼에 디베이어 (그리기는 여기에)
+                if frame.ndim == 2:
+                    frame = self.camera_manager.bayer.preview(frame)
 
                 # 3. AI 결과 받기
                 detected_objects = None
                 if self.ai_manager:
                     result = self.ai_manager.get_result(self.camera_index)
                     if result is not None:
-                        detected_objects = result
-                        self.last_detected_objects = detected_objects
-                    else:
-                        # 결과 없으면 이전 결과 사용
-                        detected_objects = self.last_detected_objects
+                        self._accept_result(result)
+                    # 결과 없으면 이전 결과 사용 (오래됐으면 버리고, 벨트 이동량 보정)
+                    detected_objects = self._current_detections()
                 else:
-                    detected_objects = []
+                    detected_objects = DetectionBatch.empty()
 
                 # log(f"[DEBUG-AI-1] camera_index={self.camera_index}, detected_objects 개수={len(detected_objects) if detected_objects else 0}")
                 # if detected_objects:
@@ -174,7 +426,7 @@ class CameraThread(QThread):
                 #         log(f"[DEBUG-AI-2]   obj.id={obj.id}, class={obj.class_name}")
 
                 # 4. 박스 매니저 업데이트
-                self.box_manager.update_detections(detected_objects)
+                self.box_manager.update_detections(detected_objects, self._zone_clock())
 
                 # 5. AirKnife 동작
                 # if len(detected_objects) > 0:
@@ -225,12 +477,18 @@ class CameraThread(QThread):
                 if box.is_active:
                     self._send_airknife_signal(box.box_id, 1000)
 
+    def is_armed(self) -> bool:
+        """AI 모델 워밍업까지 끝나서 에어나이프를 동작시켜도 되는지"""
+        return self.ai_manager is not None and self.ai_manager.is_ready()
+
     def _send_airknife_signal(self, air_num: int, on_term: int):
         """AirKnife 신호 전송"""
+        if not self.is_armed():
+            return
         if self.airknife_callback:
             self.airknife_callback(air_num, on_term)
 
-    def _draw_frame(self, frame: np.ndarray, detected_objects: List[DetectedObject]) -> np.ndarray:
+    def _draw_frame(self, frame: np.ndarray, detected_objects: DetectionBatch) -> np.ndarray:
         """프레임에 그리기"""
         # 1. 박스 그리기
         frame = self.box_manager.draw_all(frame)
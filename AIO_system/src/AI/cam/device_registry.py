@@ -0,0 +1,102 @@
+"""
+src/AI/cam/device_registry.py
+
+카메라 장치 목록 캐시 (시리얼 -> DeviceInfo)
+- GigE 장치 검색(EnumerateDevices)은 수백 ms ~ 수 초 걸리므로 프로세스에서 한 번만 하고 공유
+- 카메라 스레드들이 동시에 초기화해도 검색은 한 스레드만 하고 나머지는 결과를 기다림
+- 카메라별 시작 시간(검색/생성/연결/설정/grab 시작)을 모아 전체 시작 시간 요약
+"""
+import threading
+import time
+from typing import Dict, List, Optional
+
+from pypylon import pylon
+
+from src.utils.logger import log
+
+
+class DeviceRegistry:
+    """싱글톤 장치 목록 캐시"""
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls) -> "DeviceRegistry":
+        """싱글톤을 위한 get instance"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._devices: Optional[List] = None
+        self._by_serial: Dict[str, object] = {}
+        self.enumerate_time = 0.0
+
+        # 시작 시간 요약
+        self._startup_expected = 0
+        self._startup_begin = 0.0
+        self._startup_timing: Dict[int, Dict[str, float]] = {}
+
+    def devices(self, refresh: bool = False) -> List:
+        """연결된 장치 목록 (캐시, refresh 면 다시 검색)"""
+        with self._lock:
+            if self._devices is None or refresh:
+                t0 = time.perf_counter()
+                self._devices = list(pylon.TlFactory.GetInstance().EnumerateDevices())
+                self._by_serial = {d.GetSerialNumber(): d for d in self._devices}
+                self.enumerate_time = time.perf_counter() - t0
+                log(f"카메라 검색: {len(self._devices)}대 ({self.enumerate_time * 1000:.0f} ms)")
+            return self._devices
+
+    def find(self, serial: Optional[str] = None, ip: Optional[str] = None,
+             index: Optional[int] = None):
+        """
+        장치 찾기 (serial > ip > index 순), 캐시에 없으면 한 번 다시 검색
+
+        :return: DeviceInfo, 없으면 None
+        """
+        for refresh in (False, True):
+            devices = self.devices(refresh)
+            if serial:
+                device = self._by_serial.get(str(serial))
+            elif ip:
+                device = next((d for d in devices if d.GetIpAddress() == ip), None)
+            elif index is not None and index < len(devices):
+                device = devices[index]
+            else:
+                device = None
+            if device is not None:
+                return device
+        return None
+
+    def invalidate(self):
+        """장치 목록 버림 (연결 실패 시 다음 초기화에서 다시 검색)"""
+        with self._lock:
+            self._devices = None
+            self._by_serial = {}
+
+    def begin_startup(self, count: int):
+        """카메라 count 대 동시 시작 (모두 기록되면 요약 로그)"""
+        with self._lock:
+            self._startup_expected = count
+            self._startup_begin = time.perf_counter()
+            self._startup_timing = {}
+
+    def record_startup(self, camera_index: int, timing: Dict[str, float]):
+        """카메라 한 대의 시작 시간 기록 (초 단위 단계별)"""
+        with self._lock:
+            self._startup_timing[camera_index] = dict(timing)
+            if not self._startup_expected or len(self._startup_timing) < self._startup_expected:
+                return
+            total = time.perf_counter() - self._startup_begin
+            slowest = max(self._startup_timing, key=lambda i: sum(self._startup_timing[i].values()))
+            self._startup_expected = 0
+        log(f"카메라 {len(self._startup_timing)}대 시작 완료: {total * 1000:.0f} ms "
+            f"(가장 느린 카메라 {slowest + 1}: {sum(self._startup_timing[slowest].values()) * 1000:.0f} ms)")
+
+    def get_startup_timing(self) -> Dict[int, Dict[str, float]]:
+        """카메라별 시작 단계 시간 (초)"""
+        with self._lock:
+            return {i: dict(t) for i, t in self._startup_timing.items()}
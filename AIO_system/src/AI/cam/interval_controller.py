@@ -0,0 +1,75 @@
+"""
+src/AI/cam/interval_controller.py
+
+적응형 추론 간격 제어
+- 카메라별 결과 지연(put_frame -> get_result)과 입력 우편함 드롭(덮어쓴 프레임) 수를 보고 추론 간격 조절
+- 프레임은 버리지 않고 우편함에서 최신 프레임으로 덮어씀, 덮어쓰기가 생기면 간격을 늘려 넣는 양 자체를 줄임
+"""
+import time
+
+
+class AdaptiveIntervalController:
+    """지연 예산 기반 추론 간격 제어기 (AIMD 와 유사하게 1씩 증감)"""
+
+    def __init__(
+        self,
+        latency_budget_ms: float = 80.0,
+        min_interval: int = 1,
+        max_interval: int = 4,
+        max_drops: int = 0,
+        adjust_period: float = 0.5,
+        low_ratio: float = 0.6
+    ):
+        """
+        :param latency_budget_ms: 에어나이프 판단 시점의 검출 결과 최대 허용 지연
+        :param min_interval: 최소 추론 간격 (프레임)
+        :param max_interval: 최대 추론 간격 (프레임)
+        :param max_drops: adjust_period 동안 우편함 드롭이 이보다 많으면 간격을 늘림
+        :param adjust_period: 간격 조정 주기 (초)
+        :param low_ratio: 지연이 예산 * low_ratio 미만이면 간격을 줄임
+        """
+        self.latency_budget_ms = latency_budget_ms
+        self.min_interval = max(1, min_interval)
+        self.max_interval = max(self.min_interval, max_interval)
+        self.max_drops = max_drops
+        self.adjust_period = adjust_period
+        self.low_ratio = low_ratio
+
+        self.interval = self.min_interval
+        self._last_adjust = time.perf_counter()
+        self._last_dropped = None
+
+        # 통계
+        self.recent_drops = 0
+
+    def update(self, latency_ms: float, dropped_frames: int):
+        """
+        측정값 반영 (adjust_period 마다 간격 1씩 조정)
+
+        :param dropped_frames: 우편함 누적 드롭 수 (조정 주기 사이 증가분만 사용)
+        """
+        now = time.perf_counter()
+        if now - self._last_adjust < self.adjust_period:
+            return
+        self._last_adjust = now
+
+        if self._last_dropped is None:
+            self._last_dropped = dropped_frames
+        self.recent_drops = dropped_frames - self._last_dropped
+        self._last_dropped = dropped_frames
+
+        if latency_ms > self.latency_budget_ms or self.recent_drops > self.max_drops:
+            self.interval = min(self.max_interval, self.interval + 1)
+        elif latency_ms < self.latency_budget_ms * self.low_ratio and self.recent_drops == 0:
+            self.interval = max(self.min_interval, self.interval - 1)
+
+    def should_submit(self, frame_count: int) -> bool:
+        """이번 프레임을 추론에 넣을지 (밀린 프레임이 있어도 버리지 않고 우편함에서 덮어씀)"""
+        return frame_count % self.interval == 0
+
+    def get_stats(self) -> dict:
+        """통계"""
+        return {
+            'interval': self.interval,
+            'recent_drops': self.recent_drops,
+        }
@@ -0,0 +1,142 @@
+"""
+src/AI/cam/motion_gate.py
+
+움직임/점유 게이트
+- 축소한 그레이 영상으로 구역별 변화량을 보고 빈 벨트 프레임은 추론을 건너뜀
+- background: 빈 벨트 기준 영상과 비교 (게이트가 닫혀 있을 때만 기준 영상 학습)
+- diff: 직전 프레임과 비교 (멈춘 물체는 변화가 없어 게이트가 닫힘 -> motion 으로 정지 장면 여부를 알려줌)
+"""
+from typing import List, Tuple
+
+import cv2
+import numpy as np
+
+
+class MotionGate:
+    """구역별 움직임/점유 판정"""
+
+    def __init__(
+        self,
+        regions: List[Tuple[int, int, int, int]],
+        mode: str = 'background',
+        downscale: int = 8,
+        threshold: int = 15,
+        min_ratio: float = 0.003,
+        hold_frames: int = 5,
+        learning_rate: float = 0.02
+    ):
+        """
+        :param regions: 판정 구역 목록 (x1, y1, x2, y2), 원본 프레임 좌표
+        :param mode: 'background' | 'diff'
+        :param downscale: 축소 배율
+        :param threshold: 변화로 보는 밝기 차이
+        :param min_ratio: 구역 내 변화 픽셀 비율이 이 값 이상이면 물체 있음
+        :param hold_frames: 변화가 사라진 뒤에도 추론을 계속할 프레임 수 (마지막 결과 갱신용)
+        :param learning_rate: 기준 영상 학습률 (background 모드)
+        """
+        if mode not in ('background', 'diff'):
+            raise ValueError(f"지원하지 않는 게이트 모드: {mode}")
+
+        self.regions = regions
+        self.mode = mode
+        self.downscale = max(1, downscale)
+        self.threshold = threshold
+        self.min_ratio = min_ratio
+        self.hold_frames = max(1, hold_frames)  # 정지 후 최소 한 프레임은 추론해야 정지 장면 결과가 남음
+        self.learning_rate = learning_rate
+
+        self._reference = None      # float32 축소 그레이 영상
+        self._small_regions = []    # 축소 좌표 구역
+        self._hold = 0
+        self.motion = False         # 마지막 프레임에 실제 변화가 있었는지 (hold 제외)
+
+        # 통계
+        self.total_frames = 0
+        self.passed_frames = 0
+
+    def _prepare(self, frame: np.ndarray) -> np.ndarray:
+        """축소 + 그레이 변환"""
+        h, w = frame.shape[:2]
+        small = cv2.resize(
+            frame, (max(1, w // self.downscale), max(1, h // self.downscale)),
+            interpolation=cv2.INTER_AREA
+        )
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_RGB2GRAY)
+        return small.astype(np.float32)
+
+    def _scale_regions(self, shape: Tuple[int, int]):
+        """구역 좌표를 축소 영상 기준으로 변환"""
+        h, w = shape
+        self._small_regions = []
+        for x1, y1, x2, y2 in self.regions:
+            sx1, sy1 = max(0, x1 // self.downscale), max(0, y1 // self.downscale)
+            sx2 = min(w, -(-x2 // self.downscale))
+            sy2 = min(h, -(-y2 // self.downscale))
+            if sx2 > sx1 and sy2 > sy1:
+                self._small_regions.append((sx1, sy1, sx2, sy2))
+        if not self._small_regions:
+            self._small_regions = [(0, 0, w, h)]
+
+    def update(self, frame: np.ndarray) -> bool:
+        """
+        프레임 판정
+
+        :return: True면 추론 필요 (구역에 변화/물체 있음)
+        """
+        self.total_frames += 1
+        gray = self._prepare(frame)
+
+        # 첫 프레임이거나 해상도가 바뀌면 기준 영상 새로 잡고 통과
+        if self._reference is None or self._reference.shape != gray.shape:
+            self._reference = gray
+            self._scale_regions(gray.shape)
+            self._hold = self.hold_frames
+            self.motion = True
+            self.passed_frames += 1
+            return True
+
+        changed = cv2.absdiff(gray, self._reference) > self.threshold
+        active = any(
+            changed[y1:y2, x1:x2].mean() >= self.min_ratio
+            for x1, y1, x2, y2 in self._small_regions
+        )
+        self.motion = active
+
+        if self.mode == 'diff':
+            self._reference = gray
+        else:
+            # 물체가 기준 영상에 스며들지 않도록 점유 중에는 아주 느리게만 학습 (조명 변화 대응)
+            rate = self.learning_rate if not active else self.learning_rate * 0.05
+            cv2.accumulateWeighted(gray, self._reference, rate)
+
+        if active:
+            self._hold = self.hold_frames
+        elif self._hold > 0:
+            self._hold -= 1
+            active = True
+
+        if active:
+            self.passed_frames += 1
+        return active
+
+    def reset(self):
+        """기준 영상 초기화"""
+        self._reference = None
+        self._hold = 0
+
+    @property
+    def skip_ratio(self) -> float:
+        """추론을 건너뛴 프레임 비율"""
+        if self.total_frames == 0:
+            return 0.0
+        return 1.0 - self.passed_frames / self.total_frames
+
+    def get_stats(self) -> dict:
+        """통계"""
+        return {
+            'total_frames': self.total_frames,
+            'passed_frames': self.passed_frames,
+            'skipped_frames': self.total_frames - self.passed_frames,
+            'skip_ratio': self.skip_ratio,
+        }
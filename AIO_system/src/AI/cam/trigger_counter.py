@@ -0,0 +1,56 @@
+"""
+src/AI/cam/trigger_counter.py
+
+하드웨어 트리거 카운터 누적
+- 카메라가 주는 카운터(트리거 입력 카운터 청크 또는 블록 ID)는 비트 폭에 따라 되감기므로 증가분만 누적
+- 출처는 카메라 시작 시 한 번 정하고 바꾸지 않음 (출처마다 시작 값/비트 폭이 달라 섞으면 위치가 튐)
+- 이번 프레임에 카운터를 읽지 못하면 이전 누적 값을 유지 (다음 값의 증가분에 빠진 트리거가 포함됨)
+"""
+from typing import Optional
+
+CHUNK_COUNTER_MODULUS = 1 << 32         # 트리거 입력 카운터 청크 (32비트)
+GEV1_BLOCK_ID_MODULUS = 0xFFFF          # GigE Vision 1.x 블록 ID (16비트, 0 을 건너뛰어 1 ~ 65535)
+EXTENDED_BLOCK_ID_MODULUS = 1 << 64     # GigE 확장 ID / USB3 블록 ID (64비트)
+
+
+class TriggerCounter:
+    """되감김 보정 누적 트리거 수"""
+
+    def __init__(self, modulus: int = CHUNK_COUNTER_MODULUS):
+        """
+        :param modulus: 카운터 되감김 주기 (출처의 실제 비트 폭)
+        """
+        self.modulus = modulus
+        self.total = -1         # 누적 트리거 수 (첫 프레임 전 -1)
+        self._last_raw: Optional[int] = None
+
+        # 통계
+        self.missing = 0        # 카운터를 읽지 못한 프레임 수
+
+    def update(self, raw: Optional[int]) -> int:
+        """
+        프레임 하나의 카운터 값 반영
+
+        :param raw: 카메라 카운터 값, 읽지 못했으면 None
+        :return: 누적 트리거 수 (첫 프레임이 0)
+        """
+        if raw is None:
+            self.missing += 1
+            return max(self.total, 0)
+
+        if self._last_raw is None:
+            self.total = max(self.total, 0)
+        else:
+            self.total += (raw - self._last_raw) % self.modulus
+        self._last_raw = raw
+        return self.total
+
+    def restart(self, modulus: Optional[int] = None):
+        """
+        출처 다시 시작 (카메라 재연결 등)
+
+        누적 값은 유지하고 다음 카운터 값부터 증가분을 이어서 누적 (끊긴 동안의 트리거는 알 수 없음)
+        """
+        if modulus is not None:
+            self.modulus = modulus
+        self._last_raw = None
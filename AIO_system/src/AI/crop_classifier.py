@@ -0,0 +1,309 @@
+"""
+src/AI/crop_classifier.py
+
+검출 크롭 2단계 재질 분류기
+- 검출 결과 하나의 크롭들을 고정 크기 크롭 텐서로 모아서 한 번에 분류
+- 재질 결과는 트래킹 ID별로 캐시 (객체당 한 번만 분류, 신뢰도가 낮으면 몇 번 더 시도)
+- 한 번에 분류하는 크롭 수를 max_crops 로 제한해서 추가 지연을 일정하게 유지
+"""
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from src.AI.detection_batch import DetectionBatch
+from src.utils.logger import log
+
+
+@dataclass
+class _TrackLabel:
+    """트랙별 분류 결과"""
+    material: int                   # 재질 인덱스 (class_names 기준)
+    conf: float
+    labels: Tuple[str, ...] = ()    # 다중 레이블 모드에서 기준을 넘은 레이블
+    attempts: int = 1
+    last_seen: float = field(default_factory=time.perf_counter)
+
+
+class CropClassifier:
+    """검출 크롭 배치 분류 + 트랙 ID별 캐시"""
+
+    def __init__(
+        self,
+        model_path: str,
+        base_class_names: Sequence[str],
+        backend_type: str = 'ultralytics',
+        class_names: Optional[Sequence[str]] = None,
+        crop_size: int = 96,
+        max_crops: int = 16,
+        pad_ratio: float = 0.1,
+        min_confidence: float = 0.5,
+        max_attempts: int = 3,
+        multi_label: bool = False,
+        label_threshold: float = 0.5,
+        cache_ttl: float = 2.0,
+        num_threads: int = 0
+    ):
+        """
+        :param base_class_names: 검출 모델 클래스 (재질을 모르는 객체는 그대로 유지)
+        :param backend_type: ultralytics (.pt/.engine) | onnxruntime (.onnx)
+        :param class_names: 재질 클래스 (모델 메타데이터에 있으면 그쪽 우선)
+        :param crop_size: 크롭 텐서 한 변 크기
+        :param max_crops: 한 번에 분류하는 최대 크롭 수 (고정 배치 엔진이면 엔진 배치 크기)
+        :param pad_ratio: 박스 주변 여유 비율
+        :param min_confidence: 이 값 미만이면 재질을 확정하지 않고 다음 프레임에 다시 분류
+        :param max_attempts: 트랙당 최대 분류 시도 횟수
+        :param multi_label: 출력을 클래스별 독립 점수로 보고 label_threshold 이상인 레이블을 모두 기록
+        :param cache_ttl: 이 시간(초) 동안 보이지 않은 트랙은 캐시에서 제거
+        """
+        self.model_path = model_path
+        self.backend_type = backend_type
+        self.base_class_names = list(base_class_names)
+        self.class_names = list(class_names or [])
+        self.crop_size = crop_size
+        self.max_crops = max_crops
+        self.pad_ratio = pad_ratio
+        self.min_confidence = min_confidence
+        self.max_attempts = max_attempts
+        self.multi_label = multi_label
+        self.label_threshold = label_threshold
+        self.cache_ttl = cache_ttl
+        self.num_threads = num_threads
+
+        self.model = None
+        self.session = None
+        self.input_name = None
+        self.device = 'cpu'
+        self.fixed_batch = 0  # 0이면 동적 배치
+
+        # 결과 클래스: 검출 클래스 + 재질 클래스 (재질이 확정된 객체만 재질 클래스로 바뀜)
+        self.output_class_names: List[str] = list(self.base_class_names)
+        self._material_to_output = np.zeros(0, dtype=np.int16)
+
+        self._crops: Optional[np.ndarray] = None  # (max_crops, S, S, 3) uint8 재사용 버퍼
+        self._cache: Dict[int, Dict[int, _TrackLabel]] = {}
+
+        # 통계
+        self.classify_calls = 0
+        self.classified_crops = 0
+        self.cache_hits = 0
+        self.classify_latency = deque(maxlen=100)
+
+    def load(self) -> bool:
+        """모델 로드 + 워밍업"""
+        try:
+            if self.backend_type == 'onnxruntime':
+                self._load_onnx()
+            else:
+                self._load_ultralytics()
+        except Exception as e:
+            log(f"재질 분류기 로드 실패: {e}")
+            return False
+
+        if not self.class_names:
+            log("재질 분류기 클래스 이름이 없음")
+            return False
+
+        if self.fixed_batch:
+            self.max_crops = self.fixed_batch
+        self._crops = np.zeros((self.max_crops, self.crop_size, self.crop_size, 3), dtype=np.uint8)
+
+        extra = [name for name in self.class_names if name not in self.base_class_names]
+        self.output_class_names = self.base_class_names + extra
+        self._material_to_output = np.array(
+            [self.output_class_names.index(name) for name in self.class_names], dtype=np.int16
+        )
+
+        self._classify(self._crops)
+        log(f"재질 분류기 로드 완료: {self.model_path} ({self.backend_type}, {self.device}, "
+            f"크롭 {self.crop_size}px x 최대 {self.max_crops}, 클래스 {self.class_names})")
+        return True
+
+    def _load_ultralytics(self):
+        # pylint: disable=import-outside-toplevel
+        import torch
+        from ultralytics import YOLO
+
+        self.device = 'cuda' if torch.cuda.is_available() else 'cpu'
+        self.model = YOLO(self.model_path, task='classify')
+        if not self.model_path.lower().endswith('.engine'):
+            self.model.to(self.device)
+
+        names = getattr(self.model, 'names', None)
+        if names:
+            self.class_names = [names[i] for i in sorted(names)]
+
+        # predictor(AutoBackend)는 첫 추론 시에 생성됨
+        dummy = np.zeros((self.crop_size, self.crop_size, 3), dtype=np.uint8)
+        self.model.predict(source=dummy, imgsz=self.crop_size, verbose=False)
+        backend = self.model.predictor.model
+        if not (getattr(backend, 'pt', False) or getattr(backend, 'dynamic', False)):
+            self.fixed_batch = int(getattr(backend, 'batch', 1) or 1)
+
+    def _load_onnx(self):
+        # pylint: disable=import-outside-toplevel
+        import onnxruntime as ort
+        from src.AI.inference_backend import OnnxRuntimeBackend
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if self.num_threads:
+            options.intra_op_num_threads = self.num_threads
+        self.session = ort.InferenceSession(
+            self.model_path, sess_options=options, providers=['CPUExecutionProvider']
+        )
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        if isinstance(model_input.shape[0], int):
+            self.fixed_batch = model_input.shape[0]
+
+        names = OnnxRuntimeBackend._parse_names(  # pylint: disable=protected-access
+            self.session.get_modelmeta().custom_metadata_map.get('names')
+        )
+        if names:
+            self.class_names = names
+
+    def _classify(self, crops: np.ndarray) -> np.ndarray:
+        """
+        크롭 배치 분류
+
+        :param crops: (B, S, S, 3) uint8 RGB
+        :return: (B, nc) 클래스 점수
+        """
+        if self.session is not None:
+            tensor = crops.transpose(0, 3, 1, 2).astype(np.float32) / 255.0
+            scores = np.asarray(self.session.run(None, {self.input_name: tensor})[0], dtype=np.float32)
+            return self._normalize(scores)
+
+        # pylint: disable=import-outside-toplevel
+        import torch
+
+        tensor = torch.from_numpy(crops).to(self.device, non_blocking=True)
+        tensor = tensor.permute(0, 3, 1, 2).float().div_(255.0)
+        results = self.model.predict(source=tensor, imgsz=self.crop_size, verbose=False)
+        return np.stack([result.probs.data.cpu().numpy() for result in results]).astype(np.float32)
+
+    def _normalize(self, scores: np.ndarray) -> np.ndarray:
+        """export 모델 출력이 로짓이면 확률로 변환"""
+        if scores.min() >= 0.0 and scores.max() <= 1.0:
+            return scores
+        if self.multi_label:
+            return 1.0 / (1.0 + np.exp(-scores))
+        scores = np.exp(scores - scores.max(axis=1, keepdims=True))
+        return scores / scores.sum(axis=1, keepdims=True)
+
+    def _fill_crops(self, frame: np.ndarray, boxes: np.ndarray):
+        """박스 영역(+여유)을 크롭 버퍼 앞쪽에 크기 맞춰 복사"""
+        h, w = frame.shape[:2]
+        size = (self.crop_size, self.crop_size)
+        for j, (x1, y1, x2, y2) in enumerate(boxes):
+            pad_x = int((x2 - x1) * self.pad_ratio)
+            pad_y = int((y2 - y1) * self.pad_ratio)
+            x1, y1 = max(0, x1 - pad_x), max(0, y1 - pad_y)
+            x2, y2 = min(w, x2 + pad_x), min(h, y2 + pad_y)
+            if x2 <= x1 or y2 <= y1:
+                self._crops[j] = 0
+                continue
+            cv2.resize(frame[y1:y2, x1:x2], size, dst=self._crops[j], interpolation=cv2.INTER_LINEAR)
+
+    def update(self, cam_id: int, det: DetectionBatch, frame: np.ndarray,
+               offset: Tuple[int, int] = (0, 0), scale: float = 1.0) -> DetectionBatch:
+        """
+        트래킹된 검출 결과에 재질 반영
+
+        캐시에 없는(또는 아직 확정 안 된) 트랙만 신뢰도 순으로 최대 max_crops 개 분류
+
+        :param frame: 추론에 들어간 프레임 (구역 크롭이면 잘라낸 영역)
+        :param offset: frame 의 원본 좌상단 (x, y) - 검출 좌표는 원본 기준
+        :param scale: 원본 대비 frame 배율 (절반 해상도 입력이면 0.5)
+        :return: output_class_names 기준 결과 (재질이 확정된 객체만 재질 클래스)
+        """
+        now = time.perf_counter()
+        cache = self._cache.setdefault(cam_id, {})
+        self._prune(cache, now)
+        if not det:
+            return DetectionBatch(det.data, self.output_class_names, det.frame_id, det.capture_time)
+
+        ids = det.ids
+        pending = []
+        for row, track_id in enumerate(ids.tolist()):
+            entry = cache.get(track_id) if track_id >= 0 else None
+            if entry is not None:
+                entry.last_seen = now
+                if entry.conf >= self.min_confidence or entry.attempts >= self.max_attempts:
+                    self.cache_hits += 1
+                    continue
+            pending.append(row)
+
+        # 이번 프레임에 분류하지 못한 결과 (추적되지 않은 객체)
+        untracked: Dict[int, Tuple[int, float]] = {}
+        if pending:
+            rows = np.asarray(pending, dtype=np.int64)
+            rows = rows[np.argsort(-det.data['conf'][rows], kind='stable')][:self.max_crops]
+
+            boxes = det.xyxy[rows] - np.array([offset[0], offset[1], offset[0], offset[1]])
+            if scale != 1.0:
+                boxes = (boxes * scale).astype(np.int32)
+            self._fill_crops(frame, boxes)
+
+            t_start = time.perf_counter()
+            batch = self._crops if self.fixed_batch else self._crops[:len(rows)]
+            scores = self._classify(batch)[:len(rows)]
+            self.classify_latency.append((time.perf_counter() - t_start) * 1000)
+            self.classify_calls += 1
+            self.classified_crops += len(rows)
+
+            materials = scores.argmax(axis=1)
+            confs = scores[np.arange(len(rows)), materials]
+            for row, material, conf, score in zip(rows.tolist(), materials.tolist(), confs.tolist(), scores):
+                track_id = int(ids[row])
+                if track_id < 0:
+                    untracked[row] = (material, conf)
+                    continue
+                labels = ()
+                if self.multi_label:
+                    labels = tuple(self.class_names[k] for k in np.flatnonzero(score >= self.label_threshold))
+                entry = cache.get(track_id)
+                if entry is None:
+                    cache[track_id] = _TrackLabel(material, conf, labels, last_seen=now)
+                else:
+                    entry.attempts += 1
+                    if conf > entry.conf:
+                        entry.material, entry.conf, entry.labels = material, conf, labels
+
+        # 재질이 확정된 객체의 클래스를 재질 클래스로 교체
+        data = det.data.copy()
+        for row, track_id in enumerate(ids.tolist()):
+            if track_id >= 0:
+                entry = cache.get(track_id)
+                material, conf = (entry.material, entry.conf) if entry is not None else (-1, 0.0)
+            else:
+                material, conf = untracked.get(row, (-1, 0.0))
+            if material >= 0 and conf >= self.min_confidence:
+                data['cls'][row] = self._material_to_output[material]
+
+        return DetectionBatch(data, self.output_class_names, det.frame_id, det.capture_time)
+
+    def _prune(self, cache: Dict[int, _TrackLabel], now: float):
+        """오래 보이지 않은 트랙 제거"""
+        expired = [track_id for track_id, entry in cache.items() if now - entry.last_seen > self.cache_ttl]
+        for track_id in expired:
+            del cache[track_id]
+
+    def get_labels(self, cam_id: int, track_id: int) -> Optional[_TrackLabel]:
+        """트랙의 분류 결과 (없으면 None)"""
+        return self._cache.get(cam_id, {}).get(track_id)
+
+    def get_stats(self) -> dict:
+        """통계"""
+        values = list(self.classify_latency)
+        return {
+            'classify_calls': self.classify_calls,
+            'classified_crops': self.classified_crops,
+            'cache_hits': self.cache_hits,
+            'cached_tracks': sum(len(cache) for cache in self._cache.values()),
+            'classify_ms': sum(values) / len(values) if values else 0.0,
+        }
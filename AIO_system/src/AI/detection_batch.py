@@ -0,0 +1,266 @@
+"""
+src/AI/detection_batch.py
+
+검출 결과 묶음 (NumPy 구조화 배열)
+- 결과 하나당 한 번의 벡터 연산으로 생성
+- 객체마다 dataclass를 만들지 않고 배열 그대로 박스 판정/트래킹에 사용
+"""
+import time
+from typing import Iterator, List, Optional, Sequence
+
+import numpy as np
+
+
+DETECTION_DTYPE = np.dtype([
+    ('id', '<i4'),      # 트래킹 ID
+    ('cls', '<i2'),     # 클래스 인덱스 (class_names 기준)
+    ('cx', '<i4'),      # 중심점
+    ('cy', '<i4'),
+    ('x1', '<i4'),      # 바운딩 박스
+    ('y1', '<i4'),
+    ('x2', '<i4'),
+    ('y2', '<i4'),
+    ('conf', '<f4'),    # 신뢰도
+])
+
+
+def nms_indices(xyxy: np.ndarray, scores: np.ndarray,
+                iou_threshold: float = 0.5, metric: str = 'iou',
+                classes: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    NMS 후 남길 행 인덱스 (신뢰도 내림차순)
+
+    :param metric: 'iou' - 일반 IoU
+                   'ios' - 작은 박스 기준 겹침 비율 (타일 경계에서 잘린 박스 병합용)
+    :param classes: 주면 클래스별 NMS (다른 클래스끼리는 억제하지 않음)
+    """
+    xyxy = np.asarray(xyxy, dtype=np.float32)
+    if classes is not None and len(xyxy):
+        # 클래스마다 겹치지 않는 위치로 옮겨서 한 번에 처리
+        shift = float(xyxy.max() - xyxy.min()) + 1.0
+        xyxy = xyxy + np.asarray(classes, dtype=np.float32)[:, None] * shift
+    areas = (xyxy[:, 2] - xyxy[:, 0]) * (xyxy[:, 3] - xyxy[:, 1])
+    order = np.argsort(-np.asarray(scores), kind='stable')
+
+    keep = []
+    while order.size:
+        i = order[0]
+        keep.append(i)
+        rest = order[1:]
+
+        iw = np.minimum(xyxy[i, 2], xyxy[rest, 2]) - np.maximum(xyxy[i, 0], xyxy[rest, 0])
+        ih = np.minimum(xyxy[i, 3], xyxy[rest, 3]) - np.maximum(xyxy[i, 1], xyxy[rest, 1])
+        inter = np.clip(iw, 0, None) * np.clip(ih, 0, None)
+
+        if metric == 'ios':
+            denom = np.minimum(areas[i], areas[rest])
+        else:
+            denom = areas[i] + areas[rest] - inter
+        overlap = inter / np.maximum(denom, 1e-6)
+
+        order = rest[overlap <= iou_threshold]
+
+    return np.asarray(keep, dtype=np.int64)
+
+
+class DetectionView:
+    """
+    DetectionBatch 의 한 행을 DetectedObject 처럼 읽기 위한 뷰
+
+    그리기/로그처럼 객체 단위 접근이 필요한 곳에서만 생성됨
+    """
+    __slots__ = ('_batch', '_index')
+
+    def __init__(self, batch: "DetectionBatch", index: int):
+        self._batch = batch
+        self._index = index
+
+    @property
+    def id(self) -> int:
+        """트래킹 ID"""
+        return int(self._batch.data['id'][self._index])
+
+    @property
+    def class_name(self) -> str:
+        """클래스 이름"""
+        return self._batch.class_names[self._batch.data['cls'][self._index]]
+
+    @property
+    def center(self) -> tuple:
+        """중심점 (x, y)"""
+        row = self._batch.data[self._index]
+        return int(row['cx']), int(row['cy'])
+
+    @property
+    def bbox(self) -> tuple:
+        """바운딩 박스 (x1, y1, x2, y2)"""
+        row = self._batch.data[self._index]
+        return int(row['x1']), int(row['y1']), int(row['x2']), int(row['y2'])
+
+    @property
+    def confidence(self) -> float:
+        """신뢰도"""
+        return float(self._batch.data['conf'][self._index])
+
+    @property
+    def metainfo(self) -> None:
+        """DetectedObject 호환용"""
+        return None
+
+    def __repr__(self):
+        return (f"DetectionView(id={self.id}, class_name={self.class_name!r}, "
+                f"bbox={self.bbox}, confidence={self.confidence:.2f})")
+
+
+class DetectionBatch:
+    """
+    카메라 한 프레임의 검출 결과 묶음
+
+    frame_id / capture_time 은 결과가 어느 프레임에서 나왔는지 (-1 / 0.0 이면 모름)
+    """
+    __slots__ = ('data', 'class_names', 'frame_id', 'capture_time')
+
+    def __init__(self, data: Optional[np.ndarray] = None, class_names: Sequence[str] = (),
+                 frame_id: int = -1, capture_time: float = 0.0):
+        self.data = data if data is not None else np.empty(0, dtype=DETECTION_DTYPE)
+        self.class_names = list(class_names)
+        self.frame_id = frame_id            # 카메라 프레임 번호
+        self.capture_time = capture_time    # 촬영 시각 (time.perf_counter 기준)
+
+    @classmethod
+    def empty(cls, class_names: Sequence[str] = ()) -> "DetectionBatch":
+        """빈 검출 결과"""
+        return cls(np.empty(0, dtype=DETECTION_DTYPE), class_names)
+
+    @classmethod
+    def from_arrays(cls, xyxy: np.ndarray, conf: np.ndarray, class_ids: np.ndarray,
+                    class_names: Sequence[str], ids: Optional[np.ndarray] = None) -> "DetectionBatch":
+        """
+        모델 출력 배열을 한 번에 변환
+
+        :param xyxy: (N, 4) 바운딩 박스
+        :param conf: (N,) 신뢰도
+        :param class_ids: (N,) 클래스 인덱스 - class_names 범위를 벗어나면 제외
+        :param ids: (N,) 트래킹 ID, 없으면 검출 순서
+        """
+        class_ids = np.asarray(class_ids).astype(np.int64, copy=False)
+        if ids is None:
+            ids = np.arange(len(class_ids))
+
+        keep = (class_ids >= 0) & (class_ids < len(class_names))
+        boxes = np.asarray(xyxy)[keep].astype(np.int32)
+
+        data = np.empty(int(keep.sum()), dtype=DETECTION_DTYPE)
+        data['id'] = np.asarray(ids)[keep]
+        data['cls'] = class_ids[keep]
+        data['conf'] = np.asarray(conf)[keep]
+        batch = cls(data, class_names)
+        batch._write_boxes(boxes)
+        return batch
+
+    @classmethod
+    def from_objects(cls, objects: Sequence, class_names: Optional[Sequence[str]] = None) -> "DetectionBatch":
+        """DetectedObject 목록 변환 (기존 코드 호환용)"""
+        if class_names is None:
+            class_names = list(dict.fromkeys(obj.class_name for obj in objects))
+        name_to_id = {name: i for i, name in enumerate(class_names)}
+
+        if not objects:
+            return cls.empty(class_names)
+        return cls.from_arrays(
+            xyxy=np.array([obj.bbox for obj in objects]),
+            conf=np.array([obj.confidence for obj in objects]),
+            class_ids=np.array([name_to_id.get(obj.class_name, -1) for obj in objects]),
+            class_names=class_names,
+            ids=np.array([obj.id for obj in objects]),
+        )
+
+    @classmethod
+    def concatenate(cls, batches: List["DetectionBatch"],
+                    class_names: Sequence[str] = ()) -> "DetectionBatch":
+        """여러 결과 합치기 (class_names가 같다고 가정)"""
+        if not batches:
+            return cls.empty(class_names)
+        return cls(np.concatenate([b.data for b in batches]), batches[0].class_names)
+
+    def _write_boxes(self, xyxy: np.ndarray):
+        """박스/중심점 필드 갱신"""
+        xyxy = np.asarray(xyxy).astype(np.int32, copy=False)
+        self.data['x1'] = xyxy[:, 0]
+        self.data['y1'] = xyxy[:, 1]
+        self.data['x2'] = xyxy[:, 2]
+        self.data['y2'] = xyxy[:, 3]
+        self.data['cx'] = (xyxy[:, 0] + xyxy[:, 2]) // 2
+        self.data['cy'] = (xyxy[:, 1] + xyxy[:, 3]) // 2
+
+    def set_boxes(self, xyxy: np.ndarray):
+        """바운딩 박스 교체 (트래커 보정 좌표 반영 등)"""
+        self._write_boxes(xyxy)
+
+    def translate(self, dx: int, dy: int):
+        """좌표 평행 이동 (크롭 영역 좌표 -> 원본 프레임 좌표)"""
+        if not (dx or dy):
+            return
+        for name in ('x1', 'x2', 'cx'):
+            self.data[name] += dx
+        for name in ('y1', 'y2', 'cy'):
+            self.data[name] += dy
+
+    def copy(self) -> "DetectionBatch":
+        """복사본"""
+        return DetectionBatch(self.data.copy(), self.class_names, self.frame_id, self.capture_time)
+
+    def age(self, now: Optional[float] = None) -> float:
+        """촬영 후 경과 시간 (초), 촬영 시각을 모르면 0"""
+        if not self.capture_time:
+            return 0.0
+        if now is None:
+            now = time.perf_counter()
+        return now - self.capture_time
+
+    @property
+    def ids(self) -> np.ndarray:
+        """(N,) 트래킹 ID"""
+        return self.data['id']
+
+    @property
+    def xyxy(self) -> np.ndarray:
+        """(N, 4) 바운딩 박스"""
+        return np.stack([self.data['x1'], self.data['y1'], self.data['x2'], self.data['y2']], axis=1)
+
+    @property
+    def centers(self) -> np.ndarray:
+        """(N, 2) 중심점"""
+        return np.stack([self.data['cx'], self.data['cy']], axis=1)
+
+    def nms(self, iou_threshold: float = 0.5, metric: str = 'iou',
+            class_aware: bool = False) -> "DetectionBatch":
+        """NMS 적용 결과 (class_aware 면 클래스별, 아니면 클래스 구분 없음)"""
+        if len(self.data) < 2:
+            return self
+        classes = self.data['cls'] if class_aware else None
+        return self[nms_indices(self.xyxy, self.data['conf'], iou_threshold, metric, classes)]
+
+    def class_mask(self, names) -> np.ndarray:
+        """클래스 이름 집합에 속하는 행 마스크"""
+        lookup = np.array([name in names for name in self.class_names] + [False], dtype=bool)
+        return lookup[self.data['cls']]
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __bool__(self) -> bool:
+        return len(self.data) > 0
+
+    def __iter__(self) -> Iterator[DetectionView]:
+        for i in range(len(self.data)):
+            yield DetectionView(self, i)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, (int, np.integer)):
+            return DetectionView(self, int(idx))
+        return DetectionBatch(self.data[idx], self.class_names, self.frame_id, self.capture_time)
+
+    def __repr__(self):
+        return (f"DetectionBatch({len(self)} detections, frame_id={self.frame_id}, "
+                f"classes={self.class_names})")
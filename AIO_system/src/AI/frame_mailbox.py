@@ -0,0 +1,85 @@
+"""
+src/AI/frame_mailbox.py
+
+카메라별 최신 프레임 1장만 보관하는 우편함
+- put 은 큐에 쌓지 않고 덮어씀 (덮어쓴 횟수 = 드롭)
+- 새 프레임이 들어오면 조건 변수로 수집 스레드를 깨움 (짧은 timeout 폴링 없음)
+"""
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+
+class LatestFrameMailbox:
+    """카메라별 단일 슬롯 + 공용 조건 변수"""
+
+    def __init__(self, num_slots: int):
+        self.num_slots = num_slots
+        self._slots: List[Optional[Any]] = [None] * num_slots
+        self._cond = threading.Condition()
+        self._closed = False
+
+        # 통계
+        self.overwrites = [0] * num_slots
+
+    def put(self, slot: int, item: Any) -> bool:
+        """
+        최신 항목으로 교체
+
+        :return: 아직 가져가지 않은 이전 항목을 덮어썼으면 True (드롭)
+        """
+        with self._cond:
+            overwritten = self._slots[slot] is not None
+            if overwritten:
+                self.overwrites[slot] += 1
+            self._slots[slot] = item
+            self._cond.notify_all()
+        return overwritten
+
+    def collect(self, timeout: float, gather_window: float) -> Dict[int, Any]:
+        """
+        대기 중인 항목 가져오기
+
+        첫 항목이 올 때까지 최대 timeout 만큼 기다리고,
+        그 뒤 gather_window 안에 나머지 슬롯도 채워지면 함께 가져감
+
+        :return: {slot: item}, 타임아웃이거나 닫혔으면 빈 dict
+        """
+        with self._cond:
+            if not self._cond.wait_for(self._has_any, timeout=timeout):
+                return {}
+
+            deadline = time.monotonic() + gather_window
+            while not self._closed and not all(item is not None for item in self._slots):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            items = {i: item for i, item in enumerate(self._slots) if item is not None}
+            self._slots = [None] * self.num_slots
+            return items
+
+    def _has_any(self) -> bool:
+        return self._closed or any(item is not None for item in self._slots)
+
+    def pending(self, slot: int) -> int:
+        """가져가지 않은 항목 수 (0 또는 1)"""
+        return int(self._slots[slot] is not None)
+
+    @property
+    def closed(self) -> bool:
+        """close 후 reopen 전까지 True"""
+        return self._closed
+
+    def close(self):
+        """대기 중인 수집 스레드 깨우기 (종료용)"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def reopen(self):
+        """재시작 전 초기화"""
+        with self._cond:
+            self._closed = False
+            self._slots = [None] * self.num_slots
@@ -0,0 +1,391 @@
+"""
+src/AI/inference_backend.py
+
+추론 백엔드
+- ultralytics: 기존 YOLO(.pt / .engine) 경로 (GPU 우선)
+- onnxruntime: CPU 최적화 ONNX 러너 (fp32 / fp16 / int8 모델, 스레드 수 지정)
+- openvino: Intel CPU 용 OpenVINO 러너 (정밀도 힌트, 스레드 수 지정)
+- synthetic: 시나리오 파일 기반 가상 검출기 (모델/가속기 없이 종단 부하 테스트)
+
+모든 백엔드는 전처리된 (B, 3, S, S) float 0~1 텐서를 받아서
+이미지별 (xyxy, conf, cls) 배열을 입력 텐서 좌표로 돌려줌
+"""
+import ast
+import os
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from src.AI.detection_batch import nms_indices
+from src.AI.synthetic_detector import ScenarioPlayer
+from src.utils.logger import log
+
+
+# 이미지 하나의 검출 결과: (xyxy (N, 4), conf (N,), cls (N,))
+RawDetections = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+def resolve_model_path(model_path: str, precision: str = 'fp32') -> str:
+    """
+    정밀도별 모델 파일 선택
+
+    best.onnx + int8 -> best_int8.onnx 가 있으면 그 파일, 없으면 원래 경로
+    """
+    if precision in ('fp16', 'int8'):
+        stem, ext = os.path.splitext(model_path)
+        variant = f"{stem}_{precision}{ext}"
+        if os.path.exists(variant):
+            return variant
+    return model_path
+
+
+class InferenceBackend:
+    """추론 백엔드 기본 클래스"""
+    name = 'base'
+
+    def __init__(self, model_path: str, confidence_threshold: float = 0.5,
+                 img_size: int = 640, max_det: int = 50, iou_threshold: float = 0.7,
+                 agnostic_nms: bool = True):
+        self.model_path = model_path
+        self.confidence_threshold = confidence_threshold
+        self.img_size = img_size
+        self.max_det = max_det
+        self.iou_threshold = iou_threshold
+        self.agnostic_nms = agnostic_nms  # False 면 클래스별 NMS
+        self.device = 'cpu'
+        self.class_names: Optional[List[str]] = None  # 모델 메타데이터에 있으면 채워짐
+
+    def load(self) -> bool:
+        """모델 로드"""
+        raise NotImplementedError
+
+    def probe_batch(self) -> Tuple[bool, int]:
+        """
+        지원 배치 크기 확인
+
+        :return: (동적 배치 여부, 고정 배치 크기)
+        """
+        raise NotImplementedError
+
+    def infer(self, tensor) -> List[RawDetections]:
+        """
+        배치 추론
+
+        :param tensor: (B, 3, S, S) float 0~1 (torch.Tensor 또는 np.ndarray)
+        :return: 이미지별 (xyxy, conf, cls), 좌표는 입력 텐서 기준
+        """
+        raise NotImplementedError
+
+    def set_batch_context(self, entries):
+        """
+        다음 infer 배치의 항목 정보 (입력 텐서만으로 결과를 만들지 않는 백엔드용)
+
+        :param entries: 항목별 (cam_id, (scale, pad_x, pad_y), frame_meta)
+        """
+
+    def release(self):
+        """교체된 모델 정리 (추론 중인 배치가 있을 수 있으므로 참조만 정리)"""
+
+    @staticmethod
+    def _empty() -> RawDetections:
+        return (np.zeros((0, 4), dtype=np.float32),
+                np.zeros(0, dtype=np.float32),
+                np.zeros(0, dtype=np.int64))
+
+
+class UltralyticsBackend(InferenceBackend):
+    """ultralytics YOLO (.pt / .engine)"""
+    name = 'ultralytics'
+
+    def __init__(self, model_path: str, **kwargs):
+        super().__init__(model_path, **kwargs)
+        self.model = None
+
+    def load(self):
+        # pylint: disable=import-outside-toplevel
+        from src.AI.model_load import load_yolov11
+
+        self.model, self.device = load_yolov11(self.model_path)
+        return self.model is not None
+
+    def release(self):
+        # pylint: disable=import-outside-toplevel
+        from src.AI.model_load import clear_model_cache
+
+        # 캐시에서 빼야 마지막 배치가 끝난 뒤 GPU 메모리가 해제됨
+        clear_model_cache(self.model_path)
+
+    def probe_batch(self):
+        backend = self._setup_predictor()
+
+        # PyTorch 모델이거나 동적 shape 엔진이면 배치 크기 제한 없음
+        dynamic = bool(getattr(backend, 'pt', False) or getattr(backend, 'dynamic', False))
+        return dynamic, int(getattr(backend, 'batch', 1) or 1)
+
+    def _setup_predictor(self):
+        """
+        추론 없이 predictor(AutoBackend)만 생성 (Model.predict 의 첫 호출과 같은 과정)
+
+        batch > 1 고정 TensorRT 엔진은 1장 추론이 실패하므로 엔진을 먼저 열어서 입력 배치를 읽어야 함.
+        이후 predict 호출은 이 predictor 를 그대로 재사용
+        """
+        # pylint: disable=protected-access
+        if self.model.predictor is None:
+            args = {
+                **self.model.overrides,
+                'conf': self.confidence_threshold, 'imgsz': self.img_size,
+                'batch': 1, 'save': False, 'mode': 'predict', 'verbose': False,
+            }
+            self.model.predictor = self.model._smart_load('predictor')(
+                overrides=args, _callbacks=self.model.callbacks
+            )
+            self.model.predictor.setup_model(model=self.model.model, verbose=False)
+        return self.model.predictor.model
+
+    def infer(self, tensor):
+        results = self.model.predict(
+            source=tensor,
+            conf=self.confidence_threshold,
+            imgsz=self.img_size,
+            verbose=False,
+            max_det=self.max_det,
+            agnostic_nms=self.agnostic_nms
+        )
+
+        outputs = []
+        for result in results:
+            boxes = result.boxes
+            if boxes is None or len(boxes) == 0:
+                outputs.append(self._empty())
+                continue
+            outputs.append((
+                boxes.xyxy.cpu().numpy(),
+                boxes.conf.cpu().numpy(),
+                boxes.cls.cpu().numpy().astype(np.int64),
+            ))
+        return outputs
+
+
+class _ExportedYoloBackend(InferenceBackend):
+    """
+    export 된 YOLO 모델 공통 후처리
+
+    출력 (B, 4 + nc, N): 중심 xywh + 클래스 점수 -> 신뢰도 필터 + NMS (기본 클래스 무관)
+    """
+
+    def __init__(self, model_path: str, precision: str = 'fp32', num_threads: int = 0, **kwargs):
+        super().__init__(resolve_model_path(model_path, precision), **kwargs)
+        self.precision = precision
+        self.num_threads = num_threads  # 0이면 런타임 기본값
+        self.input_dtype = np.float32
+
+    def _decode(self, output: np.ndarray) -> List[RawDetections]:
+        outputs = []
+        for pred in output:
+            pred = pred.T  # (N, 4 + nc)
+            scores = pred[:, 4:]
+            cls = scores.argmax(axis=1)
+            conf = scores[np.arange(len(cls)), cls]
+
+            keep = conf >= self.confidence_threshold
+            if not keep.any():
+                outputs.append(self._empty())
+                continue
+
+            xywh, conf, cls = pred[keep, :4], conf[keep], cls[keep]
+            xyxy = np.empty_like(xywh)
+            xyxy[:, :2] = xywh[:, :2] - xywh[:, 2:] / 2
+            xyxy[:, 2:] = xywh[:, :2] + xywh[:, 2:] / 2
+
+            idx = nms_indices(xyxy, conf, self.iou_threshold,
+                              classes=None if self.agnostic_nms else cls)[:self.max_det]
+            outputs.append((
+                xyxy[idx].astype(np.float32),
+                conf[idx].astype(np.float32),
+                cls[idx].astype(np.int64),
+            ))
+        return outputs
+
+    def _to_numpy(self, tensor) -> np.ndarray:
+        if hasattr(tensor, 'numpy'):
+            tensor = tensor.detach().cpu().numpy()
+        return np.ascontiguousarray(tensor, dtype=self.input_dtype)
+
+    @staticmethod
+    def _parse_names(names) -> Optional[List[str]]:
+        """메타데이터의 names ("{0: 'PET', ...}") 파싱"""
+        if not names:
+            return None
+        try:
+            names = ast.literal_eval(names) if isinstance(names, str) else names
+            return [names[i] for i in sorted(names)]
+        except (ValueError, SyntaxError, TypeError):
+            return None
+
+
+class OnnxRuntimeBackend(_ExportedYoloBackend):
+    """ONNX Runtime CPU 러너"""
+    name = 'onnxruntime'
+
+    def __init__(self, model_path: str, **kwargs):
+        super().__init__(model_path, **kwargs)
+        self.session = None
+        self.input_name = None
+
+    def load(self):
+        # pylint: disable=import-outside-toplevel
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if self.num_threads:
+            options.intra_op_num_threads = self.num_threads
+
+        log(f"ONNX Runtime 모델 로드 중: {self.model_path} ({self.precision})")
+        self.session = ort.InferenceSession(
+            self.model_path, sess_options=options, providers=['CPUExecutionProvider']
+        )
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        self.input_dtype = np.float16 if model_input.type == 'tensor(float16)' else np.float32
+        self.class_names = self._parse_names(
+            self.session.get_modelmeta().custom_metadata_map.get('names')
+        )
+        log(f"ONNX Runtime 로드 성공 (입력 {model_input.shape}, {model_input.type}, "
+            f"스레드 {self.num_threads or '기본'})")
+        return True
+
+    def probe_batch(self):
+        batch = self.session.get_inputs()[0].shape[0]
+        if isinstance(batch, int):
+            return False, batch
+        return True, 1
+
+    def infer(self, tensor):
+        output = self.session.run(None, {self.input_name: self._to_numpy(tensor)})[0]
+        return self._decode(np.asarray(output, dtype=np.float32))
+
+
+class OpenVINOBackend(_ExportedYoloBackend):
+    """OpenVINO CPU 러너 (.xml 또는 .onnx)"""
+    name = 'openvino'
+
+    PRECISION_HINTS = {'fp32': 'f32', 'fp16': 'f16', 'int8': 'f32'}  # int8은 양자화 모델 자체로 결정
+
+    def __init__(self, model_path: str, **kwargs):
+        super().__init__(model_path, **kwargs)
+        self.compiled = None
+        self.request = None
+        self.dynamic = False
+        self.fixed_batch = 1
+
+    def load(self):
+        # pylint: disable=import-outside-toplevel
+        import openvino as ov
+
+        core = ov.Core()
+        log(f"OpenVINO 모델 로드 중: {self.model_path} ({self.precision})")
+        model = core.read_model(self.model_path)
+
+        batch_dim = model.input(0).get_partial_shape()[0]
+        self.dynamic = batch_dim.is_dynamic
+        self.fixed_batch = 1 if self.dynamic else batch_dim.get_length()
+
+        config = {'INFERENCE_PRECISION_HINT': self.PRECISION_HINTS.get(self.precision, 'f32')}
+        if self.num_threads:
+            config['INFERENCE_NUM_THREADS'] = self.num_threads
+        self.compiled = core.compile_model(model, 'CPU', config)
+        self.request = self.compiled.create_infer_request()
+
+        if model.has_rt_info(['model_info', 'names']):
+            self.class_names = self._parse_names(model.get_rt_info(['model_info', 'names']).astype(str))
+        log(f"OpenVINO 로드 성공 (스레드 {self.num_threads or '기본'})")
+        return True
+
+    def probe_batch(self):
+        return self.dynamic, self.fixed_batch
+
+    def infer(self, tensor):
+        self.request.infer({0: self._to_numpy(tensor)})
+        output = self.request.get_output_tensor(0).data
+        return self._decode(np.asarray(output, dtype=np.float32))
+
+
+class SyntheticBackend(InferenceBackend):
+    """
+    시나리오 기반 가상 검출기 (model_path = 시나리오 JSON)
+
+    입력 텐서는 보지 않고 항목별 카메라 / 프레임 번호로 시나리오 물체를 계산해서
+    letterbox(또는 타일) 좌표로 변환해 돌려줌 -> 이후 후처리/트래킹/박스 판정은 실제와 같은 경로
+    """
+    name = 'synthetic'
+
+    def __init__(self, model_path: str, **kwargs):
+        super().__init__(model_path, **kwargs)
+        self.player: Optional[ScenarioPlayer] = None
+        self._entries = []
+        self._t_first = {}  # 프레임 번호가 없는 입력용 카메라별 첫 입력 시각
+
+    def load(self):
+        self.player = ScenarioPlayer.load(self.model_path)
+        self.class_names = self.player.class_names
+        log(f"가상 검출기 시나리오 로드: {self.model_path} (물체 {len(self.player)}개, "
+            f"{self.player.duration:.0f}s{', 반복' if self.player.loop else ''})")
+        return True
+
+    def probe_batch(self):
+        return True, 1
+
+    def set_batch_context(self, entries):
+        self._entries = entries
+
+    def infer(self, tensor):
+        entries, self._entries = self._entries, []
+        outputs = []
+        for i in range(len(tensor)):
+            if i >= len(entries):
+                # 워밍업 / 고정 배치 패딩
+                outputs.append(self._empty())
+                continue
+            cam_id, (scale, pad_x, pad_y), meta = entries[i]
+            if meta.frame_id >= 0:
+                t = self.player.time_of(meta.frame_id)
+            else:
+                t_first = self._t_first.setdefault(cam_id, meta.capture_time)
+                t = self.player.time_of(int((meta.capture_time - t_first) * self.player.fps))
+
+            xyxy, conf, cls = self.player.detections(cam_id, t)
+            keep = conf >= self.confidence_threshold
+            xyxy, conf, cls = xyxy[keep], conf[keep], cls[keep]
+
+            # 원본 프레임 -> 잘라낸 프레임 -> 입력 텐서 좌표 (화면 밖으로 나간 부분은 잘라냄)
+            xyxy = (xyxy - np.array(meta.offset * 2, dtype=np.float32)) * scale
+            xyxy += np.array([pad_x, pad_y, pad_x, pad_y], dtype=np.float32)
+            np.clip(xyxy, 0, self.img_size, out=xyxy)
+            visible = ((xyxy[:, 2] - xyxy[:, 0]) > 1) & ((xyxy[:, 3] - xyxy[:, 1]) > 1)
+            outputs.append((xyxy[visible][:self.max_det], conf[visible][:self.max_det], cls[visible][:self.max_det]))
+        return outputs
+
+
+BACKEND_TYPES = {
+    'ultralytics': UltralyticsBackend,
+    'onnxruntime': OnnxRuntimeBackend,
+    'openvino': OpenVINOBackend,
+    'synthetic': SyntheticBackend,
+}
+
+
+def create_backend(backend_type: str, model_path: str, **kwargs) -> InferenceBackend:
+    """
+    추론 백엔드 생성
+
+    :param backend_type: 'ultralytics' | 'onnxruntime' | 'openvino' | 'synthetic'
+    :param kwargs: confidence_threshold, img_size, max_det, agnostic_nms, (CPU 백엔드) precision, num_threads
+    """
+    if backend_type not in BACKEND_TYPES:
+        raise ValueError(f"지원하지 않는 추론 백엔드: {backend_type}")
+    if backend_type in ('ultralytics', 'synthetic'):
+        # 정밀도/스레드는 엔진 빌드 시 결정됨 (가상 검출기는 해당 없음)
+        kwargs.pop('precision', None)
+        kwargs.pop('num_threads', None)
+    return BACKEND_TYPES[backend_type](model_path, **kwargs)
@@ -0,0 +1,558 @@
+"""
+src/AI/inference_process.py
+
+추론 서브 프로세스
+- BatchAIManager 를 별도 프로세스에서 실행해서 GUI/캡처 스레드와 GIL 경합을 없앰
+- 프레임은 공유 메모리 프레임 링(카메라별 고정 크기 슬롯)에 쓰고, 프로세스 간에는 슬롯 번호와 메타 정보만 전달
+- 결과는 공유 메모리 결과 링(카메라별 슬롯, DETECTION_DTYPE 배열)으로 돌려받음
+  (슬롯 앞뒤 시퀀스 번호로 쓰는 중에 읽은 슬롯을 걸러냄)
+- 서브 -> 메인 알림(초기화 완료, 모델 교체 완료, 통계)은 info_queue 의 (종류, 값) 메시지
+- 메인 프로세스 쪽은 InferenceProcessManager 가 BatchAIManager 와 같은 API를 제공
+"""
+import queue
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+import multiprocessing as mp
+from multiprocessing import shared_memory, Process, synchronize
+
+import numpy as np
+
+from src.AI.AI_manager import BatchAIManager
+from src.AI.detection_batch import DETECTION_DTYPE, DetectionBatch
+from src.utils.config_util import CAMERA_CONFIGS, AI_FRAME_SHM_NAME, AI_RESULT_SHM_NAME
+from src.utils.logger import log
+
+
+# 프레임 슬롯 상태
+SLOT_FREE = 0
+SLOT_WRITTEN = 1
+
+
+def result_slot_dtype(max_det: int) -> np.dtype:
+    """
+    결과 링 슬롯 하나의 구조
+
+    seq_begin / seq_end: 쓰기 시작 전에 seq_begin 을 올리고 다 쓴 뒤 seq_end 를 같은 값으로 맞춤
+    (읽는 쪽은 seq_end -> 데이터 -> seq_begin 순으로 읽어서 두 값이 다르면 다시 읽음)
+    """
+    return np.dtype([
+        ('seq_begin', '<u8'),
+        ('seq_end', '<u8'),
+        ('frame_id', '<i8'),
+        ('capture_time', '<f8'),
+        ('count', '<i4'),
+        ('detections', DETECTION_DTYPE, (max_det,)),
+    ])
+
+
+@dataclass
+class RingLayout:
+    """공유 메모리 링 크기 정보 (두 프로세스가 같은 값으로 뷰를 만듦)"""
+    num_cameras: int
+    frame_slots: int
+    slot_bytes: int         # 프레임 슬롯 하나의 최대 크기 (h * w * 3)
+    result_slots: int
+    max_det: int
+
+    @property
+    def frame_shm_size(self) -> int:
+        """프레임 데이터 + 슬롯 상태"""
+        num = self.num_cameras * self.frame_slots
+        return num * self.slot_bytes + num
+
+    @property
+    def result_dtype(self) -> np.dtype:
+        return result_slot_dtype(self.max_det)
+
+    @property
+    def result_shm_size(self) -> int:
+        return self.num_cameras * self.result_slots * self.result_dtype.itemsize
+
+    def frame_views(self, shm: shared_memory.SharedMemory) -> Tuple[np.ndarray, np.ndarray]:
+        """(프레임 데이터 [cam, slot, bytes], 슬롯 상태 [cam, slot])"""
+        num = self.num_cameras * self.frame_slots
+        frames = np.ndarray(
+            (self.num_cameras, self.frame_slots, self.slot_bytes), dtype=np.uint8, buffer=shm.buf
+        )
+        states = np.ndarray(
+            (self.num_cameras, self.frame_slots), dtype=np.uint8, buffer=shm.buf,
+            offset=num * self.slot_bytes
+        )
+        return frames, states
+
+    def result_view(self, shm: shared_memory.SharedMemory) -> np.ndarray:
+        """결과 링 [cam, slot]"""
+        return np.ndarray(
+            (self.num_cameras, self.result_slots), dtype=self.result_dtype, buffer=shm.buf
+        )
+
+
+def _create_shm(name: str, size: int) -> shared_memory.SharedMemory:
+    """이전 실행에서 남은 같은 이름의 공유 메모리를 지우고 새로 생성"""
+    try:
+        old_mem = shared_memory.SharedMemory(name=name)
+        old_mem.close()
+        old_mem.unlink()
+    except FileNotFoundError:
+        pass
+    return shared_memory.SharedMemory(name=name, create=True, size=size)
+
+
+class InferenceProcess(Process):
+    """BatchAIManager 를 실행하는 추론 전용 프로세스"""
+
+    def __init__(self, layout: RingLayout, model_path: str, manager_kwargs: dict):
+        super().__init__(daemon=True)
+        self.layout = layout
+        self.model_path = model_path
+        self.manager_kwargs = manager_kwargs
+
+        # 메인 -> 서브: (cam_id, slot, shape, offset, frame_id, capture_time)
+        self.request_queue: mp.Queue = mp.Queue()
+        # 서브 -> 메인: 카메라별 결과 슬롯 번호
+        self.result_queues = [mp.Queue() for _ in range(layout.num_cameras)]
+        # 서브 -> 메인: ('ready', (성공 여부, 클래스 이름)) | ('swap_done', 성공 여부) | ('stats', 통계 dict)
+        self.info_queue: mp.Queue = mp.Queue()
+        # 메인 -> 서브: 제어 명령 ('swap_model', model_path)
+        self.control_queue: mp.Queue = mp.Queue()
+
+        self.ready_event: synchronize.Event = mp.Event()
+        self.run_event: synchronize.Event = mp.Event()
+        self.stop_event: synchronize.Event = mp.Event()
+
+        # run() 안에서 생성
+        self._frames = None
+        self._states = None
+        self._results = None
+        self._result_index = None
+        self._truncated = 0
+
+    def run(self):
+        log("Inference Process run")
+        frame_shm = result_shm = None
+        manager = None
+        try:
+            frame_shm = shared_memory.SharedMemory(name=AI_FRAME_SHM_NAME)
+            result_shm = shared_memory.SharedMemory(name=AI_RESULT_SHM_NAME)
+            self._frames, self._states = self.layout.frame_views(frame_shm)
+            self._results = self.layout.result_view(result_shm)
+            self._result_index = [-1] * self.layout.num_cameras
+
+            manager = BatchAIManager(**self.manager_kwargs)
+            manager.result_callback = self._on_result
+            if not manager.initialize(self.model_path):
+                self.info_queue.put(('ready', (False, [])))
+                return
+            self.info_queue.put(('ready', (True, list(manager.output_class_names))))
+            self.ready_event.set()
+
+            last_stats = 0.0
+            while not self.stop_event.is_set():
+                # 통계는 1초마다 메인 프로세스로 보냄 (get_stats 는 마지막 값을 사용)
+                now = time.perf_counter()
+                if now - last_stats >= 1.0:
+                    last_stats = now
+                    stats = manager.get_stats()
+                    stats['truncated_detections'] = self._truncated
+                    self.info_queue.put(('stats', stats))
+
+                # 메인 프로세스의 start/stop 반영
+                if self.run_event.is_set() and not manager.running:
+                    manager.start()
+                elif not self.run_event.is_set() and manager.running:
+                    manager.stop()
+                self._handle_control(manager)
+
+                try:
+                    cam_id, slot, shape, offset, frame_id, capture_time, input_scale = \
+                        self.request_queue.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+
+                # 슬롯은 바로 반납 (메인 프로세스가 다음 프레임을 쓸 수 있도록)
+                size = int(np.prod(shape))
+                frame = self._frames[cam_id, slot, :size].reshape(shape).copy()
+                self._states[cam_id, slot] = SLOT_FREE
+
+                manager.put_frame(cam_id, frame, offset=offset, frame_id=frame_id,
+                                  capture_time=capture_time, input_scale=input_scale)
+
+        except Exception as e:
+            log(f"[ERROR] Inference process runtime error: {e}")
+            if not self.ready_event.is_set():
+                self.info_queue.put(('ready', (False, [])))
+        finally:
+            if manager is not None:
+                manager.stop()
+            # 뷰를 먼저 해제해야 close 가능
+            self._frames = self._states = self._results = None
+            for shm in (frame_shm, result_shm):
+                if shm is not None:
+                    shm.close()
+            log("Inference Process end")
+
+    def _handle_control(self, manager: BatchAIManager):
+        """메인 프로세스 제어 명령 처리"""
+        try:
+            command, arg = self.control_queue.get_nowait()
+        except queue.Empty:
+            return
+        if command == 'swap_model':
+            def _on_done(ok: bool):
+                self.info_queue.put(('swap_done', ok))
+            if not manager.swap_model(arg, on_done=_on_done):
+                _on_done(False)
+
+    def _on_result(self, cam_id: int, detections: DetectionBatch):
+        """결과 링에 쓰고 슬롯 번호만 전달 (서브 프로세스 후처리 스레드에서 호출)"""
+        index = (self._result_index[cam_id] + 1) % self.layout.result_slots
+        self._result_index[cam_id] = index
+
+        ring = self._results[cam_id]
+        count = min(len(detections), self.layout.max_det)
+        if count < len(detections):
+            # 분류기/필터 후 검출이 슬롯 크기(max_det)를 넘으면 잘림
+            self._truncated += len(detections) - count
+            log(f"[카메라 {cam_id}] 결과 슬롯 초과: {len(detections)}개 중 {count}개만 전달")
+
+        seq = int(ring['seq_begin'][index]) + 1
+        ring['seq_begin'][index] = seq
+        ring['frame_id'][index] = detections.frame_id
+        ring['capture_time'][index] = detections.capture_time
+        ring['count'][index] = count
+        ring['detections'][index, :count] = detections.data[:count]
+        ring['seq_end'][index] = seq
+
+        self.result_queues[cam_id].put(index)
+
+    def stop(self):
+        """프로세스 종료 요청"""
+        self.stop_event.set()
+
+
+class InferenceProcessManager:
+    """
+    추론 프로세스를 BatchAIManager 와 같은 API로 감싼 메인 프로세스 쪽 관리자
+
+    CameraThread / MonitoringPage 는 BatchAIManager 대신 그대로 사용 가능
+    """
+
+    def __init__(
+        self,
+        num_cameras: int = 2,
+        frame_slots: int = 4,
+        result_slots: int = 4,
+        max_frame_shape: Optional[Tuple[int, int, int]] = None,
+        **manager_kwargs
+    ):
+        self.num_cameras = num_cameras
+        self.manager_kwargs = dict(manager_kwargs, num_cameras=num_cameras)
+
+        if max_frame_shape is None:
+            max_frame_shape = self._max_roi_shape(num_cameras)
+        self.layout = RingLayout(
+            num_cameras=num_cameras,
+            frame_slots=frame_slots,
+            slot_bytes=int(np.prod(max_frame_shape)),
+            result_slots=result_slots,
+            max_det=manager_kwargs.get('max_det', 50),
+        )
+
+        self.frame_shm = _create_shm(AI_FRAME_SHM_NAME, self.layout.frame_shm_size)
+        self.result_shm = _create_shm(AI_RESULT_SHM_NAME, self.layout.result_shm_size)
+        self._frames, self._states = self.layout.frame_views(self.frame_shm)
+        self._states[:] = SLOT_FREE
+        self._results = self.layout.result_view(self.result_shm)
+        self._next_slot = [0] * num_cameras
+
+        self.process: Optional[InferenceProcess] = None
+        self.CLASS_NAMES = []
+        self.loader_thread = None
+        self.running = False
+        self._start_requested = False
+        self._state_lock = threading.Lock()
+        self._oversize_logged = False
+
+        # 통계
+        self.dropped_frames = {i: 0 for i in range(num_cameras)}
+        self.result_latency = {i: deque(maxlen=30) for i in range(num_cameras)}
+        self._submit_times: Dict[int, Dict[int, float]] = {i: {} for i in range(num_cameras)}
+        self.torn_reads = 0
+        self._process_stats: Dict = {}      # 서브 프로세스 BatchAIManager 통계 (1초마다 갱신)
+        self._swap_callback: Optional[Callable[[bool], None]] = None
+        self._info_thread: Optional[threading.Thread] = None
+
+        log(f"InferenceProcessManager: 프레임 링 {frame_slots}슬롯 x "
+            f"{self.layout.slot_bytes / 1e6:.1f}MB x {num_cameras}대")
+
+    @staticmethod
+    def _max_roi_shape(num_cameras: int) -> Tuple[int, int, int]:
+        """카메라 ROI 중 가장 큰 프레임 크기 (h, w, 3)"""
+        sizes = [
+            CAMERA_CONFIGS.get(cam_id, {}).get('roi') or {'width': 1280, 'height': 720}
+            for cam_id in range(num_cameras)
+        ]
+        return (max(r.get('height', 720) for r in sizes),
+                max(r.get('width', 1280) for r in sizes), 3)
+
+    def initialize(self, model_path: str) -> bool:
+        """추론 프로세스 시작 + 모델 로드/워밍업 완료까지 대기"""
+        if self.process is None or not self.process.is_alive():
+            self.process = InferenceProcess(self.layout, model_path, self.manager_kwargs)
+            self._swap_callback = None
+            self._process_stats = {}
+            self.process.start()
+
+        while self.process.is_alive():
+            try:
+                kind, value = self.process.info_queue.get(timeout=1.0)
+            except queue.Empty:
+                continue
+            if kind != 'ready':
+                continue
+            ok, class_names = value
+            self.CLASS_NAMES = class_names
+            log("추론 프로세스 초기화 완료" if ok else "추론 프로세스 초기화 실패")
+            if ok:
+                self._info_thread = threading.Thread(target=self._info_loop, args=(self.process,), daemon=True)
+                self._info_thread.start()
+            return ok
+
+        log("추론 프로세스가 초기화 중 종료됨")
+        return False
+
+    def _info_loop(self, process: InferenceProcess):
+        """서브 프로세스 알림 수신 (모델 교체 완료 콜백 / 통계 갱신)"""
+        while process.is_alive():
+            try:
+                kind, value = process.info_queue.get(timeout=1.0)
+            except queue.Empty:
+                continue
+            except (EOFError, OSError):
+                break
+            if kind == 'stats':
+                self._process_stats = value
+            elif kind == 'swap_done':
+                callback, self._swap_callback = self._swap_callback, None
+                if callback:
+                    try:
+                        callback(value)
+                    except Exception as e:
+                        log(f"모델 교체 콜백 오류: {e}")
+
+    def initialize_async(self, model_path: str,
+                         on_ready: Optional[Callable[[bool], None]] = None):
+        """백그라운드에서 추론 프로세스 초기화 (BatchAIManager.initialize_async 와 동일)"""
+        def _load():
+            ok = self.initialize(model_path)
+
+            with self._state_lock:
+                start_pending = ok and self._start_requested
+            if start_pending:
+                self.start()
+
+            if on_ready:
+                try:
+                    on_ready(ok)
+                except Exception as e:
+                    log(f"모델 준비 콜백 오류: {e}")
+
+        self.loader_thread = threading.Thread(target=_load, daemon=True)
+        self.loader_thread.start()
+
+    @property
+    def frames_in_flight(self) -> int:
+        """put_frame 이 공유 메모리로 복사하므로 넘긴 프레임을 계속 참조하지 않음"""
+        return 0
+
+    def is_ready(self) -> bool:
+        """모델 로드 + 워밍업 완료 여부"""
+        return self.process is not None and self.process.ready_event.is_set()
+
+    def start(self):
+        """추론 시작 (모델 준비 전이면 준비 완료 후 시작)"""
+        with self._state_lock:
+            if not self.is_ready():
+                if self.loader_thread and self.loader_thread.is_alive():
+                    log("모델 로딩 중 - 준비되면 추론 시작")
+                    self._start_requested = True
+                else:
+                    log("모델이 초기화되지 않았습니다")
+                return
+            self._start_requested = False
+            self.running = True
+        self.process.run_event.set()
+
+    def stop(self):
+        """추론 중지 (프로세스와 모델은 유지)"""
+        with self._state_lock:
+            self._start_requested = False
+            self.running = False
+        if self.process is not None:
+            self.process.run_event.clear()
+
+    def swap_model(self, model_path: str,
+                   on_done: Optional[Callable[[bool], None]] = None) -> bool:
+        """
+        추론 프로세스에 모델 교체 요청 (로드/워밍업/교체는 서브 프로세스에서 백그라운드로 진행)
+
+        끝나면 on_done(성공 여부) 호출 (알림 수신 스레드, BatchAIManager.swap_model 과 동일)
+        """
+        if not self.is_ready():
+            log("모델이 초기화되지 않아 교체할 수 없음")
+            return False
+        if self._swap_callback is not None:
+            log("이미 모델 교체 중")
+            return False
+        self._swap_callback = on_done or (lambda ok: None)
+        self.process.control_queue.put(('swap_model', model_path))
+        return True
+
+    def shutdown(self):
+        """추론 프로세스 종료 + 공유 메모리 해제 (앱 종료 시)"""
+        self.stop()
+        if self.process is not None:
+            self.process.stop()
+            self.process.join(timeout=5)
+            if self.process.is_alive():
+                log("[WARNING] inference process did not terminate properly")
+                self.process.terminate()
+
+        self._frames = self._states = self._results = None
+        for shm in (self.frame_shm, self.result_shm):
+            shm.close()
+            try:
+                shm.unlink()
+            except FileNotFoundError:
+                pass
+        log("InferenceProcessManager closed")
+
+    def put_frame(self, camera_id: int, frame: np.ndarray, offset: Tuple[int, int] = (0, 0),
+                  frame_id: int = -1, capture_time: Optional[float] = None, input_scale: float = 1.0):
+        """프레임을 비어있는 슬롯에 쓰고 슬롯 번호만 전달 (빈 슬롯이 없으면 드롭)"""
+        if camera_id >= self.num_cameras or not self.running:
+            return
+
+        if frame.nbytes > self.layout.slot_bytes:
+            if not self._oversize_logged:
+                log(f"프레임이 슬롯보다 큼: {frame.shape} ({self.layout.slot_bytes} bytes)")
+                self._oversize_logged = True
+            self.dropped_frames[camera_id] += 1
+            return
+
+        slot = self._find_free_slot(camera_id)
+        if slot is None:
+            self.dropped_frames[camera_id] += 1
+            return
+
+        self._frames[camera_id, slot, :frame.nbytes] = np.ascontiguousarray(frame).reshape(-1)
+        self._states[camera_id, slot] = SLOT_WRITTEN
+
+        t_submit = time.perf_counter()
+        submit_times = self._submit_times[camera_id]
+        submit_times[frame_id] = t_submit
+        if len(submit_times) > 4 * self.layout.frame_slots:
+            submit_times.pop(next(iter(submit_times)))
+
+        self.process.request_queue.put((
+            camera_id, slot, frame.shape, tuple(offset), frame_id,
+            capture_time if capture_time else t_submit, input_scale
+        ))
+
+    def _find_free_slot(self, camera_id: int) -> Optional[int]:
+        """링 순서대로 비어있는 프레임 슬롯 찾기"""
+        slots = self.layout.frame_slots
+        start = self._next_slot[camera_id]
+        for i in range(slots):
+            slot = (start + i) % slots
+            if self._states[camera_id, slot] == SLOT_FREE:
+                self._next_slot[camera_id] = (slot + 1) % slots
+                return slot
+        return None
+
+    def get_result(self, camera_id: int) -> Optional[DetectionBatch]:
+        """가장 최근 결과 슬롯 읽기 (카메라 스레드에서 호출)"""
+        if camera_id >= self.num_cameras or self.process is None:
+            return None
+
+        index = None
+        try:
+            while True:
+                index = self.process.result_queues[camera_id].get_nowait()
+        except queue.Empty:
+            pass
+        if index is None:
+            return None
+
+        detections = self._read_result_slot(camera_id, index)
+        if detections is None:
+            return None
+
+        t_submit = self._submit_times[camera_id].pop(detections.frame_id, None)
+        if t_submit is not None:
+            self.result_latency[camera_id].append((time.perf_counter() - t_submit) * 1000)
+        return detections
+
+    def _read_result_slot(self, camera_id: int, index: int, retries: int = 3) -> Optional[DetectionBatch]:
+        """
+        결과 슬롯 복사 (서브 프로세스가 그 사이에 같은 슬롯을 덮어쓰면 다시 읽음)
+
+        seq_end -> 데이터 -> seq_begin 순으로 읽고 두 값이 같을 때만 온전한 슬롯
+        """
+        ring = self._results[camera_id]
+        for _ in range(retries):
+            seq = int(ring['seq_end'][index])
+            count = min(int(ring['count'][index]), self.layout.max_det)
+            data = ring['detections'][index, :count].copy()
+            frame_id = int(ring['frame_id'][index])
+            capture_time = float(ring['capture_time'][index])
+            if int(ring['seq_begin'][index]) == seq:
+                return DetectionBatch(data, self.CLASS_NAMES, frame_id=frame_id, capture_time=capture_time)
+            self.torn_reads += 1
+        # 계속 덮어쓰는 중이면 이번엔 건너뜀 (다음 결과 슬롯 번호가 곧 도착)
+        return None
+
+    def get_camera_load(self, camera_id: int) -> Tuple[float, int]:
+        """(최근 평균 결과 지연 ms, 누적 드롭 수 - 빈 슬롯 부족 + 서브 프로세스 우편함 덮어쓰기)"""
+        if camera_id >= self.num_cameras:
+            return 0.0, 0
+        samples = list(self.result_latency[camera_id])
+        latency = sum(samples) / len(samples) if samples else 0.0
+        process_dropped = self._process_stats.get('dropped_frames', {}).get(camera_id, 0)
+        return latency, self.dropped_frames[camera_id] + process_dropped
+
+    def get_stats(self) -> Dict:
+        """
+        통계 정보 반환 (BatchAIManager.get_stats 와 같은 키 + 프로세스 항목)
+
+        배치/단계 지연/분류기 통계는 서브 프로세스가 1초마다 보낸 마지막 값,
+        dropped_frames 는 슬롯 부족 드롭 + 서브 프로세스 우편함 드롭, result_latency_ms 는 메인 프로세스 기준
+        """
+        stats = {
+            'total_inferences': 0,
+            'batch_count': 0,
+            'avg_batch_size': 0,
+            'batch_size': None,
+            'batch_launches': 0,
+            'failed_batches': 0,
+            'dropped_tile_sets': 0,
+            'stage_latency_ms': {},
+            'classifier': None,
+            'stage_queue_depth': {},
+            'truncated_detections': 0,
+        }
+        stats.update(self._process_stats)
+        process_dropped = stats.get('dropped_frames', {})
+        stats['dropped_frames'] = {
+            cam_id: count + process_dropped.get(cam_id, 0) for cam_id, count in self.dropped_frames.items()
+        }
+        stats['result_latency_ms'] = {
+            cam_id: self.get_camera_load(cam_id)[0] for cam_id in range(self.num_cameras)
+        }
+        stats['process_alive'] = self.process is not None and self.process.is_alive()
+        stats['torn_reads'] = self.torn_reads
+        return stats
@@ -1,10 +1,23 @@
 import os
+import threading
 import torch
 from ultralytics import YOLO
 from src.utils.logger import log
 
-def load_yolov11(model_path, half_precision=True):
+# 엔진 역직렬화 비용이 크기 때문에 경로별로 로드한 모델을 재사용
+# (UI 리로드 등으로 BatchAIManager 가 다시 만들어져도 엔진을 다시 읽지 않음)
+_MODEL_CACHE = {}
+_MODEL_CACHE_LOCK = threading.Lock()
+
+def load_yolov11(model_path, half_precision=True, use_cache=True):
     """YOLOv11 모델 로드 (GPU 우선)"""
+    cache_key = os.path.abspath(model_path)
+    if use_cache:
+        with _MODEL_CACHE_LOCK:
+            if cache_key in _MODEL_CACHE:
+                log(f"캐시된 모델 사용: {model_path}")
+                return _MODEL_CACHE[cache_key]
+
     try:
         # CUDA 사용 가능 여부 확인
         device = 'cuda' if torch.cuda.is_available() else 'cpu'
@@ -27,9 +40,22 @@ def load_yolov11(model_path, half_precision=True):
         
         log(f"YOLOv11 모델 로드 성공!")
         log(f"사용 장치: {device.upper()}")
+
+        if use_cache:
+            with _MODEL_CACHE_LOCK:
+                _MODEL_CACHE[cache_key] = (model, device)
         
         return model, device
         
     except Exception as e:
         log(f"모델 로드 실패: {e}")
         return None, None
+
+
+def clear_model_cache(model_path=None):
+    """모델 캐시 비우기 (경로 지정 시 해당 모델만)"""
+    with _MODEL_CACHE_LOCK:
+        if model_path is None:
+            _MODEL_CACHE.clear()
+        else:
+            _MODEL_CACHE.pop(os.path.abspath(model_path), None)
@@ -9,6 +9,7 @@ import sys
 
 from .tracking.detection_box import ConveyorBoxZone, ConveyorBoxManager
 from .model_load import load_yolov11
+from .detection_batch import DetectionBatch
 from .cam.basler_manager import BaslerCameraManager
 from src.utils.logger import log
 from src.utils.config_util import CAMERA_CONFIGS
@@ -178,7 +179,7 @@ class AIPlasticDetectionSystem:
         log(f"카메라 {self.camera_index}: {len(boxes)}개 박스 생성")
         return ConveyorBoxManager(boxes)
     
-    def detect(self, frame: np.ndarray) -> List[DetectedObject]:
+    def detect(self, frame: np.ndarray) -> DetectionBatch:
         """YOLOv11을 사용한 객체 감지 + 추적 (GPU 가속)"""
         try:
             # YOLOv11 추론 + 추적
@@ -208,74 +209,33 @@ class AIPlasticDetectionSystem:
             )
             
             
-            detected_objects = []
-            
-            # 결과 파싱
+            # 결과 파싱 (결과마다 벡터 연산 한 번으로 변환)
+            batches = []
             for result in results:
                 boxes = result.boxes
                 
                 if boxes is None or len(boxes) == 0:
                     continue
                 
-                # ID 확인 (tracking 실패 시 None일 수 있음)
-                if boxes.id is None:
-                    # log("⚠️ Tracking ID가 없습니다. predict 모드로 fallback")
-                    # Tracking 실패 시 기존 방식 사용
-                    xyxy = boxes.xyxy.cpu().numpy()
-                    conf = boxes.conf.cpu().numpy()
-                    cls = boxes.cls.cpu().numpy().astype(int)
-                    
-                    for idx, (box, confidence, class_id) in enumerate(zip(xyxy, conf, cls)):
-                        if class_id >= len(self.CLASS_NAMES):
-                            continue
-                        
-                        class_name = self.CLASS_NAMES[class_id]
-                        x1, y1, x2, y2 = map(int, box)
-                        center_x = (x1 + x2) // 2
-                        center_y = (y1 + y2) // 2
-                        
-                        detected_obj = DetectedObject(
-                            id=idx,
-                            class_name=class_name,
-                            center=(center_x, center_y),
-                            bbox=(x1, y1, x2, y2),
-                            confidence=float(confidence)
-                        )
-                        detected_objects.append(detected_obj)
-                    continue
-                
-                # 배치 처리 (tracking ID 포함)
-                xyxy = boxes.xyxy.cpu().numpy()
-                conf = boxes.conf.cpu().numpy()
-                cls = boxes.cls.cpu().numpy().astype(int)
-                track_ids = boxes.id.cpu().numpy().astype(int)  # ← 고유 추적 ID!
-                
-                for box, confidence, class_id, track_id in zip(xyxy, conf, cls, track_ids):
-                    if class_id >= len(self.CLASS_NAMES):
-                        continue
-                    
-                    class_name = self.CLASS_NAMES[class_id]
-                    x1, y1, x2, y2 = map(int, box)
-                    center_x = (x1 + x2) // 2
-                    center_y = (y1 + y2) // 2
-                    
-                    detected_obj = DetectedObject(
-                        id=int(track_id),  # ← 이제 고유한 추적 ID!
-                        class_name=class_name,
-                        center=(center_x, center_y),
-                        bbox=(x1, y1, x2, y2),
-                        confidence=float(confidence)
-                    )
-                    detected_objects.append(detected_obj)
+                # ID 확인 (tracking 실패 시 None일 수 있음 -> 검출 순서를 ID로 사용)
+                track_ids = boxes.id.cpu().numpy().astype(int) if boxes.id is not None else None
+                batches.append(DetectionBatch.from_arrays(
+                    xyxy=boxes.xyxy.cpu().numpy(),
+                    conf=boxes.conf.cpu().numpy(),
+                    class_ids=boxes.cls.cpu().numpy().astype(int),
+                    class_names=self.CLASS_NAMES,
+                    ids=track_ids
+                ))
             
+            detected_objects = DetectionBatch.concatenate(batches, self.CLASS_NAMES)
             return detected_objects
             
         except Exception as e:
             log(f"감지 오류: {e}")
-            return []
+            return DetectionBatch.empty(self.CLASS_NAMES)
     
     
-    def draw_detections(self, frame: np.ndarray, detected_objects: List[DetectedObject]) -> np.ndarray:
+    def draw_detections(self, frame: np.ndarray, detected_objects: DetectionBatch) -> np.ndarray:
         """감지 결과 그리기"""
         # class_colors = {
         #     'PET': (0, 165, 255),
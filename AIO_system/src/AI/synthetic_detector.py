@@ -0,0 +1,188 @@
+"""
+src/AI/synthetic_detector.py
+
+시나리오 기반 가상 검출기 (모델/GPU 없이 종단 부하 테스트용)
+- JSON 시나리오(벨트 속도로 들어오는 물체, 막힘, 몰림)를 물체 표로 펼쳐서 시각별 위치를 결정적으로 계산
+- 같은 시나리오 + 같은 프레임 번호 -> 항상 같은 검출
+- SyntheticFrameSource 는 같은 시나리오를 그린 프레임을 카메라 대신 공급
+
+시나리오 예 (src/AI/scenarios/belt_basic.json):
+    {
+        "seed": 0, "fps": 60, "duration": 60, "loop": true,
+        "frame": {"width": 500, "height": 1920},
+        "belt_speed_px_s": 1500, "flow": "down",
+        "class_names": ["Plastic"],
+        "events": [
+            {"type": "stream", "start": 0, "end": 60, "rate_per_min": 2000, "x_range": [40, 460]},
+            {"type": "burst", "t": 10, "count": 40, "spread_s": 0.5},
+            {"type": "jam", "start": 20, "end": 25, "x": 200, "y": 500, "size": [90, 90]}
+        ]
+    }
+
+이벤트 공통 옵션: camera (없으면 모든 카메라), size / size_range, cls, conf / conf_range
+"""
+import json
+import time
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+_COLUMNS = ('cam', 't0', 't1', 'x', 'y0', 'vy', 'w', 'h', 'cls', 'conf')
+
+
+class ScenarioPlayer:
+    """시나리오 물체 표 + 시각별 검출 계산"""
+
+    def __init__(self, scenario: Dict):
+        self.scenario = scenario
+        self.seed = int(scenario.get('seed', 0))
+        self.fps = float(scenario.get('fps', 60.0))
+        frame = scenario.get('frame', {})
+        self.width = int(frame.get('width', 500))
+        self.height = int(frame.get('height', 1920))
+        self.belt_speed = float(scenario.get('belt_speed_px_s', 600.0))
+        self.flow_down = scenario.get('flow', 'down') == 'down'
+        self.class_names = list(scenario.get('class_names', ['Plastic']))
+        self.miss_rate = float(scenario.get('miss_rate', 0.0))  # 프레임마다 검출을 놓칠 확률
+
+        self._rng = np.random.default_rng(self.seed)
+        rows = []
+        for event in scenario.get('events', []):
+            rows.extend(self._expand(event))
+        table = np.array(rows, dtype=np.float64).reshape(-1, len(_COLUMNS))
+        self.objects = {name: table[:, i] for i, name in enumerate(_COLUMNS)}
+
+        end = float(self.objects['t1'].max()) if len(table) else 0.0
+        self.duration = float(scenario.get('duration', end))
+        self.loop = bool(scenario.get('loop', False)) and self.duration > 0
+
+    @classmethod
+    def load(cls, path: str) -> "ScenarioPlayer":
+        """JSON 시나리오 파일 로드"""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def __len__(self) -> int:
+        return len(self.objects['t0'])
+
+    def _expand(self, event: Dict):
+        """이벤트 하나를 물체 행 목록으로 변환"""
+        kind = event.get('type', 'object')
+        if kind == 'stream':
+            start, end = float(event.get('start', 0.0)), float(event.get('end', self.scenario.get('duration', 60.0)))
+            count = int(round(float(event['rate_per_min']) * (end - start) / 60.0))
+            spawn = np.sort(self._rng.uniform(start, end, count))
+        elif kind == 'burst':
+            t = float(event['t'])
+            spawn = np.sort(self._rng.uniform(t, t + float(event.get('spread_s', 0.5)), int(event['count'])))
+        elif kind in ('object', 'jam'):
+            spawn = np.array([float(event.get('t', event.get('start', 0.0)))])
+        else:
+            raise ValueError(f"알 수 없는 시나리오 이벤트: {kind}")
+
+        count = len(spawn)
+        cam = float(event.get('camera', -1))
+        w, h = self._sample_pair(event, 'size', count, (80, 80))
+        conf = self._sample(event, 'conf', count, 0.9)
+        cls_name = event.get('cls', self.class_names[0])
+        cls = float(self.class_names.index(cls_name)) if cls_name in self.class_names else 0.0
+
+        if 'x' in event:
+            x = np.full(count, float(event['x']))
+        else:
+            x_lo, x_hi = event.get('x_range', (0, self.width))
+            x = self._rng.uniform(float(x_lo) + w / 2, np.maximum(float(x_hi) - w / 2, float(x_lo) + w / 2))
+
+        if kind == 'jam':
+            # 멈춰 있는 물체 (막힘)
+            end = float(event.get('end', spawn[0] + 5.0))
+            y0 = np.full(count, float(event.get('y', self.height / 2)))
+            vy = np.zeros(count)
+            t1 = np.full(count, end)
+        else:
+            speed = float(event.get('speed_px_s', self.belt_speed))
+            y0 = -h / 2 if self.flow_down else self.height + h / 2
+            vy = np.full(count, speed if self.flow_down else -speed)
+            t1 = spawn + (self.height + h) / max(speed, 1e-6)
+
+        return np.stack([np.full(count, cam), spawn, t1, x, y0, vy, w, h,
+                         np.full(count, cls), conf], axis=1).tolist()
+
+    def _sample(self, event: Dict, key: str, count: int, default: float) -> np.ndarray:
+        if f'{key}_range' in event:
+            lo, hi = event[f'{key}_range']
+            return self._rng.uniform(float(lo), float(hi), count)
+        return np.full(count, float(event.get(key, default)))
+
+    def _sample_pair(self, event: Dict, key: str, count: int,
+                     default: Tuple[float, float]) -> Tuple[np.ndarray, np.ndarray]:
+        if f'{key}_range' in event:
+            lo, hi = event[f'{key}_range']
+            return self._rng.uniform(float(lo), float(hi), count), self._rng.uniform(float(lo), float(hi), count)
+        w, h = event.get(key, default)
+        return np.full(count, float(w)), np.full(count, float(h))
+
+    def time_of(self, frame_id: int) -> float:
+        """프레임 번호 -> 시나리오 시각 (반복 재생이면 duration 으로 나눈 나머지)"""
+        t = frame_id / self.fps
+        return t % self.duration if self.loop else t
+
+    def detections(self, cam_id: int, t: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        시각 t 에 카메라 프레임(원본 좌표)에 보이는 물체
+
+        :return: (xyxy (N, 4), conf (N,), cls (N,))
+        """
+        obj = self.objects
+        alive = (obj['t0'] <= t) & (t < obj['t1']) & ((obj['cam'] < 0) | (obj['cam'] == cam_id))
+        if self.miss_rate > 0:
+            # 프레임마다 같은 결과가 나오도록 (seed, 카메라, 프레임) 으로 난수 고정
+            frame_rng = np.random.default_rng((self.seed, cam_id + 1, int(round(t * self.fps))))
+            alive &= frame_rng.random(len(alive)) >= self.miss_rate
+
+        idx = np.flatnonzero(alive)
+        cx = obj['x'][idx]
+        cy = obj['y0'][idx] + obj['vy'][idx] * (t - obj['t0'][idx])
+        half_w, half_h = obj['w'][idx] / 2, obj['h'][idx] / 2
+        xyxy = np.stack([cx - half_w, cy - half_h, cx + half_w, cy + half_h], axis=1).astype(np.float32)
+        return xyxy, obj['conf'][idx].astype(np.float32), obj['cls'][idx].astype(np.int64)
+
+
+class SyntheticFrameSource:
+    """
+    시나리오 물체를 그린 프레임 공급 (cv2.VideoCapture 와 같은 read/release)
+
+    fps 에 맞춰 대기하고, 프레임 번호가 카메라 스레드 frame_count 와 같게 증가함
+    """
+
+    BELT_COLOR = (60, 60, 60)
+    OBJECT_COLOR = (40, 180, 230)
+
+    def __init__(self, player: ScenarioPlayer, camera_index: int = 0, realtime: bool = True):
+        self.player = player
+        self.camera_index = camera_index
+        self.realtime = realtime
+        self.frame_id = 0
+        self._t_start: Optional[float] = None
+        self._background = np.empty((player.height, player.width, 3), dtype=np.uint8)
+        self._background[:] = self.BELT_COLOR
+
+    def read(self) -> Tuple[bool, np.ndarray]:
+        """다음 프레임 (BGR)"""
+        if self._t_start is None:
+            self._t_start = time.perf_counter()
+        self.frame_id += 1
+        if self.realtime:
+            delay = self._t_start + self.frame_id / self.player.fps - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+        frame = self._background.copy()
+        xyxy, _, _ = self.player.detections(self.camera_index, self.player.time_of(self.frame_id))
+        xyxy = np.clip(xyxy.round(), 0, [self.player.width, self.player.height] * 2).astype(np.int32)
+        for x1, y1, x2, y2 in xyxy:
+            frame[y1:y2, x1:x2] = self.OBJECT_COLOR
+        return True, frame
+
+    def release(self):
+        """VideoCapture 호환"""
@@ -1,7 +1,7 @@
 """
 src/AI/tracking/detection_box.py
 """
-from typing import Tuple, List, Dict
+from typing import Tuple, List, Dict, Optional
 from collections import defaultdict
 # from dataclasses import dataclass
 from datetime import datetime
@@ -10,6 +10,8 @@ import cv2
 import numpy as np
 
 from src.AI.AI_manager import DetectedObject
+from src.AI.detection_batch import DetectionBatch
+from src.AI.tracking.track_store import TrackStore
 
 class ConveyorBoxZone:
     """
@@ -54,11 +56,11 @@ class ConveyorBoxZone:
         x, y = center
         return self.x1 <= x <= self.x2 and self.y1 <= y <= self.y2
 
-    def update(self, obj: DetectedObject) -> bool:
-        """감지 박스 업데이트"""
+    def update(self, obj: DetectedObject, current_time: Optional[datetime] = None) -> bool:
+        """감지 박스 업데이트 (current_time 이 없으면 지금 시각)"""
         inside = self.is_inside(obj.center)
         is_target = obj.class_name in self.target_classes
-        current_time = datetime.now()
+        current_time = current_time or datetime.now()
 
         # Ver 2
         if inside and is_target:
@@ -124,6 +126,29 @@ class ConveyorBoxZone:
         self.is_active = len(self.tracked_objects) > 0
         return False
 
+    def update_batch(self, detections: DetectionBatch,
+                     current_time: Optional[datetime] = None) -> List[int]:
+        """
+        검출 묶음 중 박스 안에 있는 대상 클래스 객체만 골라서 update
+
+        박스 판정은 배열 연산으로 한 번에 처리하고, 박스 안 객체만 개별 처리
+
+        :return: 새로 진입한 객체 ID 목록
+        """
+        data = detections.data
+        mask = (data['cx'] >= self.x1) & (data['cx'] <= self.x2) \
+            & (data['cy'] >= self.y1) & (data['cy'] <= self.y2)
+        mask &= detections.class_mask(self.target_classes)
+
+        entered = []
+        for idx in np.flatnonzero(mask):
+            obj = detections[int(idx)]
+            if self.update(obj, current_time):
+                entered.append(obj.id)
+
+        self.is_active = len(self.tracked_objects) > 0
+        return entered
+
     def calculate_distance(self, pos1, pos2):
         """거리 계산"""
         return np.sqrt((pos1[0] - pos2[0]) ** 2 + (pos1[1] - pos2[1]) ** 2)
@@ -159,19 +184,34 @@ class ConveyorBoxZone:
 class ConveyorBoxManager:
     """여러 개의 감지 박스 관리"""
 
-    def __init__(self, boxes: List[ConveyorBoxZone]):
+    def __init__(self, boxes: List[ConveyorBoxZone], move_threshold: float = 8.0):
+        """
+        :param move_threshold: 트랙이 마지막 처리 위치에서 이만큼(px) 움직여야 박스 처리를 다시 함
+        """
         self.boxes = boxes
+        # 트랙 ID별 마지막 상태 (새/구역 변경/이동한 트랙만 박스에 전달)
+        self.track_store = TrackStore(
+            [(box.x1, box.y1, box.x2, box.y2) for box in boxes], move_threshold=move_threshold
+        )
 
-    def update_detections(self, detected_objects: List[DetectedObject]):
+    def update_detections(self, detected_objects: DetectionBatch,
+                          current_time: Optional[datetime] = None):
         """
         모든 박스에 대해 감지 업데이트
+
+        DetectedObject 목록이 들어오면 DetectionBatch 로 변환해서 처리
+
+        :param current_time: 구역 시간 기준 (트리거 모드면 벨트 위치로 환산한 시각), 없으면 지금 시각
         """
+        if not isinstance(detected_objects, DetectionBatch):
+            detected_objects = DetectionBatch.from_objects(detected_objects or [])
 
         # Ver 2
         # 조기 리턴하기 전에 누적 시간 업데이트
-        current_time = datetime.now()
+        current_time = current_time or datetime.now()
 
         if not detected_objects:
+            self.track_store.update(detected_objects)
             for box in self.boxes:
                 # 유예 시간 내의 객체들은 누적 시간 업데이트
                 for obj_id in box.tracked_objects:
@@ -184,26 +224,29 @@ class ConveyorBoxManager:
                 box.is_active = False
             return
 
-        current_ids = {obj.id for obj in detected_objects}
+        current_ids = detected_objects.ids
+        present = set(current_ids.tolist())
 
-        # 새로운 객체들 업데이트
-        for obj in detected_objects:
+        # 새로 나타났거나 구역/클래스가 바뀌었거나 충분히 움직인 트랙만 박스에서 처리
+        changed = self.track_store.update(detected_objects)
+        if changed.any():
+            changed_objects = detected_objects if changed.all() else detected_objects[changed]
             for box in self.boxes:
-                box.update(obj)
+                box.update_batch(changed_objects, current_time)
 
         # Ver 2
         # 각 박스에서 사라진 객체 처리
         for box in self.boxes:            
             # 유예 시간이 지난 객체만 제거
             expired_ids = set()
-            for obj_id in box.tracked_objects:
-                if obj_id not in current_ids:
-                    if obj_id in box.object_data:
-                        time_since_last_seen = (current_time - box.object_data[obj_id]['last_seen_time']).total_seconds()
-                        if time_since_last_seen > box.grace_period: # 유예 시간 지난 경우 제거
-                            expired_ids.add(obj_id)
-                    # else:
-                    #     expired_ids.add(obj_id)
+            tracked_ids = np.fromiter(box.tracked_objects, dtype=np.int64, count=len(box.tracked_objects))
+            for obj_id in tracked_ids[~np.isin(tracked_ids, current_ids)].tolist():
+                if obj_id in box.object_data:
+                    time_since_last_seen = (current_time - box.object_data[obj_id]['last_seen_time']).total_seconds()
+                    if time_since_last_seen > box.grace_period: # 유예 시간 지난 경우 제거
+                        expired_ids.add(obj_id)
+                # else:
+                #     expired_ids.add(obj_id)
 
             # 만료된 객체 제거
             for obj_id in expired_ids:
@@ -214,10 +257,12 @@ class ConveyorBoxManager:
             # 박스 상태 업데이트
             box.is_active = bool(box.tracked_objects)
 
-        # 현재 추적 중인 객체들의 누적 시간 업데이트
+        # 현재 추적 중인 객체들의 누적 시간 업데이트 (처리를 건너뛴 트랙도 마지막 본 시간 갱신)
         for box in self.boxes:
             for obj_id in box.tracked_objects:
                 if obj_id in box.object_data:
+                    if obj_id in present:
+                        box.object_data[obj_id]['last_seen_time'] = current_time
                     # 진입 시간부터 현재까지의 시간 계산 (누적 체류 시간)
                     stay_duration = (current_time - box.object_data[obj_id]['entry_time']).total_seconds()
                     box.object_data[obj_id]['accumulated_time'] = stay_duration
@@ -254,5 +299,6 @@ class ConveyorBoxManager:
 
     def reset_all(self):
         """모든 박스 리셋"""
+        self.track_store.reset()
         for box in self.boxes:
             box.reset()
@@ -0,0 +1,164 @@
+"""
+src/AI/tracking/track_store.py
+
+트랙 ID별 마지막 상태 저장소
+- 마지막으로 처리한 bbox, 클래스, 속도, 구역 소속(비트마스크)을 배열로 보관
+- 새 트랙 / 다시 나타난 트랙 / 구역이나 클래스가 바뀐 트랙 / move_threshold 이상 움직인 트랙만 골라냄
+- 구역 판정은 전체 검출 x 전체 구역을 배열 연산 한 번으로 처리
+"""
+import time
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.AI.detection_batch import DetectionBatch
+
+
+class TrackStore:
+    """트랙 상태 저장소 (ID 오름차순 정렬 배열)"""
+
+    def __init__(self, zones: Sequence[Tuple[int, int, int, int]],
+                 move_threshold: float = 8.0, ttl: float = 2.0):
+        """
+        :param zones: 구역 (x1, y1, x2, y2) 목록, 경계 포함 (최대 63개)
+        :param move_threshold: 마지막 처리 위치에서 이 거리(px) 이상 움직이면 다시 처리
+        :param ttl: 이 시간(초) 동안 보이지 않은 트랙은 제거
+        """
+        self.zones = np.asarray(zones, dtype=np.int32).reshape(-1, 4)
+        self.zone_bits = np.left_shift(np.int64(1), np.arange(len(self.zones), dtype=np.int64))
+        self.move_threshold = move_threshold
+        self.ttl = ttl
+
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.centers = np.zeros((0, 2), dtype=np.float32)    # 마지막 처리 위치
+        self.boxes = np.zeros((0, 4), dtype=np.int32)        # 마지막 처리 bbox
+        self.cls = np.zeros(0, dtype=np.int16)
+        self.velocity = np.zeros((0, 2), dtype=np.float32)   # px/s (처리 시점 사이 이동량 기준)
+        self.zone_mask = np.zeros(0, dtype=np.int64)
+        self.last_change = np.zeros(0, dtype=np.float64)
+        self.last_seen = np.zeros(0, dtype=np.float64)
+        self.seen_tick = np.zeros(0, dtype=np.int64)
+        self._tick = 0
+
+        # 통계
+        self.processed = 0
+        self.skipped = 0
+
+    def membership(self, det: DetectionBatch) -> np.ndarray:
+        """(N,) 검출별 구역 소속 비트마스크 (중심점 기준)"""
+        if not len(self.zones) or not det:
+            return np.zeros(len(det), dtype=np.int64)
+        cx = det.data['cx'][:, None]
+        cy = det.data['cy'][:, None]
+        inside = (cx >= self.zones[:, 0]) & (cx <= self.zones[:, 2]) \
+            & (cy >= self.zones[:, 1]) & (cy <= self.zones[:, 3])
+        return (inside * self.zone_bits).sum(axis=1)
+
+    def update(self, det: DetectionBatch, now: Optional[float] = None) -> np.ndarray:
+        """
+        현재 검출 반영
+
+        :return: (N,) 다시 처리해야 하는 행 마스크 (새/재등장/구역 변경/클래스 변경/이동)
+        """
+        now = time.perf_counter() if now is None else now
+        self._tick += 1
+        self._prune(now)
+        if not det:
+            return np.zeros(0, dtype=bool)
+
+        ids = det.ids.astype(np.int64)
+        centers = det.centers.astype(np.float32)
+        cls = det.data['cls']
+        zone_mask = self.membership(det)
+
+        # 저장된 트랙과 매칭 (정렬 배열 이진 탐색)
+        pos = np.searchsorted(self.ids, ids)
+        pos_clipped = np.minimum(pos, max(len(self.ids) - 1, 0))
+        found = (pos < len(self.ids)) & (ids >= 0)
+        if len(self.ids):
+            found &= self.ids[pos_clipped] == ids
+        else:
+            found[:] = False
+
+        changed = ~found
+        rows = np.flatnonzero(found)
+        if rows.size:
+            idx = pos_clipped[rows]
+            delta = centers[rows] - self.centers[idx]
+            moved = (delta ** 2).sum(axis=1) >= self.move_threshold ** 2
+            changed[rows] = moved \
+                | (self.seen_tick[idx] != self._tick - 1) \
+                | (self.cls[idx] != cls[rows]) \
+                | (self.zone_mask[idx] != zone_mask[rows])
+            self.last_seen[idx] = now
+            self.seen_tick[idx] = self._tick
+
+            # 바뀐 트랙만 기준 상태 갱신 (작은 이동이 누적되면 결국 move_threshold 를 넘음)
+            sub = rows[changed[rows]]
+            if sub.size:
+                idx = pos_clipped[sub]
+                dt = np.maximum(now - self.last_change[idx], 1e-6)[:, None]
+                self.velocity[idx] = (centers[sub] - self.centers[idx]) / dt
+                self.centers[idx] = centers[sub]
+                self.boxes[idx] = det.xyxy[sub]
+                self.cls[idx] = cls[sub]
+                self.zone_mask[idx] = zone_mask[sub]
+                self.last_change[idx] = now
+
+        new = np.flatnonzero(~found & (ids >= 0))
+        if new.size:
+            # 같은 ID가 한 결과에 두 번 나오면 첫 행만 저장
+            _, first = np.unique(ids[new], return_index=True)
+            new = new[first]
+            self._insert(ids[new], centers[new], det.xyxy[new], cls[new], zone_mask[new], now)
+
+        self.processed += int(changed.sum())
+        self.skipped += int(len(changed) - changed.sum())
+        return changed
+
+    def _insert(self, ids, centers, boxes, cls, zone_mask, now: float):
+        """새 트랙 추가 후 ID 순으로 재정렬"""
+        count = len(ids)
+        self.ids = np.concatenate([self.ids, ids])
+        self.centers = np.concatenate([self.centers, centers])
+        self.boxes = np.concatenate([self.boxes, boxes.astype(np.int32)])
+        self.cls = np.concatenate([self.cls, cls])
+        self.velocity = np.concatenate([self.velocity, np.zeros((count, 2), dtype=np.float32)])
+        self.zone_mask = np.concatenate([self.zone_mask, zone_mask])
+        self.last_change = np.concatenate([self.last_change, np.full(count, now)])
+        self.last_seen = np.concatenate([self.last_seen, np.full(count, now)])
+        self.seen_tick = np.concatenate([self.seen_tick, np.full(count, self._tick, dtype=np.int64)])
+        self._take(np.argsort(self.ids, kind='stable'))
+
+    def _prune(self, now: float):
+        """오래 보이지 않은 트랙 제거"""
+        if len(self.ids):
+            keep = now - self.last_seen <= self.ttl
+            if not keep.all():
+                self._take(np.flatnonzero(keep))
+
+    def _take(self, index: np.ndarray):
+        self.ids = self.ids[index]
+        self.centers = self.centers[index]
+        self.boxes = self.boxes[index]
+        self.cls = self.cls[index]
+        self.velocity = self.velocity[index]
+        self.zone_mask = self.zone_mask[index]
+        self.last_change = self.last_change[index]
+        self.last_seen = self.last_seen[index]
+        self.seen_tick = self.seen_tick[index]
+
+    def reset(self):
+        """전체 초기화"""
+        self._take(np.zeros(0, dtype=np.int64))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def get_stats(self) -> dict:
+        """통계"""
+        return {
+            'tracks': len(self.ids),
+            'processed': self.processed,
+            'skipped': self.skipped,
+        }
@@ -0,0 +1,187 @@
+"""
+src/AI/tracking/tracker.py
+
+카메라별 트래커
+- 검출(predict)과 분리해서 CPU에서 DetectionBatch 배열만 보고 ID를 부여
+- 카메라마다 인스턴스를 따로 만들어서 트래킹 상태가 섞이지 않도록 함
+"""
+from types import SimpleNamespace
+from typing import Dict
+
+import numpy as np
+
+from src.AI.detection_batch import DetectionBatch
+
+
+class BaseTracker:
+    """트래커 기본 클래스"""
+
+    def update(self, detections: DetectionBatch) -> DetectionBatch:
+        """
+        한 프레임의 검출 결과에 트래킹 ID 부여
+
+        :param detections: 검출 결과 (id는 무시됨)
+        :return: 트래킹 ID가 채워진 검출 결과
+        """
+        raise NotImplementedError
+
+    def reset(self):
+        """트래킹 상태 초기화"""
+        raise NotImplementedError
+
+
+class ByteTrackTracker(BaseTracker):
+    """ultralytics BYTETracker 래퍼 (model.track 과 동일한 알고리즘)"""
+
+    def __init__(self, tracker_config: str = "bytetrack.yaml", frame_rate: int = 30, **overrides):
+        # pylint: disable=import-outside-toplevel
+        from ultralytics.trackers.byte_tracker import BYTETracker
+        from ultralytics.utils import IterableSimpleNamespace, yaml_load
+        from ultralytics.utils.checks import check_yaml
+
+        cfg = yaml_load(check_yaml(tracker_config))
+        cfg.update(overrides)
+        self._args = IterableSimpleNamespace(**cfg)
+        self._frame_rate = frame_rate
+        self._tracker_cls = BYTETracker
+        self._tracker = BYTETracker(args=self._args, frame_rate=frame_rate)
+
+    def update(self, detections):
+        # ultralytics와 동일하게 검출이 없는 프레임은 트래커를 갱신하지 않음
+        if not detections:
+            return detections
+
+        xyxy = detections.xyxy.astype(np.float32)
+        xywh = np.empty_like(xyxy)
+        xywh[:, :2] = (xyxy[:, :2] + xyxy[:, 2:]) / 2
+        xywh[:, 2:] = xyxy[:, 2:] - xyxy[:, :2]
+
+        # BYTETracker.update 는 conf/xywh/cls 속성만 사용
+        dets = SimpleNamespace(
+            conf=detections.data['conf'].astype(np.float32),
+            xywh=xywh,
+            cls=detections.data['cls'].astype(np.float32),
+        )
+        tracks = self._tracker.update(dets)
+        if len(tracks) == 0:
+            return detections[np.zeros(0, dtype=np.int64)]
+
+        # track: [x1, y1, x2, y2, track_id, score, cls, idx]
+        tracked = detections[tracks[:, 7].astype(np.int64)]
+        tracked.set_boxes(tracks[:, :4])
+        tracked.data['id'] = tracks[:, 4]
+        return tracked
+
+    def reset(self):
+        self._tracker = self._tracker_cls(args=self._args, frame_rate=self._frame_rate)
+
+
+class _GreedyTracker(BaseTracker):
+    """이전 트랙과 현재 검출을 점수 순으로 1:1 매칭하는 단순 트래커"""
+
+    def __init__(self, max_age: int = 15):
+        self.max_age = max_age  # 매칭 없이 유지할 최대 프레임 수
+        self._next_id = 1
+        self._tracks: Dict[int, Dict] = {}  # track_id -> {'bbox', 'age'}
+
+    def _affinity(self, boxes: np.ndarray, prev_boxes: np.ndarray) -> np.ndarray:
+        """(N, M) 매칭 점수 (클수록 같은 객체), 매칭 불가면 -inf"""
+        raise NotImplementedError
+
+    def update(self, detections):
+        track_ids = list(self._tracks)
+        assigned = np.full(len(detections), -1, dtype=np.int64)
+
+        if len(detections) and track_ids:
+            boxes = detections.xyxy.astype(np.float32)
+            prev_boxes = np.array([self._tracks[t]['bbox'] for t in track_ids], dtype=np.float32)
+            score = self._affinity(boxes, prev_boxes)
+
+            used_tracks = set()
+            for flat_idx in np.argsort(-score, axis=None):
+                det_idx, trk_idx = divmod(int(flat_idx), len(track_ids))
+                if not np.isfinite(score[det_idx, trk_idx]):
+                    break
+                if assigned[det_idx] != -1 or trk_idx in used_tracks:
+                    continue
+                assigned[det_idx] = track_ids[trk_idx]
+                used_tracks.add(trk_idx)
+
+        # 매칭 안 된 트랙 노화
+        matched = set(assigned.tolist())
+        for track_id in track_ids:
+            if track_id not in matched:
+                self._tracks[track_id]['age'] += 1
+                if self._tracks[track_id]['age'] > self.max_age:
+                    del self._tracks[track_id]
+
+        # 새 트랙 ID 발급
+        new_mask = assigned == -1
+        num_new = int(new_mask.sum())
+        assigned[new_mask] = np.arange(self._next_id, self._next_id + num_new)
+        self._next_id += num_new
+
+        tracked = detections.copy()
+        tracked.data['id'] = assigned
+        for track_id, bbox in zip(assigned.tolist(), tracked.xyxy):
+            self._tracks[track_id] = {'bbox': bbox, 'age': 0}
+        return tracked
+
+    def reset(self):
+        self._tracks.clear()
+        self._next_id = 1
+
+
+class IoUTracker(_GreedyTracker):
+    """IoU 기반 트래커"""
+
+    def __init__(self, iou_threshold: float = 0.3, max_age: int = 15):
+        super().__init__(max_age=max_age)
+        self.iou_threshold = iou_threshold
+
+    def _affinity(self, boxes, prev_boxes):
+        ix1 = np.maximum(boxes[:, None, 0], prev_boxes[None, :, 0])
+        iy1 = np.maximum(boxes[:, None, 1], prev_boxes[None, :, 1])
+        ix2 = np.minimum(boxes[:, None, 2], prev_boxes[None, :, 2])
+        iy2 = np.minimum(boxes[:, None, 3], prev_boxes[None, :, 3])
+        inter = np.clip(ix2 - ix1, 0, None) * np.clip(iy2 - iy1, 0, None)
+
+        area = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+        prev_area = (prev_boxes[:, 2] - prev_boxes[:, 0]) * (prev_boxes[:, 3] - prev_boxes[:, 1])
+        iou = inter / np.maximum(area[:, None] + prev_area[None, :] - inter, 1e-6)
+
+        return np.where(iou >= self.iou_threshold, iou, -np.inf)
+
+
+class CentroidTracker(_GreedyTracker):
+    """중심점 거리 기반 트래커"""
+
+    def __init__(self, max_distance: float = 100.0, max_age: int = 15):
+        super().__init__(max_age=max_age)
+        self.max_distance = max_distance  # 같은 객체로 판단하는 최대 이동 거리 (픽셀)
+
+    def _affinity(self, boxes, prev_boxes):
+        centers = (boxes[:, :2] + boxes[:, 2:]) / 2
+        prev_centers = (prev_boxes[:, :2] + prev_boxes[:, 2:]) / 2
+        dist = np.linalg.norm(centers[:, None, :] - prev_centers[None, :, :], axis=2)
+
+        return np.where(dist <= self.max_distance, -dist, -np.inf)
+
+
+TRACKER_TYPES = {
+    'bytetrack': ByteTrackTracker,
+    'iou': IoUTracker,
+    'centroid': CentroidTracker,
+}
+
+
+def create_tracker(tracker_type: str = 'bytetrack', **kwargs) -> BaseTracker:
+    """
+    트래커 생성
+
+    :param tracker_type: 'bytetrack' | 'iou' | 'centroid'
+    :param kwargs: 트래커별 옵션
+    """
+    if tracker_type not in TRACKER_TYPES:
+        raise ValueError(f"지원하지 않는 트래커: {tracker_type}")
+    return TRACKER_TYPES[tracker_type](**kwargs)
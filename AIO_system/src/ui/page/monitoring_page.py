@@ -1,6 +1,8 @@
 """
 모니터링 페이지 - 카메라 스트림
 """
+import os
+import time
 import traceback
 import sys
 
@@ -11,15 +13,19 @@ from PySide6.QtWidgets import (
     QLabel, QPushButton, QScrollArea, QFrame, QComboBox,
     QLineEdit, QSizePolicy
 )
-from PySide6.QtCore import Qt, QTimer, QRegularExpression
+from PySide6.QtCore import Qt, QTimer, QRegularExpression, Signal
 from PySide6.QtGui import QPixmap, QImage, QRegularExpressionValidator
 
 # from src.AI.predict_AI import AIPlasticDetectionSystem
 # from src.AI.cam.camera_thread_old import CameraThread
 from src.AI.cam.camera_thread import CameraThread
+from src.AI.cam.device_registry import DeviceRegistry
 from src.AI.AI_manager import BatchAIManager
+from src.AI.inference_process import InferenceProcessManager
 from src.utils.logger import log
-from src.utils.config_util import CAMERA_CONFIGS, UI_PATH
+from src.utils.config_util import (
+    CAMERA_CONFIGS, UI_PATH, AI_PROCESS_CONFIG, AI_BACKEND_CONFIG, AI_MODEL_PATHS
+)
 
 
 class CameraView(QFrame):
@@ -39,6 +45,7 @@ class CameraView(QFrame):
 
         self.camera_thread = None
         self.is_running = False # 카메라 동작 상태
+        self._last_stats_update = 0.0
 
         self._init_ui()
 
@@ -151,6 +158,19 @@ class CameraView(QFrame):
         )
         info_layout.addWidget(self.fps_label)
 
+        # 캡처 쪽 / 추론 쪽 손실 구분 표시
+        self.drop_label = QLabel("")
+        self.drop_label.setStyleSheet(
+            """
+            color: #989898;
+            font-size: 12px;
+            font-weight: normal;
+            margin-left: 10px;
+            margin-bottom: 25px;
+            """
+        )
+        info_layout.addWidget(self.drop_label)
+
         info_layout.addStretch()
 
         self.resolution = QLabel("해상도: 1920x1080")
@@ -268,10 +288,27 @@ class CameraView(QFrame):
             if self.camera_thread:
                 fps = self.camera_thread.current_fps
                 self.fps_label.setText(f"FPS: {fps}")
+                now = time.monotonic()
+                if now - self._last_stats_update >= 1.0:
+                    self._last_stats_update = now
+                    self.update_drop_stats()
 
         except Exception as e:
             log(f"프레임 업데이트 오류: {e}")
 
+    def update_drop_stats(self):
+        """캡처 손실(전송/grab 실패) / 추론 손실(버린 프레임, 늦은 결과) / 수신 대역폭 표시"""
+        stats = self.camera_thread.get_stats()
+        inference_dropped = stats.get('stale_results', 0)
+        if self.ai_manager is not None:
+            inference_dropped += self.ai_manager.get_stats().get('dropped_frames', {}).get(self.camera_index, 0)
+
+        text = f"추론 손실: {inference_dropped}"
+        if 'capture_dropped' in stats:
+            text = (f"캡처 손실: {stats['capture_dropped']} (재전송 {stats.get('resent_packets', 0)}) | "
+                    f"{text} | {stats['bandwidth_mb_s']:.1f} MB/s")
+        self.drop_label.setText(text)
+
     def update_status(self, connected):
         """상태 업데이트"""
         if connected:
@@ -291,24 +328,36 @@ class CameraView(QFrame):
 
 class MonitoringPage(QWidget):
     """모니터링 페이지 - 카메라 스트림"""
+    model_ready = Signal(bool)
+
     def __init__(self, app):
         super().__init__()
         self.app = app
         self.rgb_cameras = []
         self.hyper_camera = None
-        self.ai_manager = BatchAIManager(
+        ai_kwargs = dict(
             num_cameras=2,
             confidence_threshold=0.6,
             img_size=640,
-            max_det=50
+            max_det=50,
+            tile_mode=False  # True: 세로 ROI를 640 타일로 나눠 원본 해상도로 추론 (작은 조각 검출용)
         )
-        # model_path = sys.path[0] + "\\src\\AI\\model\\weights\\best.pt"
-        model_path = sys.path[0] + "\\src\\AI\\model\\best.engine"
-        if not self.ai_manager.initialize(model_path):
-            log("AI 매니저 초기화 실패")
-            # 초기화 실패해도 UI는 표시
+        if AI_PROCESS_CONFIG['enabled']:
+            # 추론을 별도 프로세스에서 실행 (API 동일)
+            self.ai_manager = InferenceProcessManager(
+                frame_slots=AI_PROCESS_CONFIG['frame_slots'],
+                result_slots=AI_PROCESS_CONFIG['result_slots'],
+                **ai_kwargs
+            )
         else:
-            log("BatchAIManager 초기화 완료!")
+            self.ai_manager = BatchAIManager(**ai_kwargs)
+        # model_path = sys.path[0] + "\\src\\AI\\model\\weights\\best.pt"
+        # 추론 백엔드 종류에 맞는 모델 파일 (engine / onnx / openvino xml)
+        model_path = os.path.join(sys.path[0], AI_MODEL_PATHS[AI_BACKEND_CONFIG['type']])
+
+        # 엔진 로드 + 워밍업은 백그라운드에서 진행하고 UI는 바로 표시
+        self.model_ready.connect(self._on_model_ready)
+        self.ai_manager.initialize_async(model_path, on_ready=self.model_ready.emit)
 
         self._init_ui()
 
@@ -641,13 +690,23 @@ class MonitoringPage(QWidget):
 
         parent_layout.addLayout(hyper_layout)
 
+    def _on_model_ready(self, ok: bool):
+        """모델 로드 + 워밍업 완료 (UI 스레드)"""
+        if ok:
+            log("BatchAIManager 초기화 완료! 에어나이프 동작 가능")
+        else:
+            log("AI 매니저 초기화 실패")
+            # 초기화 실패해도 UI는 표시
+
     def on_start_all(self):
-        """전체 시작"""
+        """전체 시작 (카메라 스레드들이 동시에 연결/설정, 장치 검색은 한 번만)"""
         log("모든 카메라 시작")
         if self.ai_manager:
             self.ai_manager.start()
 
-        for camera in self.rgb_cameras:
+        pending = [camera for camera in self.rgb_cameras if not camera.is_running]
+        DeviceRegistry.get_instance().begin_startup(len(pending))
+        for camera in pending:
             camera.start_camera()
 
     def on_stop_all(self):
@@ -337,12 +337,48 @@ class ProcessCheckVars:
 CAMERA_CONFIGS = {
     0: {  # 카메라 1
         'camera_ip': '192.168.1.100',
+        # 'serial': '40123456',  # 지정하면 장치 목록 순서와 관계없이 이 시리얼 카메라를 사용
+        # 카메라별 트래커 (type: bytetrack | iou | centroid, 나머지는 트래커 옵션)
+        'tracker': {'type': 'bytetrack'},
         'roi':{
             'x': 500,
             'y': 0,
             'width': 500,
             'height': 1920
         },
+        # 박스 구역만 잘라서 추론 (구역 합집합 + 여유 / 상류 방향 접근 여유)
+        # flow: 벨트 진행 방향 (down: y 증가, up: y 감소)
+        'zone_crop': {
+            'enabled': False,
+            'margin': 20,
+            'upstream_margin': 300,
+            'flow': 'down'
+        },
+        # 구역에 움직임/물체가 없으면 추론 생략 (mode: background | diff)
+        # (게이트가 닫혀도 변화가 멈춘 뒤 hold_frames 동안 추론한 결과는 유지 -> 구역에 멈춘 물체 유지, hold_frames >= 1)
+        'motion_gate': {
+            'enabled': False,
+            'mode': 'background',
+            'downscale': 8,
+            'threshold': 15,
+            'min_ratio': 0.003,
+            'hold_frames': 5
+        },
+        # 촬영 후 max_result_age_ms 지난 결과는 버림, belt_speed_px_s > 0 이면 벨트 이동량만큼 위치 보정
+        'timing': {
+            'max_result_age_ms': 200,
+            'belt_speed_px_s': 0.0
+        },
+        # 하드웨어 트리거 (엔코더/라인 트리거 펄스마다 촬영 -> 프레임마다 벨트 이동량이 일정)
+        # px_per_trigger: 트리거 한 번당 벨트 이동량 (px), 결과 위치 보정과 구역 시간 판정을 벨트 위치 기준으로 계산
+        # (구역 시간은 벨트 위치 / belt_speed_px_s 로 환산한 초, 벨트가 멈추면 시간도 멈춤)
+        'trigger': {
+            'enabled': False,
+            'source': 'Line1',
+            'activation': 'RisingEdge',
+            'exposure_us': 1000,
+            'px_per_trigger': 8.0
+        },
         'boxes': [
             {
                 'box_id': 1,
@@ -352,6 +388,8 @@ CAMERA_CONFIGS = {
                 'height': 400,
                 # 'target_classes': ['PP', 'PET', 'PE', 'BOTTLE_PET'],
                 'target_classes': ['PE'],
+                # 구역별 최소 신뢰도 (선택, 숫자 또는 {'PET': 0.7, ...}), 없으면 클래스/전역 기준
+                # 'min_confidence': 0.5,
                 'airknife_id': 1
             },
             # {
@@ -367,12 +405,41 @@ CAMERA_CONFIGS = {
     },
     1: {  # 카메라 2
         'camera_ip': '192.168.1.101',
+        'tracker': {'type': 'bytetrack'},
         'roi':{
             'x': 500,
             'y': 0,
             'width': 500,
             'height': 1080
         },
+        'zone_crop': {
+            'enabled': False,
+            'margin': 20,
+            'upstream_margin': 300,
+            'flow': 'down'
+        },
+        'motion_gate': {
+            'enabled': False,
+            'mode': 'background',
+            'downscale': 8,
+            'threshold': 15,
+            'min_ratio': 0.003,
+            'hold_frames': 5
+        },
+        'timing': {
+            'max_result_age_ms': 200,
+            'belt_speed_px_s': 0.0
+        },
+        # 하드웨어 트리거 (엔코더/라인 트리거 펄스마다 촬영 -> 프레임마다 벨트 이동량이 일정)
+        # px_per_trigger: 트리거 한 번당 벨트 이동량 (px), 결과 위치 보정과 구역 시간 판정을 벨트 위치 기준으로 계산
+        # (구역 시간은 벨트 위치 / belt_speed_px_s 로 환산한 초, 벨트가 멈추면 시간도 멈춤)
+        'trigger': {
+            'enabled': False,
+            'source': 'Line1',
+            'activation': 'RisingEdge',
+            'exposure_us': 1000,
+            'px_per_trigger': 8.0
+        },
         'boxes': [
             {
                 'box_id': 2,
@@ -398,6 +465,117 @@ CAMERA_CONFIGS = {
     }
 }
 
+# 추론 백엔드
+# - type: ultralytics (.pt/.engine, GPU 우선) | onnxruntime (.onnx, CPU) | openvino (.xml/.onnx, CPU)
+#         | synthetic (시나리오 JSON 가상 검출기, 카메라가 없으면 시나리오 프레임으로 대체)
+# - precision: fp32 | fp16 | int8 (CPU 백엔드, best_int8.onnx 처럼 접미사 붙은 파일이 있으면 사용)
+# - num_threads: CPU 추론 스레드 수 (0: 런타임 기본값)
+AI_BACKEND_CONFIG = {
+    'type': 'ultralytics',
+    'precision': 'fp32',
+    'num_threads': 0,
+}
+# 검출 후처리 필터 (모델은 가장 낮은 기준으로 한 번만 추론하고 후처리에서 걸러냄)
+# - class_conf: 클래스별 최소 신뢰도 (없는 클래스는 confidence_threshold)
+# - 구역별 기준은 CAMERA_CONFIGS boxes 의 'min_confidence' (구역 안 검출은 클래스 기준 대신 적용)
+# - class_aware_nms: True 면 다른 클래스끼리는 억제하지 않는 클래스별 NMS
+AI_DETECTION_FILTER_CONFIG = {
+    'class_conf': {},
+    'class_aware_nms': False,
+    'nms_iou': 0.5,
+}
+# 검출 크롭 2단계 재질 분류기 (단일 'Plastic' 검출 -> 재질, 트랙 ID별 한 번만 분류)
+# - type: ultralytics (.pt/.engine 분류 모델) | onnxruntime (.onnx)
+# - class_names: 모델 메타데이터에 이름이 없을 때 사용
+# - max_crops: 한 프레임에 분류하는 최대 크롭 수 (추가 지연 상한), 나머지는 다음 프레임에 분류
+AI_CLASSIFIER_CONFIG = {
+    'enabled': False,
+    'type': 'ultralytics',
+    'model_path': 'src/AI/model/material_cls.engine',
+    'class_names': ['PET', 'PE', 'PP', 'PS'],
+    'crop_size': 96,
+    'max_crops': 16,
+    'pad_ratio': 0.1,
+    'min_confidence': 0.5,
+    'max_attempts': 3,
+    'multi_label': False,
+    'label_threshold': 0.5,
+    'cache_ttl': 2.0,
+}
+# 백엔드별 모델 파일 (AIO_system 기준 상대 경로)
+AI_MODEL_PATHS = {
+    'ultralytics': 'src/AI/model/best.engine',
+    'onnxruntime': 'src/AI/model/best.onnx',
+    'openvino': 'src/AI/model/best_openvino_model/best.xml',
+    'synthetic': 'src/AI/scenarios/belt_basic.json',
+}
+
+# 추론 프로세스 분리 (GUI/캡처 스레드와 GIL 경합 제거, 프레임/결과는 공유 메모리 링으로 전달)
+AI_PROCESS_CONFIG = {
+    'enabled': False,
+    'frame_slots': 4,    # 카메라별 프레임 슬롯 수
+    'result_slots': 4,   # 카메라별 결과 슬롯 수
+}
+AI_FRAME_SHM_NAME = "AI_FRAME_SHM"
+AI_RESULT_SHM_NAME = "AI_RESULT_SHM"
+
+# 적응형 추론 간격 (카메라별 결과 지연/입력 우편함 드롭 기준)
+# - adaptive: False 면 고정 간격 (매 프레임 추론)
+# - 프레임은 버리지 않고 우편함에서 최신 프레임으로 덮어씀 (덮어쓴 수 = 드롭)
+INFERENCE_SCHEDULE = {
+    'adaptive': False,
+    'latency_budget_ms': 80,  # 에어나이프 판단 시점 검출 결과 최대 지연
+    'min_interval': 1,
+    'max_interval': 4,
+    'max_drops': 0,           # 조정 주기(0.5초) 동안 드롭이 이보다 많으면 간격을 늘림
+}
+
+# 캡처 픽셀 경로
+# - bayer_mode: True 면 RGB 변환 없이 Bayer RAW 를 링 버퍼로 받고
+#   추론에는 절반 해상도 디베이어, 화면에는 OpenCV 디베이어를 각각 필요할 때만 수행
+# - pool_size: RAW / 추론용 / 이벤트 모드 RGB 링 버퍼 최소 수 (추론 파이프라인 깊이 + 카메라 쪽 참조 수보다 작으면 자동으로 늘림)
+# - grab_mode: poll (RetrieveResult 100ms 타임아웃 반복) | event (pylon 이벤트 핸들러가 링 버퍼에 쓰고 처리 스레드를 깨움)
+CAMERA_CAPTURE_CONFIG = {
+    'grab_mode': 'poll',
+    'bayer_mode': False,
+    'pixel_format': 'BayerBG8',
+    'pool_size': 6,
+    'preview_pool_size': 3,
+}
+
+# 카메라 시리얼별 촬영 프로파일 ('default' 위에 시리얼 항목을 덮어씀)
+# - pixel_format: None 이면 CAMERA_CAPTURE_CONFIG 의 pixel_format
+# - binning / decimation: [가로, 세로], 센서에서 픽셀을 줄여 전송량 감소
+#   (박스/구역 좌표는 비닝/데시메이션 후 출력 이미지 기준)
+# - roi: None 이면 CAMERA_CONFIGS 의 roi (센서 픽셀 기준), 그것도 없으면 fallback_size
+# - exposure_us: None 이면 1 / fps, gain: None 이면 GainAuto Off 만 하고 값은 유지
+# - packet_size / inter_packet_delay: GigE 패킷 크기(byte) / 패킷 간 지연(tick), 링크별 대역폭 분배
+#   (None: 건드리지 않음 - pylon Viewer / 카메라 저장값 유지, 필요한 카메라만 시리얼 항목에서 지정)
+#   (점보 프레임: NIC MTU 9000 + packet_size 8192, 한 NIC 에 카메라 2대면 frame_transmission_delay 로 전송 시점 분산)
+# - frame_transmission_delay: 프레임 전송 시작 지연(tick), socket_buffer_kb: 호스트 수신 소켓 버퍼 (None: 드라이버 기본값)
+# - max_num_buffer: 드라이버 grab 버퍼 수
+CAMERA_ACQUISITION_PROFILES = {
+    'default': {
+        'pixel_format': None,
+        'binning': [1, 1],
+        'decimation': [1, 1],
+        'roi': None,
+        'fallback_size': [1280, 720],
+        'fps': 60.0,
+        'exposure_us': None,
+        'gain': None,
+        'packet_size': None,
+        'inter_packet_delay': None,
+        'frame_transmission_delay': None,
+        'socket_buffer_kb': None,
+        'max_num_buffer': 3,
+    },
+    # '40123456': {'packet_size': 8192, 'inter_packet_delay': 1000, 'socket_buffer_kb': 2048},
+    # '40123457': {'packet_size': 8192, 'inter_packet_delay': 1000, 'frame_transmission_delay': 8000},
+}
+# 적용된 프로파일을 카메라에서 다시 읽어 <시리얼>.json 으로 저장할 폴더 (None 이면 로그만)
+CAMERA_PROFILE_DUMP_DIR = None
+
 
 
 # ============================================================
@@ -0,0 +1,87 @@
+"""
+pytest 설정
+
+- AIO_system 을 import 경로에 추가 (src.* 모듈)
+- ethercat_test.py / serial_test.py 는 장비가 연결되어 있어야 하는 수동 실행 스크립트라 수집하지 않음
+- synthetic_manager: 가상 검출기(시나리오) 백엔드로 초기화한 BatchAIManager (cv2/torch/PySide6 없으면 건너뜀)
+"""
+import json
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+collect_ignore = ['ethercat_test.py', 'serial_test.py']
+
+# 모든 카메라에 (200, 500) 위치 90x90 물체 하나가 멈춰 있는 시나리오
+JAM_SCENARIO = {
+    'seed': 0, 'fps': 60, 'duration': 10, 'loop': True,
+    'frame': {'width': 500, 'height': 1920},
+    'class_names': ['Plastic'],
+    'events': [
+        {'type': 'jam', 'start': 0, 'end': 10, 'x': 200, 'y': 500, 'size': [90, 90], 'conf': 0.9},
+    ],
+}
+
+
+@pytest.fixture
+def write_scenario(tmp_path):
+    """시나리오 dict -> JSON 파일 경로"""
+    def _write(scenario=None, name='scenario.json'):
+        path = tmp_path / name
+        path.write_text(json.dumps(scenario or JAM_SCENARIO), encoding='utf-8')
+        return str(path)
+    return _write
+
+
+@pytest.fixture
+def synthetic_manager(write_scenario, monkeypatch):
+    """
+    가상 검출기 BatchAIManager 생성 함수 (테스트 끝나면 중지)
+
+    카메라 설정(CAMERA_CONFIGS)의 트래커/구역/ROI 대신 기본값을 써서 ultralytics 없이 동작
+    """
+    pytest.importorskip('cv2')
+    pytest.importorskip('torch')
+    pytest.importorskip('PySide6')
+    from src.AI import AI_manager
+
+    monkeypatch.setattr(AI_manager, 'CAMERA_CONFIGS', {})
+    managers = []
+
+    def _create(scenario=None, initialize=True, **kwargs):
+        options = dict(
+            num_cameras=2, img_size=640, tracker_type='iou', warmup_iterations=1,
+            backend_config={'type': 'synthetic'},
+            filter_config={'class_conf': {}, 'class_aware_nms': False, 'nms_iou': 0.5},
+            classifier_config={'enabled': False},
+        )
+        options.update(kwargs)
+        manager = AI_manager.BatchAIManager(**options)
+        managers.append(manager)
+        if initialize:
+            assert manager.initialize(write_scenario(scenario))
+        return manager
+
+    yield _create
+    for manager in managers:
+        manager.stop()
+
+
+def wait_results(manager, cam_ids, timeout: float = 2.0, frame_id: int = None) -> dict:
+    """카메라별 결과가 모두 나올 때까지 대기 (frame_id 를 주면 그 프레임 결과까지)"""
+    results = {}
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        for cam_id in cam_ids:
+            result = manager.get_result(cam_id)
+            if result is not None:
+                results[cam_id] = result
+        if all(cam_id in results and (frame_id is None or results[cam_id].frame_id == frame_id)
+               for cam_id in cam_ids):
+            break
+        time.sleep(0.001)
+    return results
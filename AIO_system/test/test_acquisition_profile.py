@@ -0,0 +1,107 @@
+"""카메라 촬영 프로파일 (시리얼별 병합 + 노드 범위/증분 보정)"""
+import pytest
+
+pytest.importorskip('PySide6')
+pylon = pytest.importorskip('pypylon.pylon')
+from src.AI.cam import acquisition_profile  # noqa: E402
+from src.AI.cam.acquisition_profile import (  # noqa: E402
+    apply_binning, apply_roi, apply_transport, resolve_profile, set_enum, set_float, set_int
+)
+
+
+@pytest.fixture
+def camera(monkeypatch):
+    """pylon 카메라 에뮬레이터 (장치 없이 실제 GenICam 노드 범위로 동작)"""
+    monkeypatch.setenv('PYLON_CAMEMU', '1')
+    info = pylon.DeviceInfo()
+    info.SetDeviceClass('BaslerCamEmu')
+    try:
+        cam = pylon.InstantCamera(pylon.TlFactory.GetInstance().CreateFirstDevice(info))
+        cam.Open()
+    except Exception as e:  # pylint: disable=broad-except
+        pytest.skip(f"카메라 에뮬레이터 없음: {e}")
+    yield cam
+    cam.Close()
+
+
+def test_resolve_profile_merges_serial_over_default():
+    profiles = {
+        'default': {'fps': 60.0, 'binning': [1, 1], 'roi': None, 'packet_size': None},
+        '4001': {'fps': 30.0, 'packet_size': 8192, 'typo_key': 1},
+    }
+    roi = {'x': 0, 'y': 0, 'width': 500, 'height': 1920}
+    profile = resolve_profile('4001', roi=roi, profiles=profiles)
+    assert profile == {'fps': 30.0, 'binning': [1, 1], 'roi': roi, 'packet_size': 8192}
+    assert resolve_profile('9999', profiles=profiles)['fps'] == 60.0
+
+
+def test_default_profile_leaves_transport_untouched(camera):
+    camera.GevSCPSPacketSize.SetValue(9000)
+    camera.GevSCPD.SetValue(1234)
+    apply_transport(camera, resolve_profile('not-configured'))
+    assert camera.GevSCPSPacketSize.GetValue() == 9000
+    assert camera.GevSCPD.GetValue() == 1234
+
+    apply_transport(camera, {'packet_size': 1500, 'inter_packet_delay': 0})
+    assert camera.GevSCPSPacketSize.GetValue() == 1500
+    assert camera.GevSCPD.GetValue() == 0
+
+
+def test_set_int_clamps_to_range(camera):
+    assert set_int(camera, 'Width', 100000) == camera.Width.GetMax()
+    assert set_int(camera, 'GevSCPSPacketSize', 10) == camera.GevSCPSPacketSize.GetMin()
+    assert set_int(camera, 'NoSuchNode', 1) is None
+
+
+def test_set_int_aligns_to_increment(monkeypatch):
+    class _Node:
+        value = None
+
+        def GetMin(self):
+            return 16
+
+        def GetMax(self):
+            return 4000
+
+        def GetInc(self):
+            return 32
+
+        def SetValue(self, value):
+            self.value = value
+
+    class _Camera:
+        Width = _Node()
+
+    monkeypatch.setattr(acquisition_profile, '_writable', lambda cam, name: hasattr(cam, name))
+    camera = _Camera()
+    # 최소값 기준 증분에 맞춰 내림
+    assert set_int(camera, 'Width', 1000) == 16 + 30 * 32
+    assert camera.Width.value == 976
+    assert set_int(camera, 'Width', 5000) == 16 + 124 * 32
+
+
+def test_set_float_and_enum(camera):
+    node = camera.ExposureTimeAbs
+    assert set_float(camera, 'ExposureTimeAbs', 1e12) == node.GetMax()
+    before = camera.PixelFormat.GetValue()
+    assert set_enum(camera, 'PixelFormat', 'NotAFormat') is None
+    assert camera.PixelFormat.GetValue() == before
+    assert set_enum(camera, 'PixelFormat', 'BayerBG8') == 'BayerBG8'
+
+
+def test_apply_roi_scales_and_clamps_offsets(camera):
+    scale = apply_binning(camera, [2, 2], [1, 1])
+    assert scale == 2
+    roi = apply_roi(camera, {'x': 100, 'y': 50, 'width': 800, 'height': 600}, scale=scale)
+    assert roi == {'x': 50, 'y': 25, 'width': 400, 'height': 300}
+
+    apply_binning(camera, 1, 1)
+    # 폭을 먼저 정한 뒤 오프셋 최대값(센서 폭 - 폭)으로 보정
+    roi = apply_roi(camera, {'x': 4000, 'y': 0, 'width': 1000, 'height': 100})
+    assert roi['width'] == 1000
+    assert roi['x'] == camera.OffsetX.GetMax() == camera.WidthMax.GetValue() - 1000
+
+
+def test_apply_roi_fallback_size(camera):
+    roi = apply_roi(camera, None, fallback_size=(640, 480))
+    assert roi == {'x': 0, 'y': 0, 'width': 640, 'height': 480}
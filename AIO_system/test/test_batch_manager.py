@@ -0,0 +1,70 @@
+"""BatchAIManager 다중 카메라 배치 추론"""
+import time
+
+import numpy as np
+import pytest
+
+from conftest import wait_results
+
+FRAME = np.zeros((1920, 500, 3), dtype=np.uint8)
+JAM_BOX = [155, 455, 245, 545]
+
+
+def _put_all(manager, frame_id):
+    for cam_id in range(manager.num_cameras):
+        manager.put_frame(cam_id, FRAME, frame_id=frame_id)
+
+
+def test_cameras_share_one_batch(synthetic_manager):
+    manager = synthetic_manager()
+    assert manager.dynamic_batch
+    assert manager.batch_size == 2
+    manager.start()
+
+    _put_all(manager, 1)
+    results = wait_results(manager, [0, 1], frame_id=1)
+
+    assert set(results) == {0, 1}
+    stats = manager.get_stats()
+    assert stats['batch_launches'] == 1
+    assert stats['avg_batch_size'] == 2
+    for result in results.values():
+        # letterbox 축소/복원 반올림 오차 안에서 원본 좌표로 돌아옴
+        np.testing.assert_allclose(result.xyxy[0], JAM_BOX, atol=4)
+
+
+def test_batch_size_one_runs_cameras_in_turn(synthetic_manager):
+    manager = synthetic_manager(batch_size=1)
+    assert not manager.dynamic_batch
+    manager.start()
+
+    _put_all(manager, 1)
+    results = wait_results(manager, [0, 1], frame_id=1)
+
+    assert set(results) == {0, 1}
+    assert manager.get_stats()['batch_launches'] == 2
+
+
+def test_results_keep_frame_id_and_capture_time(synthetic_manager):
+    manager = synthetic_manager(num_cameras=1)
+    manager.start()
+
+    capture_time = time.perf_counter() - 0.05
+    manager.put_frame(0, FRAME, frame_id=7, capture_time=capture_time)
+    result = wait_results(manager, [0], frame_id=7)[0]
+
+    assert result.frame_id == 7
+    assert result.capture_time == capture_time
+    assert result.age() >= 0.05
+
+
+def test_capture_time_defaults_to_submit_time(synthetic_manager):
+    manager = synthetic_manager(num_cameras=1)
+    manager.start()
+
+    t_before = time.perf_counter()
+    manager.put_frame(0, FRAME, frame_id=3)
+    result = wait_results(manager, [0], frame_id=3)[0]
+
+    assert result.capture_time >= t_before
+    assert result.age(now=result.capture_time + 0.5) == pytest.approx(0.5)
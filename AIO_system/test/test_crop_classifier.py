@@ -0,0 +1,105 @@
+"""재질 분류기 트랙 ID별 캐시"""
+import numpy as np
+import pytest
+
+pytest.importorskip('cv2')
+pytest.importorskip('PySide6')
+from src.AI.crop_classifier import CropClassifier  # noqa: E402
+from src.AI.detection_batch import DetectionBatch  # noqa: E402
+
+FRAME = np.zeros((200, 200, 3), dtype=np.uint8)
+
+
+class _ScriptedClassifier(CropClassifier):
+    """모델 대신 정해진 점수를 돌려주는 분류기 (호출마다 받은 크롭 수 기록)"""
+
+    def __init__(self, scores, **kwargs):
+        kwargs.setdefault('class_names', ['PET', 'PE'])
+        super().__init__('scripted', ['Plastic'], **kwargs)
+        self.scores = np.asarray(scores, dtype=np.float32)
+        self.batches = []
+
+    def _load_ultralytics(self):
+        pass
+
+    def _classify(self, crops):
+        self.batches.append(len(crops))
+        return np.tile(self.scores, (len(crops), 1))
+
+
+def _det(ids, conf=None):
+    n = len(ids)
+    xyxy = np.array([[10 + 40 * i, 10, 40 + 40 * i, 40] for i in range(n)], dtype=np.float32).reshape(-1, 4)
+    conf = np.full(n, 0.9) if conf is None else np.asarray(conf)
+    return DetectionBatch.from_arrays(xyxy, conf, np.zeros(n), ['Plastic'], ids=np.asarray(ids))
+
+
+def _load(classifier):
+    assert classifier.load()
+    classifier.batches.clear()  # 로드 워밍업 호출 제외
+    return classifier
+
+
+def test_output_classes_extend_detector_classes():
+    classifier = _load(_ScriptedClassifier([0.1, 0.9]))
+    assert classifier.output_class_names == ['Plastic', 'PET', 'PE']
+    result = classifier.update(0, _det([1]), FRAME)
+    assert [det.class_name for det in result] == ['PE']
+
+
+def test_confident_track_is_classified_once():
+    classifier = _load(_ScriptedClassifier([0.9, 0.1]))
+    classifier.update(0, _det([1, 2]), FRAME)
+    classifier.update(0, _det([1, 2]), FRAME)
+    classifier.update(0, _det([1, 2, 3]), FRAME)
+
+    # 새 트랙(3)만 다시 분류
+    assert classifier.batches == [2, 1]
+    stats = classifier.get_stats()
+    assert stats['cache_hits'] == 4
+    assert stats['cached_tracks'] == 3
+    assert classifier.get_labels(0, 1).material == 0
+
+
+def test_cache_is_per_camera():
+    classifier = _load(_ScriptedClassifier([0.9, 0.1]))
+    classifier.update(0, _det([1]), FRAME)
+    classifier.update(1, _det([1]), FRAME)
+    assert classifier.batches == [1, 1]
+
+
+def test_low_confidence_retried_until_max_attempts():
+    classifier = _load(_ScriptedClassifier([0.45, 0.55], min_confidence=0.6, max_attempts=3))
+    for _ in range(5):
+        result = classifier.update(0, _det([1]), FRAME)
+    assert classifier.batches == [1, 1, 1]
+    assert classifier.get_labels(0, 1).attempts == 3
+    # 기준 미만이면 재질을 확정하지 않고 검출 클래스 유지
+    assert [det.class_name for det in result] == ['Plastic']
+
+
+def test_max_crops_limits_batch_by_confidence():
+    classifier = _load(_ScriptedClassifier([0.9, 0.1], max_crops=2))
+    classifier.update(0, _det([1, 2, 3], conf=[0.5, 0.9, 0.7]), FRAME)
+    assert classifier.batches == [2]
+    assert classifier.get_labels(0, 1) is None
+    assert classifier.get_labels(0, 2) is not None and classifier.get_labels(0, 3) is not None
+
+    classifier.update(0, _det([1, 2, 3], conf=[0.5, 0.9, 0.7]), FRAME)
+    assert classifier.batches == [2, 1]
+
+
+def test_untracked_detections_are_not_cached():
+    classifier = _load(_ScriptedClassifier([0.9, 0.1]))
+    classifier.update(0, _det([-1]), FRAME)
+    result = classifier.update(0, _det([-1]), FRAME)
+    assert classifier.batches == [1, 1]
+    assert classifier.get_stats()['cached_tracks'] == 0
+    assert [det.class_name for det in result] == ['PET']
+
+
+def test_unseen_tracks_expire():
+    classifier = _load(_ScriptedClassifier([0.9, 0.1], cache_ttl=0.0))
+    classifier.update(0, _det([1]), FRAME)
+    classifier.update(0, _det([]), FRAME)
+    assert classifier.get_labels(0, 1) is None
@@ -0,0 +1,54 @@
+"""검출 결과 묶음 (구조화 배열)"""
+import numpy as np
+
+from src.AI.detection_batch import DETECTION_DTYPE, DetectionBatch
+
+
+def _batch(xyxy, conf, cls, names=('PET', 'PE')):
+    return DetectionBatch.from_arrays(
+        np.array(xyxy, dtype=np.float32), np.array(conf, dtype=np.float32),
+        np.array(cls), list(names)
+    )
+
+
+def test_from_arrays_drops_unknown_classes():
+    batch = _batch([[0, 0, 10, 20], [10, 10, 30, 30], [0, 0, 5, 5]], [0.9, 0.8, 0.7], [0, 5, -1])
+    assert batch.data.dtype == DETECTION_DTYPE
+    assert len(batch) == 1
+    det = batch[0]
+    assert det.class_name == 'PET'
+    assert det.bbox == (0, 0, 10, 20)
+    assert det.center == (5, 10)
+    assert det.confidence == np.float32(0.9)
+
+
+def test_from_arrays_track_ids():
+    batch = DetectionBatch.from_arrays(
+        np.zeros((2, 4)), np.ones(2), np.zeros(2), ['PET'], ids=np.array([7, 9])
+    )
+    assert batch.ids.tolist() == [7, 9]
+    assert [det.id for det in batch] == [7, 9]
+
+
+def test_translate_moves_boxes_and_centers():
+    batch = _batch([[0, 0, 10, 10]], [0.9], [0])
+    batch.translate(100, 50)
+    assert batch.xyxy.tolist() == [[100, 50, 110, 60]]
+    assert batch.centers.tolist() == [[105, 55]]
+
+
+def test_copy_is_independent():
+    batch = _batch([[0, 0, 10, 10]], [0.9], [0])
+    copied = batch.copy()
+    copied.translate(5, 5)
+    assert batch.xyxy.tolist() == [[0, 0, 10, 10]]
+
+
+def test_concatenate_and_mask():
+    a = _batch([[0, 0, 10, 10]], [0.9], [0])
+    b = _batch([[20, 20, 30, 30]], [0.8], [1])
+    merged = DetectionBatch.concatenate([a, b], ['PET', 'PE'])
+    assert len(merged) == 2
+    assert merged.class_mask({'PE'}).tolist() == [False, True]
+    assert len(DetectionBatch.concatenate([], ['PET'])) == 0
+
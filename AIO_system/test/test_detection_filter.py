@@ -0,0 +1,63 @@
+"""클래스별 NMS + 클래스별/구역별 신뢰도 기준"""
+import numpy as np
+
+from src.AI.detection_batch import DetectionBatch
+
+
+def _batch(xyxy, conf, cls, names=('PET', 'PE')):
+    return DetectionBatch.from_arrays(
+        np.array(xyxy, dtype=np.float32), np.array(conf, dtype=np.float32),
+        np.array(cls), list(names)
+    )
+
+
+def test_nms_class_aware():
+    batch = _batch([[0, 0, 100, 100], [2, 2, 102, 102]], [0.9, 0.8], [0, 1])
+    assert len(batch.nms(0.5)) == 1
+    kept = batch.nms(0.5, class_aware=True)
+    assert sorted(kept.data['cls'].tolist()) == [0, 1]
+    # 같은 클래스끼리는 class_aware 여도 억제
+    same = _batch([[0, 0, 100, 100], [2, 2, 102, 102]], [0.9, 0.8], [1, 1])
+    assert same.nms(0.5, class_aware=True).data['conf'].tolist() == [np.float32(0.9)]
+
+
+def _manager(synthetic_manager, monkeypatch, boxes=(), **filter_config):
+    from src.AI import AI_manager
+    monkeypatch.setattr(AI_manager, 'CAMERA_CONFIGS', {0: {'boxes': list(boxes)}})
+    config = {'class_conf': {}, 'class_aware_nms': False, 'nms_iou': 0.5}
+    config.update(filter_config)
+    manager = synthetic_manager(initialize=False, num_cameras=1, confidence_threshold=0.5,
+                                filter_config=config)
+    manager.CLASS_NAMES = ['PET', 'PE']
+    manager._class_conf = manager._build_class_conf()
+    manager._zone_conf = {0: manager._build_zone_conf(0)}
+    return manager
+
+
+def test_class_conf(synthetic_manager, monkeypatch):
+    manager = _manager(synthetic_manager, monkeypatch, class_conf={'PE': 0.8})
+    det = _batch([[0, 0, 10, 10], [20, 0, 30, 10], [40, 0, 50, 10]], [0.6, 0.7, 0.85], [0, 1, 1])
+    kept = manager._filter_detections(0, det)
+    assert kept.data['conf'].tolist() == [np.float32(0.6), np.float32(0.85)]
+
+
+def test_zone_conf_overrides_class_conf(synthetic_manager, monkeypatch):
+    zone = {'x': 0, 'y': 0, 'width': 100, 'height': 100, 'min_confidence': 0.3}
+    strict = {'x': 100, 'y': 0, 'width': 100, 'height': 100, 'min_confidence': {'PET': 0.95}}
+    manager = _manager(synthetic_manager, monkeypatch, boxes=[zone, strict], class_conf={'PE': 0.8})
+    det = _batch(
+        [[10, 10, 20, 20], [10, 10, 20, 20], [110, 10, 120, 20], [110, 10, 120, 20], [300, 10, 310, 20]],
+        [0.4, 0.4, 0.9, 0.9, 0.4], [0, 1, 0, 1, 0]
+    )
+    kept = manager._filter_detections(0, det)
+    # 구역 1: 0.3 기준 (클래스 무관), 구역 2: PET 0.95 / PE 는 클래스 기준 0.8, 구역 밖: 기본 0.5
+    assert kept.xyxy[:, 0].tolist() == [10, 10, 110]
+    assert kept.data['cls'].tolist() == [0, 1, 1]
+    # 모델 호출 기준은 가장 낮은 기준
+    assert manager.model_confidence == np.float32(0.3)
+
+
+def test_class_aware_nms_in_filter(synthetic_manager, monkeypatch):
+    det = _batch([[0, 0, 100, 100], [2, 2, 102, 102]], [0.9, 0.8], [0, 1])
+    manager = _manager(synthetic_manager, monkeypatch, class_aware_nms=True)
+    assert len(manager._filter_detections(0, det)) == 2
@@ -0,0 +1,98 @@
+"""최신 프레임 우편함 + 적응형 추론 간격 (덮어쓰기로 드롭, 드롭이 생기면 간격 증가)"""
+import threading
+import time
+
+import numpy as np
+
+from src.AI.frame_mailbox import LatestFrameMailbox
+from src.AI.cam.interval_controller import AdaptiveIntervalController
+
+
+def test_put_overwrites_and_counts_drops():
+    mailbox = LatestFrameMailbox(2)
+    assert mailbox.put(0, 'a') is False
+    assert mailbox.put(0, 'b') is True
+    assert mailbox.put(0, 'c') is True
+    assert mailbox.overwrites == [2, 0]
+
+    # 최신 항목만 남음
+    assert mailbox.collect(timeout=0.1, gather_window=0.0) == {0: 'c'}
+    assert mailbox.put(0, 'd') is False
+
+
+def test_collect_gathers_other_slots_within_window():
+    mailbox = LatestFrameMailbox(2)
+    mailbox.put(0, 'a')
+
+    def _late_put():
+        time.sleep(0.02)
+        mailbox.put(1, 'b')
+
+    thread = threading.Thread(target=_late_put)
+    thread.start()
+    items = mailbox.collect(timeout=0.1, gather_window=1.0)
+    thread.join()
+    assert items == {0: 'a', 1: 'b'}
+
+
+def test_collect_timeout_and_close():
+    mailbox = LatestFrameMailbox(1)
+    assert mailbox.collect(timeout=0.01, gather_window=0.0) == {}
+
+    threading.Timer(0.02, mailbox.close).start()
+    t0 = time.monotonic()
+    assert mailbox.collect(timeout=2.0, gather_window=0.0) == {}
+    assert time.monotonic() - t0 < 1.0
+    assert mailbox.closed
+
+    mailbox.reopen()
+    assert not mailbox.closed
+
+
+def test_submit_does_not_depend_on_mailbox_occupancy():
+    controller = AdaptiveIntervalController(min_interval=1, max_interval=4, adjust_period=0.0)
+    mailbox = LatestFrameMailbox(1)
+
+    # 우편함에 가져가지 않은 프레임이 있어도 간격에 맞는 프레임은 계속 넣음 (덮어씀)
+    submitted = [frame for frame in range(6) if controller.should_submit(frame)]
+    for frame in submitted:
+        mailbox.put(0, frame)
+    assert submitted == list(range(6))
+    assert mailbox.collect(timeout=0.1, gather_window=0.0) == {0: 5}
+    assert mailbox.overwrites[0] == 5
+
+
+def test_interval_rises_on_drops_and_recovers():
+    controller = AdaptiveIntervalController(
+        latency_budget_ms=80.0, min_interval=1, max_interval=3, max_drops=0, adjust_period=0.0
+    )
+    mailbox = LatestFrameMailbox(1)
+
+    controller.update(10.0, mailbox.overwrites[0])     # 기준 드롭 수 기록
+    assert controller.interval == 1
+
+    for frame in range(3):
+        mailbox.put(0, frame)
+    controller.update(10.0, mailbox.overwrites[0])     # 지연은 낮아도 드롭이 생김
+    assert controller.get_stats() == {'interval': 2, 'recent_drops': 2}
+    assert [f for f in range(6) if controller.should_submit(f)] == [0, 2, 4]
+
+    controller.update(10.0, mailbox.overwrites[0])     # 드롭 없음 + 지연 여유
+    assert controller.interval == 1
+
+    controller.update(100.0, mailbox.overwrites[0])    # 지연 예산 초과
+    controller.update(100.0, mailbox.overwrites[0])
+    controller.update(100.0, mailbox.overwrites[0])
+    assert controller.interval == 3
+
+
+
+def test_manager_counts_overwritten_frames(synthetic_manager):
+    manager = synthetic_manager(num_cameras=1)
+    frame = np.zeros((64, 64, 3), dtype=np.uint8)
+
+    # 수집 스레드가 돌기 전이라 두 번째 프레임부터 덮어씀
+    for frame_id in range(3):
+        manager.put_frame(0, frame, frame_id=frame_id)
+    assert manager.dropped_frames[0] == 2
+    assert manager.get_camera_load(0) == (0.0, 2)
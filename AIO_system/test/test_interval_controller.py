@@ -0,0 +1,48 @@
+"""적응형 추론 간격 (지연 예산 기준)"""
+from src.AI.cam.interval_controller import AdaptiveIntervalController
+
+
+def _controller(**kwargs):
+    options = dict(latency_budget_ms=80.0, min_interval=1, max_interval=3, adjust_period=0.0)
+    options.update(kwargs)
+    return AdaptiveIntervalController(**options)
+
+
+def test_interval_rises_over_budget_up_to_max():
+    controller = _controller()
+    for expected in (2, 3, 3):
+        controller.update(100.0, 0)
+        assert controller.interval == expected
+
+
+def test_interval_falls_only_with_headroom():
+    controller = _controller()
+    controller.update(100.0, 0)
+    controller.update(100.0, 0)
+    assert controller.interval == 3
+
+    controller.update(60.0, 0)      # 예산 안이지만 low_ratio(0.6) 여유는 없음 -> 유지
+    assert controller.interval == 3
+    controller.update(40.0, 0)
+    controller.update(40.0, 0)
+    controller.update(40.0, 0)
+    assert controller.interval == 1
+
+
+def test_should_submit_follows_interval():
+    controller = _controller()
+    assert all(controller.should_submit(frame) for frame in range(4))
+    controller.update(100.0, 0)
+    assert [frame for frame in range(6) if controller.should_submit(frame)] == [0, 2, 4]
+
+
+def test_interval_holds_between_adjust_periods():
+    controller = _controller(adjust_period=60.0)
+    controller.update(1000.0, 100)
+    assert controller.interval == 1
+
+
+def test_min_max_are_sane():
+    controller = AdaptiveIntervalController(min_interval=0, max_interval=0)
+    assert controller.min_interval == 1
+    assert controller.max_interval == 1
@@ -0,0 +1,46 @@
+"""움직임/점유 게이트"""
+import numpy as np
+import pytest
+
+pytest.importorskip('cv2')
+from src.AI.cam.motion_gate import MotionGate  # noqa: E402
+
+
+def _frame(with_object: bool) -> np.ndarray:
+    frame = np.zeros((240, 160, 3), dtype=np.uint8)
+    if with_object:
+        frame[80:160, 40:120] = 200
+    return frame
+
+
+def test_diff_gate_closes_on_stopped_object():
+    gate = MotionGate([(0, 0, 160, 240)], mode='diff', downscale=4, hold_frames=1)
+    sequence = [False, False, False, True, True, True]
+    passed, motion = [], []
+    for with_object in sequence:
+        passed.append(gate.update(_frame(with_object)))
+        motion.append(gate.motion)
+
+    # 첫 프레임 통과, hold 1 프레임, 물체 등장, 정지 후 hold 1 프레임 뒤 닫힘
+    assert passed == [True, True, False, True, True, False]
+    # motion 은 hold 와 관계없이 실제 변화만
+    assert motion == [True, False, False, True, False, False]
+    assert gate.get_stats()['skipped_frames'] == 2
+
+
+def test_background_gate_stays_open_while_occupied():
+    gate = MotionGate([(0, 0, 160, 240)], mode='background', downscale=4, hold_frames=1)
+    for _ in range(3):
+        gate.update(_frame(False))
+    assert not gate.update(_frame(False))
+    assert all(gate.update(_frame(True)) for _ in range(10))
+
+
+def test_hold_frames_at_least_one():
+    gate = MotionGate([(0, 0, 160, 240)], mode='diff', hold_frames=0)
+    assert gate.hold_frames == 1
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        MotionGate([], mode='optical_flow')
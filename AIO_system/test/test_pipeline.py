@@ -0,0 +1,48 @@
+"""전처리 / 추론 / 후처리 파이프라인"""
+import numpy as np
+
+from conftest import wait_results
+
+FRAME = np.zeros((1920, 500, 3), dtype=np.uint8)
+
+
+def test_failed_inference_is_dropped_not_published(synthetic_manager):
+    manager = synthetic_manager()
+    infer = manager.backend.infer
+    calls = []
+
+    def _fail_once(tensor):
+        calls.append(len(tensor))
+        if len(calls) == 1:
+            raise RuntimeError("inference failed")
+        return infer(tensor)
+
+    manager.backend.infer = _fail_once
+    manager.start()
+
+    for cam_id in range(2):
+        manager.put_frame(cam_id, FRAME, frame_id=1)
+    # 실패한 배치는 빈 결과로 내보내지 않음
+    assert wait_results(manager, [0, 1], timeout=0.3) == {}
+    stats = manager.get_stats()
+    assert stats['failed_batches'] == 1
+    assert stats['dropped_frames'] == {0: 1, 1: 1}
+    assert manager.get_camera_load(0)[1] == 1
+
+    for cam_id in range(2):
+        manager.put_frame(cam_id, FRAME, frame_id=2)
+    results = wait_results(manager, [0, 1], frame_id=2)
+    assert all(len(results[cam_id]) == 1 for cam_id in (0, 1))
+
+
+def test_stop_and_restart(synthetic_manager):
+    manager = synthetic_manager(num_cameras=1)
+    manager.start()
+    manager.put_frame(0, FRAME, frame_id=1)
+    assert wait_results(manager, [0], frame_id=1)
+
+    manager.stop()
+    assert not manager.running
+    manager.start()
+    manager.put_frame(0, FRAME, frame_id=2)
+    assert wait_results(manager, [0], frame_id=2)[0].frame_id == 2
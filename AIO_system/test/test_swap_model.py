@@ -0,0 +1,80 @@
+"""모델 교체 (카메라/추론을 멈추지 않고)"""
+import threading
+
+import numpy as np
+
+from conftest import JAM_SCENARIO, wait_results
+
+FRAME = np.zeros((1920, 500, 3), dtype=np.uint8)
+
+
+def _swap(manager, model_path, timeout=5.0):
+    """교체 요청 후 완료까지 대기, on_done 결과 반환"""
+    done = threading.Event()
+    outcome = []
+
+    def _on_done(ok):
+        outcome.append(ok)
+        done.set()
+
+    assert manager.swap_model(model_path, on_done=_on_done)
+    assert done.wait(timeout)
+    return outcome[0]
+
+
+def _moved(y):
+    return dict(JAM_SCENARIO, events=[
+        {'type': 'jam', 'start': 0, 'end': 10, 'x': 200, 'y': y, 'size': [90, 90], 'conf': 0.9},
+    ])
+
+
+def test_swap_while_running(synthetic_manager, write_scenario):
+    manager = synthetic_manager(num_cameras=1)
+    manager.start()
+    manager.put_frame(0, FRAME, frame_id=1)
+    before = wait_results(manager, [0], frame_id=1)[0]
+    old_backend = manager.backend
+
+    new_path = write_scenario(_moved(1000), name='moved.json')
+    assert _swap(manager, new_path) is True
+    assert manager.backend is not old_backend
+    assert manager.model_path == new_path
+
+    manager.put_frame(0, FRAME, frame_id=2)
+    after = wait_results(manager, [0], frame_id=2)[0]
+    assert before.centers[0, 1] < 600 < 900 < after.centers[0, 1]
+    assert manager.running
+
+
+def test_swap_rejects_different_classes(synthetic_manager, write_scenario):
+    manager = synthetic_manager(num_cameras=1)
+    old_backend = manager.backend
+
+    scenario = dict(JAM_SCENARIO, class_names=['PET', 'PE'])
+    assert _swap(manager, write_scenario(scenario, name='classes.json')) is False
+    assert manager.backend is old_backend
+    assert manager.CLASS_NAMES == ['Plastic']
+
+
+def test_swap_rejects_batch_size_mismatch(synthetic_manager, write_scenario, monkeypatch):
+    from src.AI.inference_backend import SyntheticBackend
+    manager = synthetic_manager(batch_size=2)
+    old_backend = manager.backend
+
+    # 새 모델이 고정 배치 1 엔진이면 지금 입력 버퍼(배치 2)와 맞지 않음
+    monkeypatch.setattr(SyntheticBackend, 'probe_batch', lambda self: (False, 1))
+    assert _swap(manager, write_scenario(name='fixed.json')) is False
+    assert manager.backend is old_backend
+
+
+def test_swap_load_failure_keeps_model(synthetic_manager, tmp_path):
+    manager = synthetic_manager(num_cameras=1)
+    old_backend, old_path = manager.backend, manager.model_path
+    assert _swap(manager, str(tmp_path / 'missing.json')) is False
+    assert manager.backend is old_backend
+    assert manager.model_path == old_path
+
+
+def test_swap_requires_ready_model(synthetic_manager, write_scenario):
+    manager = synthetic_manager(initialize=False)
+    assert manager.swap_model(write_scenario()) is False
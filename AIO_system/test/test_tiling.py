@@ -0,0 +1,76 @@
+"""타일 추론 + 타일 경계 결과 병합"""
+import numpy as np
+
+from conftest import JAM_SCENARIO, wait_results
+from src.AI.detection_batch import DetectionBatch, nms_indices
+
+FRAME = np.zeros((1920, 500, 3), dtype=np.uint8)
+
+
+def _part(xyxy, conf=0.9):
+    return DetectionBatch.from_arrays(np.array([xyxy], dtype=np.float32), np.array([conf]),
+                                      np.array([0]), ['Plastic'])
+
+
+def test_nms_ios_merges_cut_box():
+    # 타일 경계에서 잘린 작은 박스: IoU 는 낮지만 작은 박스 기준으로는 전부 겹침
+    xyxy = np.array([[0, 0, 100, 100], [0, 0, 30, 100]], dtype=np.float32)
+    scores = np.array([0.9, 0.8])
+    assert nms_indices(xyxy, scores, 0.5, metric='iou').tolist() == [0, 1]
+    assert nms_indices(xyxy, scores, 0.5, metric='ios').tolist() == [0]
+
+
+def test_tile_origins_cover_frame(synthetic_manager):
+    manager = synthetic_manager(initialize=False, tile_mode=True, tile_overlap=64)
+    origins = manager._tile_origins((1920, 500))
+    assert origins == [(0, 0), (0, 576), (0, 1152), (0, 1280)]
+    # 마지막 타일은 프레임 끝에 맞추고, 이웃 타일끼리는 최소 overlap 만큼 겹침
+    ys = [y for _, y in origins]
+    assert ys[-1] + manager.img_size == 1920
+    assert all(b - a <= manager.img_size - 64 for a, b in zip(ys, ys[1:]))
+    assert manager._tile_origins((480, 500)) == [(0, 0)]
+
+
+def test_stale_tiles_are_not_merged_into_next_frame(synthetic_manager):
+    from src.AI.AI_manager import _FrameMeta
+    manager = synthetic_manager(initialize=False, tile_mode=True)
+
+    # 프레임 1 은 4개 중 2개 타일만 도착 (중지 / 추론 실패 등)
+    frame1 = _FrameMeta(frame_id=1, t_submit=1.0)
+    assert manager._merge_tile_part(0, frame1, 4, _part([0, 0, 10, 10])) is None
+    assert manager._merge_tile_part(0, frame1, 4, _part([0, 0, 10, 10])) is None
+
+    frame2 = _FrameMeta(frame_id=2, t_submit=2.0)
+    for _ in range(3):
+        assert manager._merge_tile_part(0, frame2, 4, _part([100, 100, 150, 150])) is None
+    merged = manager._merge_tile_part(0, frame2, 4, _part([100, 100, 150, 150]))
+
+    assert merged.xyxy.tolist() == [[100, 100, 150, 150]]
+    assert manager.dropped_tile_sets == 1
+    assert manager._pending_parts == {}
+
+
+def test_stop_clears_pending_tiles(synthetic_manager):
+    from src.AI.AI_manager import _FrameMeta
+    manager = synthetic_manager(initialize=False, tile_mode=True)
+    manager._merge_tile_part(0, _FrameMeta(frame_id=1, t_submit=1.0), 4, _part([0, 0, 10, 10]))
+    manager.stop()
+    assert manager._pending_parts == {}
+
+
+def test_object_on_tile_boundary_is_merged(synthetic_manager):
+    # 타일 0 (y 0~640) 과 타일 1 (y 576~1216) 경계에 걸친 물체 (y 555~645)
+    scenario = dict(JAM_SCENARIO, events=[
+        {'type': 'jam', 'start': 0, 'end': 10, 'x': 200, 'y': 600, 'size': [90, 90], 'conf': 0.9},
+    ])
+    manager = synthetic_manager(scenario, num_cameras=1, tile_mode=True)
+    manager.start()
+
+    manager.put_frame(0, FRAME, frame_id=1)
+    result = wait_results(manager, [0], frame_id=1)[0]
+
+    assert len(result) == 1
+    x1, y1, x2, y2 = result.xyxy[0]
+    assert (x1, x2) == (155, 245)
+    assert 555 <= y1 and y2 <= 645
+    assert manager.get_stats()['batch_launches'] == 4
@@ -0,0 +1,79 @@
+"""트랙 상태 저장소 (바뀐 트랙만 다시 처리)"""
+import numpy as np
+
+from src.AI.detection_batch import DetectionBatch
+from src.AI.tracking.track_store import TrackStore
+
+ZONES = [(0, 0, 99, 99), (100, 0, 199, 99)]
+
+
+def _det(tracks, names=('PET', 'PE')):
+    """tracks: [(id, cx, cy, cls)] -> 20x20 박스"""
+    tracks = list(tracks)
+    xyxy = np.array([[cx - 10, cy - 10, cx + 10, cy + 10] for _, cx, cy, _ in tracks],
+                    dtype=np.float32).reshape(-1, 4)
+    return DetectionBatch.from_arrays(
+        xyxy, np.full(len(tracks), 0.9), np.array([c for *_, c in tracks]), list(names),
+        ids=np.array([i for i, *_ in tracks])
+    )
+
+
+def test_new_tracks_then_unchanged_tracks_skipped():
+    store = TrackStore(ZONES, move_threshold=8.0)
+    assert store.update(_det([(2, 50, 50, 0), (1, 150, 50, 0)]), now=0.0).tolist() == [True, True]
+    assert store.ids.tolist() == [1, 2]
+    assert store.update(_det([(1, 150, 50, 0), (2, 52, 50, 0)]), now=0.1).tolist() == [False, False]
+    assert store.get_stats() == {'tracks': 2, 'processed': 2, 'skipped': 2}
+
+
+def test_small_moves_accumulate_until_threshold():
+    store = TrackStore(ZONES, move_threshold=8.0)
+    store.update(_det([(1, 20, 50, 0)]), now=0.0)
+    changed = [store.update(_det([(1, 20 + 3 * step, 50, 0)]), now=0.1 * step)[0] for step in (1, 2, 3)]
+    # 기준 위치는 바뀐 프레임에서만 갱신되므로 3px 씩 움직여도 세 번째(9px)에 다시 처리
+    assert changed == [False, False, True]
+    assert store.centers[0].tolist() == [29, 50]
+    assert store.velocity[0, 0] == np.float32(30.0)
+
+
+def test_zone_and_class_changes():
+    store = TrackStore(ZONES, move_threshold=1000.0)
+    store.update(_det([(1, 95, 50, 0)]), now=0.0)
+    assert store.zone_mask.tolist() == [0b01]
+    # 이동량은 작지만 구역 경계를 넘음
+    assert store.update(_det([(1, 105, 50, 0)]), now=0.1).tolist() == [True]
+    assert store.zone_mask.tolist() == [0b10]
+    assert store.update(_det([(1, 105, 50, 1)]), now=0.2).tolist() == [True]
+    assert store.update(_det([(1, 105, 50, 1)]), now=0.3).tolist() == [False]
+
+
+def test_reappearing_track_is_processed():
+    store = TrackStore(ZONES)
+    store.update(_det([(1, 50, 50, 0)]), now=0.0)
+    store.update(_det([]), now=0.1)
+    # 한 프레임 이상 안 보였다가 다시 나타남
+    assert store.update(_det([(1, 50, 50, 0)]), now=0.2).tolist() == [True]
+
+
+def test_unseen_tracks_expire():
+    store = TrackStore(ZONES, ttl=1.0)
+    store.update(_det([(1, 50, 50, 0), (2, 150, 50, 0)]), now=0.0)
+    store.update(_det([(2, 150, 50, 0)]), now=0.9)
+    store.update(_det([(2, 150, 50, 0)]), now=1.5)
+    assert store.ids.tolist() == [2]
+    assert store.update(_det([(1, 50, 50, 0)]), now=1.6).tolist() == [True]
+
+
+def test_untracked_and_duplicate_ids():
+    store = TrackStore(ZONES)
+    changed = store.update(_det([(-1, 50, 50, 0), (3, 150, 50, 0), (3, 150, 60, 0)]), now=0.0)
+    assert changed.tolist() == [True, True, True]
+    # ID 없는 검출은 저장하지 않고, 같은 ID 는 한 번만 저장
+    assert store.ids.tolist() == [3]
+    assert store.update(_det([(-1, 50, 50, 0)]), now=0.1).tolist() == [True]
+
+
+def test_membership_without_zones():
+    store = TrackStore([])
+    assert store.membership(_det([(1, 50, 50, 0)])).tolist() == [0]
+    assert store.update(_det([]), now=0.0).tolist() == []
@@ -0,0 +1,48 @@
+"""하드웨어 트리거 카운터 되감김 보정"""
+from src.AI.cam.trigger_counter import (
+    CHUNK_COUNTER_MODULUS, EXTENDED_BLOCK_ID_MODULUS, GEV1_BLOCK_ID_MODULUS, TriggerCounter
+)
+
+
+def test_first_value_starts_at_zero():
+    counter = TriggerCounter()
+    assert counter.total == -1
+    assert counter.update(12345) == 0
+    assert counter.update(12350) == 5
+
+
+def test_chunk_counter_wraps_at_32_bits():
+    counter = TriggerCounter(CHUNK_COUNTER_MODULUS)
+    values = [CHUNK_COUNTER_MODULUS - 2, CHUNK_COUNTER_MODULUS - 1, 0, 3]
+    assert [counter.update(v) for v in values] == [0, 1, 2, 5]
+
+
+def test_gev1_block_id_skips_zero():
+    # GigE Vision 1.x 블록 ID 는 65535 다음 1
+    counter = TriggerCounter(GEV1_BLOCK_ID_MODULUS)
+    assert [counter.update(v) for v in (65534, 65535, 1, 2)] == [0, 1, 2, 3]
+
+
+def test_extended_block_id_does_not_wrap_at_16_bits():
+    counter = TriggerCounter(EXTENDED_BLOCK_ID_MODULUS)
+    assert [counter.update(v) for v in (65534, 65535, 65536, 70000)] == [0, 1, 2, 4466]
+
+
+def test_missing_value_holds_total():
+    counter = TriggerCounter()
+    assert counter.update(None) == 0
+    assert counter.update(10) == 0
+    assert counter.update(None) == 0
+    # 빠진 프레임의 트리거는 다음 값의 증가분에 포함
+    assert counter.update(13) == 3
+    assert counter.missing == 2
+
+
+def test_restart_keeps_total():
+    counter = TriggerCounter()
+    counter.update(100)
+    counter.update(110)
+    counter.restart(GEV1_BLOCK_ID_MODULUS)
+    assert counter.update(1) == 10
+    assert counter.update(3) == 12
+    assert counter.modulus == GEV1_BLOCK_ID_MODULUS